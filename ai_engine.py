@@ -4,15 +4,58 @@ Generates personalized, context-aware savings strategies by analyzing
 user transactions and travel goals using Groq API.
 """
 
+import asyncio
+import json
 import os
 import pandas as pd
 from datetime import date, datetime
-from decimal import Decimal
-from typing import List, Dict, Optional
+from decimal import Decimal, ROUND_HALF_UP
+from typing import List, Dict, Optional, Tuple, Union
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from models import Transaction, TravelGoal
+from models import Transaction, TravelGoal, MonthlyCategoryTotal
 from schemas import SavingsSuggestion, AISuggestionResponse
+from suggestion_cache import suggestion_cache
+from rollups import month_start
+
+
+# Groq model used for suggestions (or use other Groq models like "mixtral-8x7b-32768")
+LLM_MODEL = os.getenv("GROQ_MODEL", "llama-3.1-70b-versatile")
+
+# Groq HTTP timeouts (seconds) and per-process cap on concurrent async LLM calls
+GROQ_CONNECT_TIMEOUT = float(os.getenv("GROQ_CONNECT_TIMEOUT", 5))
+GROQ_READ_TIMEOUT = float(os.getenv("GROQ_READ_TIMEOUT", 30))
+GROQ_MAX_CONCURRENCY = int(os.getenv("GROQ_MAX_CONCURRENCY", 16))
+
+# Where generate_suggestions gets its spending metrics:
+#   "rollup" - monthly_category_totals (cost scales with months x categories)
+#   "sql"    - GROUP BY (month, category) over raw transactions in the database
+#   "pandas" - load every transaction and aggregate in a DataFrame
+ANALYSIS_MODES = ("rollup", "sql", "pandas")
+ANALYSIS_MODE = os.getenv("ANALYSIS_MODE", "rollup")
+
+# Months of history (including the current one) analyzed; 0 analyzes all
+# of it. A bound lets partitioned transactions tables prune old months.
+ANALYSIS_LOOKBACK_MONTHS = int(os.getenv("ANALYSIS_LOOKBACK_MONTHS", 0))
+
+# Essential categories; everything else counts as discretionary spending
+ESSENTIAL_CATEGORIES = {'Food', 'Groceries', 'Utilities', 'Rent', 'Transport',
+                        'Transportation', 'Healthcare', 'Bills', 'Insurance'}
+
+
+class StatelessTravelGoal:
+    """Travel goal built from request data for the stateless endpoints."""
+
+    def __init__(self, data: Dict):
+        self.name = data['name']
+        self.target_amount = Decimal(str(data['target_amount']))
+        self.current_saved = Decimal(str(data.get('current_saved', 0)))
+        self.target_date = data.get('target_date')
+        if isinstance(self.target_date, str):
+            self.target_date = date.fromisoformat(self.target_date)
+        self.destination = data.get('destination')
 
 
 class AIEngine:
@@ -20,16 +63,24 @@ class AIEngine:
     AI Engine that processes transaction data and generates personalized savings suggestions.
     """
 
-    def __init__(self, mock_mode: bool = False):
+    def __init__(self, mock_mode: bool = False, analysis_mode: Optional[str] = None):
         """
         Initialize the Groq API client.
         
         Args:
             mock_mode: If True, skip API initialization and use mock suggestions only
+            analysis_mode: One of ANALYSIS_MODES (defaults to the ANALYSIS_MODE env var)
         """
+        self.analysis_mode = analysis_mode or ANALYSIS_MODE
+        if self.analysis_mode not in ANALYSIS_MODES:
+            raise ValueError(f"Unknown analysis mode '{self.analysis_mode}'. Use one of {ANALYSIS_MODES}.")
         self.mock_mode = mock_mode
         api_key = os.getenv("GROQ_API_KEY")
+        self.api_key = api_key
         self.client = None
+        self.async_client = None  # Created on first async call (see _get_async_client)
+        self._llm_semaphore = None
+        self.max_concurrency = GROQ_MAX_CONCURRENCY
         
         if not mock_mode:
             if not api_key:
@@ -39,9 +90,17 @@ class AIEngine:
             
             try:
                 # Lazy import Groq only when needed (not in mock mode)
+                import httpx
                 from groq import Groq
-                # Initialize with minimal parameters to avoid compatibility issues
-                self.client = Groq(api_key=api_key)
+                # Bound every call: connect quickly, give the completion time to generate
+                self.timeout = httpx.Timeout(GROQ_READ_TIMEOUT, connect=GROQ_CONNECT_TIMEOUT)
+                # Pass our own keep-alive HTTP client (also avoids the 'proxies'
+                # incompatibility between older groq releases and newer httpx)
+                self.client = Groq(
+                    api_key=api_key,
+                    timeout=self.timeout,
+                    http_client=httpx.Client(timeout=self.timeout)
+                )
             except TypeError as e:
                 # Handle version compatibility issues (like 'proxies' parameter)
                 print(f"[WARNING] Groq client initialization error: {str(e)}. Falling back to mock mode.")
@@ -85,34 +144,201 @@ class AIEngine:
             'currency': t.currency
         } for t in transactions])
 
-        # Calculate average monthly spending
+        # Work in integer cents so sums are exact (and match the SQL/rollup paths)
+        df['cents'] = (df['amount'] * 100).round().astype('int64')
         df['date'] = pd.to_datetime(df['date'])
-        df['year_month'] = df['date'].dt.to_period('M')
-        monthly_totals = df.groupby('year_month')['amount'].sum()
-        average_monthly_spending = Decimal(str(monthly_totals.mean())) if len(monthly_totals) > 0 else Decimal("0")
+
+        return self._analyze_frame(df)
+
+    def _analyze_frame(self, df: pd.DataFrame) -> Dict:
+        """
+        Aggregate a transactions DataFrame with integer 'cents', 'category'
+        and datetime64 'date' columns.
+        
+        Args:
+            df: Non-empty transactions DataFrame
+            
+        Returns:
+            Dictionary containing analyzed metrics
+        """
+        # Calculate monthly totals
+        year_month = df['date'].dt.to_period('M')
+        monthly_cents = df.groupby(year_month)['cents'].sum()
 
         # Identify non-essential categories (commonly discretionary spending)
-        essential_categories = {'Food', 'Groceries', 'Utilities', 'Rent', 'Transport', 
-                               'Transportation', 'Healthcare', 'Bills', 'Insurance'}
-        df['is_non_essential'] = ~df['category'].isin(essential_categories)
-        non_essential_spending = Decimal(str(df[df['is_non_essential']]['amount'].sum()))
+        is_non_essential = ~df['category'].isin(ESSENTIAL_CATEGORIES)
+        non_essential_cents = df.loc[is_non_essential, 'cents'].sum()
 
         # Category breakdown
-        category_breakdown = df.groupby('category')['amount'].sum().to_dict()
-        category_breakdown = {k: Decimal(str(v)) for k, v in category_breakdown.items()}
+        category_cents = df.groupby('category')['cents'].sum()
+
+        return self._summarize_spending(
+            monthly_cents.tolist(),
+            category_cents.to_dict(),
+            int(non_essential_cents),
+            len(df)
+        )
+
+    def _transactions_frame(self, transactions_data: List[Dict]) -> pd.DataFrame:
+        """
+        Build the analysis DataFrame straight from request dictionaries:
+        one pass to columns, one vectorized amount conversion and one
+        to_datetime, with no per-row objects.
+        
+        Args:
+            transactions_data: List of transaction dictionaries with keys: amount, category, currency, date, description
+            
+        Returns:
+            DataFrame with 'cents', 'category' and 'date' columns
+        """
+        df = pd.DataFrame.from_records(transactions_data, columns=['amount', 'category', 'date'])
+
+        # Amounts may arrive as Decimal, str, int or float
+        amounts = pd.to_numeric(df['amount'].astype(str))
+        df['cents'] = (amounts * 100).round().astype('int64')
 
-        # Total spending
-        total_spending = Decimal(str(df['amount'].sum()))
+        # Missing or unparseable dates count as today
+        dates = pd.to_datetime(df['date'].astype(str), errors='coerce', format='ISO8601').dt.normalize()
+        df['date'] = dates.fillna(pd.Timestamp(date.today()))
+
+        return df
+
+    def _analyze_rollups(
+        self,
+        rollups: List[MonthlyCategoryTotal],
+        travel_goal: TravelGoal
+    ) -> Dict:
+        """
+        Analyze monthly category rollups to extract the same metrics as
+        _analyze_transactions without touching raw transactions.
+        
+        Also accepts any rows with year_month, category, total and count
+        attributes, such as the GROUP BY rows from _spending_by_month_query.
+        
+        Args:
+            rollups: User's (year_month, category) -> total, count rows
+            travel_goal: User's travel goal
+            
+        Returns:
+            Dictionary containing analyzed metrics
+        """
+        if not rollups:
+            return self._analyze_transactions([], travel_goal)
+
+        monthly_cents: Dict = {}
+        category_cents: Dict[str, int] = {}
+        non_essential_cents = 0
+        transaction_count = 0
+
+        for rollup in rollups:
+            # Round (not truncate) totals with sub-cent digits, e.g. from float amounts on SQLite
+            cents = int(Decimal(rollup.total).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP).scaleb(2))
+            monthly_cents[rollup.year_month] = monthly_cents.get(rollup.year_month, 0) + cents
+            category_cents[rollup.category] = category_cents.get(rollup.category, 0) + cents
+            if rollup.category not in ESSENTIAL_CATEGORIES:
+                non_essential_cents += cents
+            transaction_count += int(rollup.count)
+
+        return self._summarize_spending(
+            [monthly_cents[month] for month in sorted(monthly_cents)],
+            category_cents,
+            non_essential_cents,
+            transaction_count
+        )
+
+    def _summarize_spending(
+        self,
+        monthly_cents: List[int],
+        category_cents: Dict[str, int],
+        non_essential_cents: int,
+        transaction_count: int
+    ) -> Dict:
+        """
+        Build the analysis dictionary from exact integer-cent aggregates.
+        Shared by every analysis path so they return identical results.
+        
+        Args:
+            monthly_cents: Total per month with spending, oldest first
+            category_cents: Total per category
+            non_essential_cents: Total outside ESSENTIAL_CATEGORIES
+            transaction_count: Number of transactions aggregated
+            
+        Returns:
+            Dictionary containing analyzed metrics
+        """
+        def to_amount(cents) -> Decimal:
+            return Decimal(int(cents)).scaleb(-2)
+
+        total_cents = sum(int(c) for c in monthly_cents)
+        # Not rounded to cents, like the mean of the original pandas analysis
+        average_monthly_spending = (
+            (Decimal(total_cents) / len(monthly_cents)).scaleb(-2)
+            if monthly_cents else Decimal("0")
+        )
 
         return {
             "average_monthly_spending": average_monthly_spending,
-            "non_essential_spending": non_essential_spending,
-            "category_breakdown": category_breakdown,
-            "total_spending": total_spending,
-            "transaction_count": len(df),
-            "monthly_totals": monthly_totals.tolist() if len(monthly_totals) > 0 else []
+            "non_essential_spending": to_amount(non_essential_cents),
+            "category_breakdown": {k: to_amount(category_cents[k]) for k in sorted(category_cents)},
+            "total_spending": to_amount(total_cents),
+            "transaction_count": transaction_count,
+            "monthly_totals": [float(to_amount(c)) for c in monthly_cents]
         }
 
+    def _analysis_start(self) -> Optional[date]:
+        """First day of the analyzed history, or None for all of it (see ANALYSIS_LOOKBACK_MONTHS)."""
+        if ANALYSIS_LOOKBACK_MONTHS <= 0:
+            return None
+        today = date.today()
+        index = today.year * 12 + today.month - ANALYSIS_LOOKBACK_MONTHS
+        return date(index // 12, index % 12 + 1, 1)
+
+    def _spending_by_month_query(self, user_id: int, dialect_name: str):
+        """
+        Build the SQL pushdown of _analyze_transactions: one GROUP BY over
+        (month, category) that returns rollup-shaped rows.
+        
+        Args:
+            user_id: User ID
+            dialect_name: Name of the bound dialect (for month truncation)
+            
+        Returns:
+            select() yielding year_month, category, total, count rows
+        """
+        year_month = month_start(Transaction.date, dialect_name)
+        return select(
+            year_month.label("year_month"),
+            Transaction.category,
+            func.sum(Transaction.amount).label("total"),
+            func.count(Transaction.id).label("count")
+        ).where(
+            Transaction.user_id == user_id
+        ).group_by(year_month, Transaction.category)
+
+    def _analysis_statement(self, user_id: int, dialect_name: str):
+        """Statement that loads the analysis input for the configured ANALYSIS_MODE."""
+        start = self._analysis_start()
+        if self.analysis_mode == "pandas":
+            statement = select(Transaction).where(Transaction.user_id == user_id)
+        elif self.analysis_mode == "sql":
+            statement = self._spending_by_month_query(user_id, dialect_name)
+        else:
+            statement = select(MonthlyCategoryTotal).where(MonthlyCategoryTotal.user_id == user_id)
+            if start:
+                statement = statement.where(MonthlyCategoryTotal.year_month >= start)
+            return statement
+        if start:
+            statement = statement.where(Transaction.date >= start)
+        return statement
+
+    def _analyze_result(self, result, travel_goal: TravelGoal) -> Dict:
+        """Analyze the result of _analysis_statement for the configured ANALYSIS_MODE."""
+        if self.analysis_mode == "pandas":
+            return self._analyze_transactions(result.scalars().all(), travel_goal)
+        if self.analysis_mode == "sql":
+            return self._analyze_rollups(result.all(), travel_goal)
+        return self._analyze_rollups(result.scalars().all(), travel_goal)
+
     def _calculate_savings_metrics(
         self,
         analysis: Dict,
@@ -232,6 +458,165 @@ Be specific with numbers and make it personal. Reference the destination if prov
 
         return prompt
 
+    def _parse_llm_response(self, response_text: str) -> List[SavingsSuggestion]:
+        """
+        Parse the LLM's JSON answer into SavingsSuggestion objects.
+        
+        Args:
+            response_text: Raw completion text (may be wrapped in markdown code fences)
+            
+        Returns:
+            List of SavingsSuggestion objects
+        """
+        response_text = response_text.strip()
+
+        # Parse JSON response (handle markdown code blocks if present)
+        if "```json" in response_text:
+            response_text = response_text.split("```json")[1].split("```")[0].strip()
+        elif "```" in response_text:
+            response_text = response_text.split("```")[1].split("```")[0].strip()
+
+        suggestions_data = json.loads(response_text)
+
+        # Convert to SavingsSuggestion objects
+        return [
+            SavingsSuggestion(
+                title=s["title"],
+                description=s["description"],
+                potential_savings=Decimal(str(s["potential_savings"])),
+                impact=s["impact"],
+                category=s.get("category")
+            )
+            for s in suggestions_data
+        ]
+
+    def _get_async_client(self):
+        """
+        Get or create the shared AsyncGroq client (lazy initialization).
+        
+        The client keeps a pooled keep-alive httpx.AsyncClient sized to the
+        concurrency cap, with the same connect/read timeouts as the sync client.
+        """
+        if self.async_client is None:
+            import httpx
+            from groq import AsyncGroq
+            self.async_client = AsyncGroq(
+                api_key=self.api_key,
+                timeout=self.timeout,
+                http_client=httpx.AsyncClient(
+                    timeout=self.timeout,
+                    limits=httpx.Limits(
+                        max_connections=self.max_concurrency,
+                        max_keepalive_connections=self.max_concurrency
+                    )
+                )
+            )
+        return self.async_client
+
+    def _get_llm_semaphore(self) -> asyncio.Semaphore:
+        """Get or create the semaphore capping concurrent async LLM calls."""
+        if self._llm_semaphore is None:
+            self._llm_semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._llm_semaphore
+
+    async def aclose(self):
+        """Close the shared async HTTP client (call on application shutdown)."""
+        if self.async_client is not None:
+            await self.async_client.close()
+            self.async_client = None
+
+    def _suggest(
+        self,
+        analysis: Dict,
+        travel_goal: TravelGoal,
+        savings_metrics: Dict,
+        prompt: str
+    ) -> List[SavingsSuggestion]:
+        """
+        Get suggestions from the Groq API (or mock suggestions if unavailable).
+        """
+        # Call Groq API (or use mock if in mock mode)
+        if self.mock_mode or self.client is None:
+            return self._generate_mock_suggestions(analysis, travel_goal, savings_metrics)
+
+        # Same prompt (same analysis, metrics and goal) -> reuse the earlier answer
+        cache_key = suggestion_cache.make_key(LLM_MODEL, prompt)
+        cached = suggestion_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        try:
+            response = self.client.chat.completions.create(
+                messages=[{"role": "user", "content": prompt}],
+                model=LLM_MODEL,
+                temperature=0.7
+            )
+            suggestions = self._parse_llm_response(response.choices[0].message.content)
+            suggestion_cache.set(cache_key, suggestions)
+            return suggestions
+        except Exception as e:
+            # Fallback to mock suggestions if LLM fails
+            print(f"LLM API call failed: {str(e)}. Using mock suggestions.")
+            return self._generate_mock_suggestions(analysis, travel_goal, savings_metrics)
+
+    async def _asuggest(
+        self,
+        analysis: Dict,
+        travel_goal: TravelGoal,
+        savings_metrics: Dict,
+        prompt: str
+    ) -> List[SavingsSuggestion]:
+        """
+        Async variant of _suggest using the shared AsyncGroq client.
+        At most max_concurrency calls are in flight per process.
+        """
+        if self.mock_mode or self.client is None:
+            return self._generate_mock_suggestions(analysis, travel_goal, savings_metrics)
+
+        # The disk tier is a local SQLite file, so look it up off the event loop
+        cache_key = suggestion_cache.make_key(LLM_MODEL, prompt)
+        cached = await asyncio.to_thread(suggestion_cache.get, cache_key)
+        if cached is not None:
+            return cached
+
+        try:
+            async with self._get_llm_semaphore():
+                response = await self._get_async_client().chat.completions.create(
+                    messages=[{"role": "user", "content": prompt}],
+                    model=LLM_MODEL,
+                    temperature=0.7
+                )
+            suggestions = self._parse_llm_response(response.choices[0].message.content)
+            await asyncio.to_thread(suggestion_cache.set, cache_key, suggestions)
+            return suggestions
+        except Exception as e:
+            # Fallback to mock suggestions if LLM fails (including timeouts)
+            print(f"LLM API call failed: {str(e)}. Using mock suggestions.")
+            return self._generate_mock_suggestions(analysis, travel_goal, savings_metrics)
+
+    def _build_response(
+        self,
+        user_id: int,
+        travel_goal: TravelGoal,
+        analysis: Dict,
+        savings_metrics: Dict,
+        suggestions: List[SavingsSuggestion]
+    ) -> AISuggestionResponse:
+        """Assemble the AISuggestionResponse for a user."""
+        return AISuggestionResponse(
+            user_id=user_id,
+            travel_goal_name=travel_goal.name,
+            target_amount=travel_goal.target_amount,
+            current_saved=travel_goal.current_saved,
+            remaining_amount=savings_metrics["remaining_amount"],
+            average_monthly_spending=analysis["average_monthly_spending"],
+            non_essential_spending=analysis["non_essential_spending"],
+            months_to_goal_current=savings_metrics["months_to_goal_current"],
+            months_to_goal_optimized=savings_metrics["months_to_goal_optimized"],
+            suggestions=suggestions,
+            generated_at=datetime.now()
+        )
+
     def generate_suggestions(
         self,
         db: Session,
@@ -247,11 +632,7 @@ Be specific with numbers and make it personal. Reference the destination if prov
         Returns:
             AISuggestionResponse with personalized suggestions
         """
-        # Retrieve user's transactions and travel goal
-        transactions = db.query(Transaction).filter(
-            Transaction.user_id == user_id
-        ).order_by(Transaction.date.desc()).all()
-
+        # Retrieve user's travel goal
         travel_goal = db.query(TravelGoal).filter(
             TravelGoal.user_id == user_id
         ).first()
@@ -259,8 +640,9 @@ Be specific with numbers and make it personal. Reference the destination if prov
         if not travel_goal:
             raise ValueError(f"No travel goal found for user {user_id}")
 
-        # Analyze transactions
-        analysis = self._analyze_transactions(transactions, travel_goal)
+        # Analyze spending (see ANALYSIS_MODE)
+        result = db.execute(self._analysis_statement(user_id, db.get_bind().dialect.name))
+        analysis = self._analyze_result(result, travel_goal)
 
         # Calculate savings metrics
         savings_metrics = self._calculate_savings_metrics(analysis, travel_goal)
@@ -268,68 +650,106 @@ Be specific with numbers and make it personal. Reference the destination if prov
         # Generate LLM prompt
         prompt = self._generate_llm_prompt(analysis, travel_goal, savings_metrics)
 
-        # Call Groq API (or use mock if in mock mode)
-        if self.mock_mode or self.client is None:
-            # Use mock suggestions directly
-            suggestions = self._generate_mock_suggestions(analysis, travel_goal, savings_metrics)
-        else:
-            try:
-                response = self.client.chat.completions.create(
-                    messages=[
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    model="llama-3.1-70b-versatile",  # Or use other Groq models like "mixtral-8x7b-32768"
-                    temperature=0.7
-                )
-                response_text = response.choices[0].message.content.strip()
-
-                # Parse JSON response (handle markdown code blocks if present)
-                if "```json" in response_text:
-                    response_text = response_text.split("```json")[1].split("```")[0].strip()
-                elif "```" in response_text:
-                    response_text = response_text.split("```")[1].split("```")[0].strip()
-
-                import json
-                suggestions_data = json.loads(response_text)
-
-                # Convert to SavingsSuggestion objects
-                suggestions = [
-                    SavingsSuggestion(
-                        title=s["title"],
-                        description=s["description"],
-                        potential_savings=Decimal(str(s["potential_savings"])),
-                        impact=s["impact"],
-                        category=s.get("category")
-                    )
-                    for s in suggestions_data
-                ]
-
-            except Exception as e:
-                # Fallback to mock suggestions if LLM fails
-                print(f"LLM API call failed: {str(e)}. Using mock suggestions.")
-                suggestions = self._generate_mock_suggestions(analysis, travel_goal, savings_metrics)
+        suggestions = self._suggest(analysis, travel_goal, savings_metrics, prompt)
 
         # Build response
-        return AISuggestionResponse(
-            user_id=user_id,
-            travel_goal_name=travel_goal.name,
-            target_amount=travel_goal.target_amount,
-            current_saved=travel_goal.current_saved,
-            remaining_amount=savings_metrics["remaining_amount"],
-            average_monthly_spending=analysis["average_monthly_spending"],
-            non_essential_spending=analysis["non_essential_spending"],
-            months_to_goal_current=savings_metrics["months_to_goal_current"],
-            months_to_goal_optimized=savings_metrics["months_to_goal_optimized"],
-            suggestions=suggestions,
-            generated_at=datetime.now()
+        return self._build_response(user_id, travel_goal, analysis, savings_metrics, suggestions)
+
+    async def agenerate_suggestions(
+        self,
+        db: AsyncSession,
+        user_id: int
+    ) -> AISuggestionResponse:
+        """
+        Async variant of generate_suggestions for use from request handlers.
+        Neither the queries nor the LLM call block the event loop.
+        
+        Args:
+            db: Async database session
+            user_id: User ID to generate suggestions for
+            
+        Returns:
+            AISuggestionResponse with personalized suggestions
+        """
+        result = await db.execute(
+            select(TravelGoal).where(TravelGoal.user_id == user_id).limit(1)
         )
+        travel_goal = result.scalars().first()
+
+        if not travel_goal:
+            raise ValueError(f"No travel goal found for user {user_id}")
+
+        result = await db.execute(self._analysis_statement(user_id, db.get_bind().dialect.name))
+        if self.analysis_mode == "pandas":
+            # DataFrame work is CPU-bound; keep it off the event loop
+            analysis = await asyncio.to_thread(self._analyze_result, result, travel_goal)
+        else:
+            analysis = self._analyze_result(result, travel_goal)
+        savings_metrics = self._calculate_savings_metrics(analysis, travel_goal)
+        prompt = self._generate_llm_prompt(analysis, travel_goal, savings_metrics)
+
+        suggestions = await self._asuggest(analysis, travel_goal, savings_metrics, prompt)
+
+        return self._build_response(user_id, travel_goal, analysis, savings_metrics, suggestions)
+
+    def goal_metrics(self, rollups: List, travel_goals: List) -> List[Dict]:
+        """
+        Savings metrics for each travel goal from already loaded monthly
+        rollups, without LLM calls: the analysis and projections that
+        generate_suggestions uses, over the months ANALYSIS_LOOKBACK_MONTHS
+        covers.
+        
+        Args:
+            rollups: The user's rows with year_month (date), category, total and count
+            travel_goals: Goals with target_amount, current_saved and target_date
+            
+        Returns:
+            Savings metrics per goal, in the order of travel_goals
+        """
+        start = self._analysis_start()
+        analyzed = [rollup for rollup in rollups if not start or rollup.year_month >= start]
+        metrics = []
+        analysis = None
+        for travel_goal in travel_goals:
+            if analysis is None:
+                analysis = self._analyze_rollups(analyzed, travel_goal)
+            metrics.append(self._calculate_savings_metrics(analysis, travel_goal))
+        return metrics
+
+    def _prepare_stateless(
+        self,
+        transactions_data: Union[List[Dict], pd.DataFrame],
+        travel_goal_data: Dict
+    ) -> Tuple:
+        """
+        Build the travel goal, analysis, savings metrics and LLM prompt from
+        in-memory data.
+        
+        Returns:
+            (travel_goal, analysis, savings_metrics, prompt)
+        """
+        travel_goal = StatelessTravelGoal(travel_goal_data)
+
+        if isinstance(transactions_data, pd.DataFrame):
+            # Already columnar (validated by columnar.validate_columns)
+            frame = transactions_data
+        else:
+            frame = self._transactions_frame(transactions_data) if transactions_data else None
+
+        if frame is not None and len(frame):
+            analysis = self._analyze_frame(frame)
+        else:
+            analysis = self._analyze_transactions([], travel_goal)
+        savings_metrics = self._calculate_savings_metrics(analysis, travel_goal)
+        
+        # Generate LLM prompt
+        prompt = self._generate_llm_prompt(analysis, travel_goal, savings_metrics)
+        
+        return travel_goal, analysis, savings_metrics, prompt
 
     def generate_suggestions_stateless(
         self,
-        transactions_data: List[Dict],
+        transactions_data: Union[List[Dict], pd.DataFrame],
         travel_goal_data: Dict
     ) -> AISuggestionResponse:
         """
@@ -337,113 +757,49 @@ Be specific with numbers and make it personal. Reference the destination if prov
         Used for Round 1 Prototype.
         
         Args:
-            transactions_data: List of transaction dictionaries with keys: amount, category, currency, date, description
+            transactions_data: List of transaction dictionaries with keys: amount, category, currency, date, description,
+                or a DataFrame from columnar.validate_columns
             travel_goal_data: Dictionary with keys: name, target_amount, current_saved, target_date, destination
             
         Returns:
             AISuggestionResponse with personalized suggestions
         """
-        from datetime import datetime
-        from decimal import Decimal
-        
-        # Create mock Transaction objects from dictionaries
-        class MockTransaction:
-            def __init__(self, data):
-                self.amount = Decimal(str(data['amount']))
-                self.category = data['category']
-                self.currency = data.get('currency', 'USD')
-                # Handle date parsing - could be date object, string, or None
-                date_val = data.get('date')
-                if date_val is None:
-                    self.date = date.today()  # Default to today if missing
-                elif isinstance(date_val, date):
-                    self.date = date_val
-                elif isinstance(date_val, str):
-                    # Try ISO format first, then other formats
-                    try:
-                        self.date = date.fromisoformat(date_val)
-                    except (ValueError, AttributeError):
-                        # Fallback: try parsing common date formats
-                        from datetime import datetime
-                        try:
-                            self.date = datetime.strptime(date_val, '%Y-%m-%d').date()
-                        except ValueError:
-                            self.date = date.today()  # Ultimate fallback
-                else:
-                    self.date = date.today()
-                self.description = data.get('description')
-        
-        # Create mock TravelGoal object
-        class MockTravelGoal:
-            def __init__(self, data):
-                self.name = data['name']
-                self.target_amount = Decimal(str(data['target_amount']))
-                self.current_saved = Decimal(str(data.get('current_saved', 0)))
-                self.target_date = data.get('target_date')
-                if isinstance(self.target_date, str):
-                    self.target_date = date.fromisoformat(self.target_date)
-                self.destination = data.get('destination')
+        travel_goal, analysis, savings_metrics, prompt = self._prepare_stateless(
+            transactions_data, travel_goal_data
+        )
         
-        mock_transactions = [MockTransaction(t) for t in transactions_data]
-        mock_travel_goal = MockTravelGoal(travel_goal_data)
+        suggestions = self._suggest(analysis, travel_goal, savings_metrics, prompt)
         
-        # Use existing analysis methods
-        analysis = self._analyze_transactions(mock_transactions, mock_travel_goal)
-        savings_metrics = self._calculate_savings_metrics(analysis, mock_travel_goal)
+        # Build response
+        user_id = travel_goal_data.get('user_id', 1)
+        return self._build_response(user_id, travel_goal, analysis, savings_metrics, suggestions)
+
+    async def agenerate_suggestions_stateless(
+        self,
+        transactions_data: Union[List[Dict], pd.DataFrame],
+        travel_goal_data: Dict
+    ) -> AISuggestionResponse:
+        """
+        Async variant of generate_suggestions_stateless for use from request handlers.
+        The pandas analysis runs in a worker thread and the LLM call goes
+        through the shared async client, so neither blocks the event loop.
         
-        # Generate LLM prompt
-        prompt = self._generate_llm_prompt(analysis, mock_travel_goal, savings_metrics)
+        Args:
+            transactions_data: List of transaction dictionaries with keys: amount, category, currency, date, description,
+                or a DataFrame from columnar.validate_columns
+            travel_goal_data: Dictionary with keys: name, target_amount, current_saved, target_date, destination
+            
+        Returns:
+            AISuggestionResponse with personalized suggestions
+        """
+        travel_goal, analysis, savings_metrics, prompt = await asyncio.to_thread(
+            self._prepare_stateless, transactions_data, travel_goal_data
+        )
         
-        # Call Groq API (or use mock if in mock mode)
-        if self.mock_mode or self.client is None:
-            suggestions = self._generate_mock_suggestions(analysis, mock_travel_goal, savings_metrics)
-        else:
-            try:
-                response = self.client.chat.completions.create(
-                    messages=[{"role": "user", "content": prompt}],
-                    model="llama-3.1-70b-versatile",
-                    temperature=0.7
-                )
-                response_text = response.choices[0].message.content.strip()
-                
-                # Parse JSON response
-                if "```json" in response_text:
-                    response_text = response_text.split("```json")[1].split("```")[0].strip()
-                elif "```" in response_text:
-                    response_text = response_text.split("```")[1].split("```")[0].strip()
-                
-                import json
-                suggestions_data = json.loads(response_text)
-                
-                suggestions = [
-                    SavingsSuggestion(
-                        title=s["title"],
-                        description=s["description"],
-                        potential_savings=Decimal(str(s["potential_savings"])),
-                        impact=s["impact"],
-                        category=s.get("category")
-                    )
-                    for s in suggestions_data
-                ]
-            except Exception as e:
-                print(f"LLM API call failed: {str(e)}. Using mock suggestions.")
-                suggestions = self._generate_mock_suggestions(analysis, mock_travel_goal, savings_metrics)
+        suggestions = await self._asuggest(analysis, travel_goal, savings_metrics, prompt)
         
-        # Build response
         user_id = travel_goal_data.get('user_id', 1)
-        return AISuggestionResponse(
-            user_id=user_id,
-            travel_goal_name=mock_travel_goal.name,
-            target_amount=mock_travel_goal.target_amount,
-            current_saved=mock_travel_goal.current_saved,
-            remaining_amount=savings_metrics["remaining_amount"],
-            average_monthly_spending=analysis["average_monthly_spending"],
-            non_essential_spending=analysis["non_essential_spending"],
-            months_to_goal_current=savings_metrics["months_to_goal_current"],
-            months_to_goal_optimized=savings_metrics["months_to_goal_optimized"],
-            suggestions=suggestions,
-            generated_at=datetime.now()
-        )
+        return self._build_response(user_id, travel_goal, analysis, savings_metrics, suggestions)
 
     def _generate_mock_suggestions(
         self,
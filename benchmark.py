@@ -0,0 +1,328 @@
+"""
+Benchmark script for the FINIX backend.
+Measures request latency under concurrent load against a running server.
+
+Usage:
+    python benchmark.py latency [--base-url URL] [--concurrency N] [--requests N]
+                                [--save before.json] [--compare before.json]
+    python benchmark.py analysis [--sizes 1000,100000,1000000]
+    python benchmark.py serialize [--rows 100000]
+
+To compare the sync and async database layers, run the latency benchmark
+against the old build with --save before.json, then against the new build
+with --compare before.json.
+
+The analysis benchmark runs in-process against DATABASE_URL and times the
+AIEngine analysis modes (pandas, sql, rollup) on synthetic users.
+
+The serialize benchmark also runs in-process and compares rows/sec for the
+transaction listing encoded via ORM objects + TransactionResponse versus
+column tuples + orjson (serialization.py).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+from datetime import date, timedelta
+from typing import Dict, List
+
+import httpx
+
+
+DEFAULT_BASE_URL = os.getenv("BENCHMARK_BASE_URL", "http://127.0.0.1:8000")
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Return the pct-th percentile of samples (nearest-rank)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+def summarize(samples: List[float], elapsed: float) -> Dict:
+    """Summarize latency samples (seconds) into milliseconds."""
+    return {
+        "requests": len(samples),
+        "throughput_rps": round(len(samples) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(samples, 50) * 1000, 2),
+        "p95_ms": round(percentile(samples, 95) * 1000, 2),
+        "p99_ms": round(percentile(samples, 99) * 1000, 2),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 2) if samples else 0.0,
+    }
+
+
+def print_results(title: str, results: Dict, baseline: Dict = None):
+    """Print a results table, optionally next to a saved baseline."""
+    print("=" * 60)
+    print(title)
+    print("=" * 60)
+    for name, stats in results.items():
+        print(f"\n{name}")
+        for key, value in stats.items():
+            line = f"   {key:<15} {value}"
+            if baseline and name in baseline and key in baseline[name]:
+                before = baseline[name][key]
+                line += f"   (before: {before})"
+            print(line)
+
+
+async def seed_user(client: httpx.AsyncClient, transactions: int) -> int:
+    """Create a benchmark user with some transactions and a travel goal."""
+    username = f"bench_{int(time.time() * 1000)}"
+    response = await client.post("/users/", json={"username": username})
+    response.raise_for_status()
+    user_id = response.json()["id"]
+
+    today = date.today()
+    categories = ["Food", "Entertainment", "Transport", "Shopping", "Rent"]
+    for i in range(transactions):
+        response = await client.post("/transactions/", json={
+            "user_id": user_id,
+            "amount": f"{5 + (i % 200)}.25",
+            "category": categories[i % len(categories)],
+            "date": (today - timedelta(days=i % 365)).isoformat(),
+        })
+        response.raise_for_status()
+
+    response = await client.post("/travel-goals/", json={
+        "user_id": user_id,
+        "name": "Benchmark Trip",
+        "target_amount": "5000",
+    })
+    response.raise_for_status()
+    return user_id
+
+
+async def run_latency(args) -> Dict:
+    """Fire concurrent reads at the user, transaction and travel-goal endpoints."""
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60.0) as client:
+        user_id = await seed_user(client, args.seed_transactions)
+        endpoints = {
+            "GET /users/{id}": f"/users/{user_id}",
+            "GET /transactions/{id}": f"/transactions/{user_id}",
+            "GET /transactions/{id}/summary": f"/transactions/{user_id}/summary",
+            "GET /travel-goals/{id}": f"/travel-goals/{user_id}",
+        }
+
+        results = {}
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        for name, path in endpoints.items():
+            samples: List[float] = []
+
+            async def one_request():
+                async with semaphore:
+                    started = time.perf_counter()
+                    response = await client.get(path)
+                    samples.append(time.perf_counter() - started)
+                    response.raise_for_status()
+
+            started = time.perf_counter()
+            await asyncio.gather(*(one_request() for _ in range(args.requests)))
+            results[name] = summarize(samples, time.perf_counter() - started)
+
+        return results
+
+
+def seed_analysis_user(db, transactions: int) -> int:
+    """Insert a synthetic user with transactions, a travel goal and rollups."""
+    import random
+    from decimal import Decimal
+    from sqlalchemy import insert
+
+    import rollups
+    from models import Transaction, TravelGoal, User
+
+    user = User(username=f"bench_analysis_{int(time.time() * 1000)}")
+    db.add(user)
+    db.commit()
+
+    rng = random.Random(transactions)
+    categories = ["Food", "Rent", "Transport", "Entertainment", "Shopping", "Travel", "Subscriptions"]
+    start = date.today() - timedelta(days=3 * 365)
+    batch_size = 50000
+    for offset in range(0, transactions, batch_size):
+        db.execute(insert(Transaction), [
+            {
+                "user_id": user.id,
+                "amount": Decimal(rng.randint(100, 50000)).scaleb(-2),
+                "category": rng.choice(categories),
+                "currency": "USD",
+                "date": start + timedelta(days=rng.randint(0, 3 * 365)),
+            }
+            for _ in range(min(batch_size, transactions - offset))
+        ])
+        db.commit()
+
+    db.add(TravelGoal(user_id=user.id, name="Benchmark Trip", target_amount=5000, current_saved=0))
+    db.commit()
+    rollups.backfill(db, user.id)
+    return user.id
+
+
+def run_analysis(args) -> Dict:
+    """Time each AIEngine analysis mode and check they agree."""
+    from ai_engine import AIEngine, ANALYSIS_MODES
+    from database import SessionLocal, init_db
+    from models import MonthlyCategoryTotal, Transaction, TravelGoal, User
+
+    init_db()
+    results = {}
+    db = SessionLocal()
+    try:
+        for size in args.sizes:
+            print(f"\nSeeding {size} transactions...")
+            user_id = seed_analysis_user(db, size)
+            travel_goal = db.query(TravelGoal).filter(TravelGoal.user_id == user_id).first()
+            dialect_name = db.get_bind().dialect.name
+
+            analyses = {}
+            for mode in ANALYSIS_MODES:
+                engine = AIEngine(mock_mode=True, analysis_mode=mode)
+                samples = []
+                for _ in range(args.repeat):
+                    db.expunge_all()
+                    started = time.perf_counter()
+                    result = db.execute(engine._analysis_statement(user_id, dialect_name))
+                    analyses[mode] = engine._analyze_result(result, travel_goal)
+                    samples.append(time.perf_counter() - started)
+                results[f"{mode} @ {size}"] = {
+                    "best_ms": round(min(samples) * 1000, 2),
+                    "mean_ms": round(statistics.fmean(samples) * 1000, 2),
+                }
+
+            identical = all(analyses[mode] == analyses["pandas"] for mode in ANALYSIS_MODES)
+            print(f"[{'OK' if identical else 'FAIL'}] Analysis modes agree at {size} transactions")
+
+            if not args.keep:
+                # Explicit deletes: SQLite does not enforce ON DELETE CASCADE by default
+                for model in (Transaction, MonthlyCategoryTotal, TravelGoal):
+                    db.query(model).filter(model.user_id == user_id).delete()
+                db.query(User).filter(User.id == user_id).delete()
+                db.commit()
+    finally:
+        db.close()
+
+    return results
+
+
+def run_serialize(args) -> Dict:
+    """Time listing a user's transactions through both JSON encoding paths."""
+    from fastapi.encoders import jsonable_encoder
+    from sqlalchemy import select
+
+    import serialization
+    from database import SessionLocal, init_db
+    from models import MonthlyCategoryTotal, Transaction, TravelGoal, User
+    from schemas import TransactionResponse
+
+    def orm_pydantic(db, user_id) -> bytes:
+        transactions = db.execute(
+            select(Transaction).where(Transaction.user_id == user_id).order_by(Transaction.date.desc())
+        ).scalars().all()
+        validated = [TransactionResponse.model_validate(t) for t in transactions]
+        return json.dumps(jsonable_encoder(validated)).encode("utf-8")
+
+    def columns_orjson(db, user_id) -> bytes:
+        rows = db.execute(
+            select(*serialization.transaction_columns())
+            .where(Transaction.user_id == user_id).order_by(Transaction.date.desc())
+        ).all()
+        return serialization.dumps(serialization.rows_to_dicts(rows, serialization.TRANSACTION_FIELDS))
+
+    init_db()
+    results = {}
+    db = SessionLocal()
+    try:
+        print(f"\nSeeding {args.rows} transactions...")
+        user_id = seed_analysis_user(db, args.rows)
+
+        for name, encode in (("ORM + TransactionResponse", orm_pydantic), ("columns + orjson", columns_orjson)):
+            samples = []
+            for _ in range(args.repeat):
+                db.expunge_all()
+                started = time.perf_counter()
+                body = encode(db, user_id)
+                samples.append(time.perf_counter() - started)
+            best = min(samples)
+            results[name] = {
+                "best_ms": round(best * 1000, 2),
+                "rows_per_sec": round(args.rows / best),
+                "bytes": len(body),
+            }
+
+        if not args.keep:
+            for model in (Transaction, MonthlyCategoryTotal, TravelGoal):
+                db.query(model).filter(model.user_id == user_id).delete()
+            db.query(User).filter(User.id == user_id).delete()
+            db.commit()
+    finally:
+        db.close()
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FINIX backend benchmarks")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    latency = subparsers.add_parser("latency", help="p50/p95/p99 latency under concurrent load")
+    latency.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    latency.add_argument("--concurrency", type=int, default=100)
+    latency.add_argument("--requests", type=int, default=2000, help="Requests per endpoint")
+    latency.add_argument("--seed-transactions", type=int, default=200)
+    latency.add_argument("--save", help="Write results to this JSON file")
+    latency.add_argument("--compare", help="Show results next to a previously saved JSON file")
+
+    analysis = subparsers.add_parser("analysis", help="AIEngine pandas vs SQL vs rollup analysis")
+    analysis.add_argument(
+        "--sizes",
+        type=lambda value: [int(v) for v in value.split(",")],
+        default=[1000, 100000, 1000000],
+        help="Comma-separated transaction counts"
+    )
+    analysis.add_argument("--repeat", type=int, default=3)
+    analysis.add_argument("--keep", action="store_true", help="Keep the seeded users")
+
+    serialize = subparsers.add_parser("serialize", help="Transaction listing rows/sec by JSON encoding path")
+    serialize.add_argument("--rows", type=int, default=100000)
+    serialize.add_argument("--repeat", type=int, default=3)
+    serialize.add_argument("--keep", action="store_true", help="Keep the seeded user")
+
+    args = parser.parse_args()
+
+    if args.benchmark == "latency":
+        results = asyncio.run(run_latency(args))
+        baseline = None
+        if args.compare:
+            with open(args.compare) as f:
+                baseline = json.load(f)
+        print_results(
+            f"Latency @ concurrency={args.concurrency} against {args.base_url}",
+            results,
+            baseline
+        )
+        if args.save:
+            with open(args.save, "w") as f:
+                json.dump(results, f, indent=2)
+            print(f"\n[OK] Results saved to {args.save}")
+
+    elif args.benchmark == "analysis":
+        results = run_analysis(args)
+        print()
+        print_results("AIEngine analysis time by mode", results)
+
+    elif args.benchmark == "serialize":
+        results = run_serialize(args)
+        print()
+        print_results(f"Listing {args.rows} transactions as JSON", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""
+Script to check that the hot transaction queries stay on index scans.
+Runs EXPLAIN (FORMAT JSON) for the queries issued by main.py, dashboard.py
+and ai_engine.py (built with the same helpers) and fails if any of them
+falls back to a sequential scan, a bitmap AND/OR of several indexes, or an
+in-memory sort. A bitmap heap scan over a single index range is accepted,
+except for aggregates the covering indexes are meant to answer on their
+own, which must use an Index Only Scan.
+
+Requires PostgreSQL. The planner prefers sequential scans on tiny tables,
+so seed a realistic table first:
+
+Usage:
+    python check_query_plans.py [--seed-rows 500000] [--keep]
+"""
+
+import argparse
+import json
+import sys
+from datetime import date, timedelta
+from typing import Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects import postgresql
+
+# Load environment variables
+load_dotenv()
+
+import dashboard
+import pagination
+import serialization
+import timeseries
+from ai_engine import AIEngine
+from database import engine, init_db
+from models import MonthlyCategoryTotal, Transaction
+from user_cache import user_rows_statement
+
+SEED_PREFIX = "plancheck_"
+SEED_USERS = 100
+
+# Node types that read a table without walking a single index range
+BAD_SCANS = {"Seq Scan", "BitmapAnd", "BitmapOr"}
+
+# Node types that visit table rows (not allowed for covering-index queries)
+TABLE_SCANS = {"Seq Scan", "Index Scan", "Bitmap Heap Scan"}
+
+
+def hot_queries(user_id: int):
+    """
+    Build the hot queries with the same helpers main.py, dashboard.py and
+    ai_engine.py use to issue them.
+
+    Returns:
+        List of (name, statement, sorted_output, index_only) tuples;
+        sorted_output marks queries whose ORDER BY must be satisfied by the
+        index (no Sort node), index_only those that must be answered from a
+        covering index (Index Only Scan) without visiting the table.
+    """
+    end = date.today()
+    start = end - timedelta(days=90)
+    dialect_name = postgresql.dialect.name
+
+    listing = serialization.transaction_rows_query(user_id)
+    by_date = lambda c: [c.date.desc()]
+    offset_page = listing.order_by(Transaction.date.desc()).offset(0).limit(100)
+    keyset_page, keyset_order = pagination.transaction_keyset_page(listing, (start, 0), 100)
+    # The user-check variants re-sort only the page's rows on top of the join
+
+    queries = [
+        (
+            "get_transactions (offset page)",
+            offset_page,
+            True, False,
+        ),
+        (
+            "get_transactions (offset page, user check)",
+            user_rows_statement(user_id, offset_page, by_date),
+            False, False,
+        ),
+        (
+            "get_transactions (date range)",
+            serialization.transaction_rows_query(user_id, start, end)
+            .order_by(Transaction.date.desc()).limit(100),
+            True, False,
+        ),
+        (
+            "get_transactions (category)",
+            serialization.transaction_rows_query(user_id, category="Food")
+            .order_by(Transaction.date.desc()).limit(100),
+            True, False,
+        ),
+        (
+            "get_transactions (keyset page)",
+            keyset_page,
+            True, False,
+        ),
+        (
+            "get_transactions (keyset page, user check)",
+            user_rows_statement(user_id, keyset_page, keyset_order),
+            False, False,
+        ),
+        (
+            "get_transaction_summary (date range)",
+            select(
+                Transaction.category,
+                func.count(Transaction.id),
+                func.sum(Transaction.amount)
+            ).where(
+                Transaction.user_id == user_id,
+                Transaction.date >= start + timedelta(days=1),
+                Transaction.date <= end
+            ).group_by(Transaction.category),
+            False, True,
+        ),
+        (
+            "get_transaction_summary (rollups)",
+            select(
+                MonthlyCategoryTotal.category,
+                func.sum(MonthlyCategoryTotal.count),
+                func.sum(MonthlyCategoryTotal.total)
+            ).where(MonthlyCategoryTotal.user_id == user_id).group_by(MonthlyCategoryTotal.category),
+            False, False,
+        ),
+        (
+            "get_transaction_timeseries (day)",
+            timeseries.totals_query(user_id, "day", dialect_name, start, end),
+            False, True,
+        ),
+        (
+            "get_transaction_timeseries (week, category)",
+            timeseries.totals_query(user_id, "week", dialect_name, start, end, "Food"),
+            False, True,
+        ),
+        (
+            "get_transaction_timeseries (month, rollups)",
+            timeseries.totals_query(user_id, "month", dialect_name),
+            False, False,
+        ),
+        (
+            "get_dashboard",
+            dashboard.dashboard_query(user_id, dialect_name),
+            False, False,
+        ),
+    ]
+    for mode in ("rollup", "sql"):
+        engine_for_mode = AIEngine(mock_mode=True, analysis_mode=mode)
+        queries.append((
+            f"AIEngine.generate_suggestions (ANALYSIS_MODE={mode})",
+            engine_for_mode._analysis_statement(user_id, dialect_name),
+            False, mode == "sql",
+        ))
+    return queries
+
+
+def _is_transactions(relation: Optional[str]) -> bool:
+    """Whether relation is the transactions table or one of its monthly partitions."""
+    return relation is not None and (
+        relation == Transaction.__tablename__ or relation.startswith(f"{Transaction.__tablename__}_")
+    )
+
+
+def walk_plan(node, path=()):
+    """Yield (path, node) for every node in an EXPLAIN JSON plan tree."""
+    yield path, node
+    for child in node.get("Plans", []):
+        yield from walk_plan(child, path + (node["Node Type"],))
+
+
+def check_plan(plan: dict, sorted_output: bool, index_only: bool):
+    """
+    Return a list of problems found in one query plan.
+
+    Args:
+        plan: Top-level "Plan" node from EXPLAIN (FORMAT JSON)
+        sorted_output: Whether the query's ORDER BY must come from an index
+        index_only: Whether transactions must be read with Index Only Scans
+    """
+    problems = []
+    for _, node in walk_plan(plan):
+        node_type = node["Node Type"]
+        relation = node.get("Relation Name")
+        if node_type in BAD_SCANS and relation in (None, Transaction.__tablename__, MonthlyCategoryTotal.__tablename__):
+            problems.append(f"{node_type} on {relation or 'index bitmap'}")
+        if index_only and node_type in TABLE_SCANS and _is_transactions(relation):
+            problems.append(f"{node_type} on {relation} (expected Index Only Scan)")
+        if sorted_output and node_type in ("Sort", "Incremental Sort"):
+            problems.append(f"{node_type} (ORDER BY not served by an index)")
+    return problems
+
+
+def seed(conn, rows: int):
+    """Insert synthetic users, transactions and their rollups."""
+    print(f"\nSeeding {rows} transactions across {SEED_USERS} users...")
+    conn.execute(text(
+        "INSERT INTO users (username, home_currency) "
+        "SELECT :prefix || g, 'USD' FROM generate_series(1, :users) AS g"
+    ), {"prefix": SEED_PREFIX, "users": SEED_USERS})
+    conn.execute(text(
+        "INSERT INTO transactions (user_id, amount, category, currency, date) "
+        "SELECT u.id, round((random() * 200 + 1)::numeric, 2), "
+        "(ARRAY['Food','Rent','Transport','Entertainment','Shopping','Travel'])[1 + (g % 6)], "
+        "'USD', current_date - (g % 1095) "
+        "FROM generate_series(1, :rows) AS g "
+        "JOIN users u ON u.username = :prefix || (1 + g % :users)"
+    ), {"prefix": SEED_PREFIX, "users": SEED_USERS, "rows": rows})
+    conn.execute(text(
+        "INSERT INTO monthly_category_totals (user_id, year_month, category, total, count) "
+        "SELECT t.user_id, date_trunc('month', t.date)::date, t.category, sum(t.amount), count(*) "
+        "FROM transactions t JOIN users u ON u.id = t.user_id "
+        "WHERE u.username LIKE :pattern GROUP BY 1, 2, 3"
+    ), {"pattern": SEED_PREFIX + "%"})
+
+
+def vacuum_analyze():
+    """Refresh planner statistics and the visibility map (enables index-only scans)."""
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("VACUUM ANALYZE transactions"))
+        conn.execute(text("VACUUM ANALYZE monthly_category_totals"))
+
+
+def cleanup(conn):
+    """Remove seeded users (transactions cascade)."""
+    conn.execute(text("DELETE FROM users WHERE username LIKE :pattern"), {"pattern": SEED_PREFIX + "%"})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check hot query plans stay on indexes")
+    parser.add_argument("--seed-rows", type=int, default=0, help="Seed this many synthetic transactions first")
+    parser.add_argument("--keep", action="store_true", help="Keep seeded rows afterwards")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Checking Query Plans")
+    print("=" * 60)
+
+    if engine.dialect.name != "postgresql":
+        print("[FAIL] check_query_plans.py requires PostgreSQL")
+        return 1
+
+    init_db()
+    failures = 0
+    if args.seed_rows:
+        with engine.begin() as conn:
+            seed(conn, args.seed_rows)
+    vacuum_analyze()
+
+    with engine.begin() as conn:
+        user_id = conn.execute(text(
+            "SELECT user_id FROM transactions GROUP BY user_id ORDER BY count(*) DESC LIMIT 1"
+        )).scalar()
+        if user_id is None:
+            print("[FAIL] No transactions to plan against. Use --seed-rows.")
+            return 1
+
+        for name, statement, sorted_output, index_only in hot_queries(user_id):
+            sql = statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+            plan = conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            problems = check_plan(plan[0]["Plan"], sorted_output, index_only)
+            if problems:
+                failures += 1
+                print(f"[FAIL] {name}: {', '.join(problems)}")
+            else:
+                scans = sorted({
+                    f"{node['Node Type']} using {node['Index Name']}"
+                    for _, node in walk_plan(plan[0]["Plan"]) if "Index Name" in node
+                })
+                print(f"[OK] {name}: {'; '.join(scans)}")
+
+        if args.seed_rows and not args.keep:
+            cleanup(conn)
+
+    print()
+    if failures:
+        print(f"[FAIL] {failures} hot queries are not on index scans")
+        return 1
+    print("[OK] All hot queries use index scans")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
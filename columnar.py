@@ -0,0 +1,216 @@
+"""
+Columnar transaction payloads for FINIX backend.
+Stateless endpoints accept transactions as parallel arrays
+({"amount": [...], "category": [...], "currency": [...], "date": [...]})
+and validate them here with whole-column checks that mirror the field rules
+of StatelessTransactionInput, instead of building one Pydantic model per row.
+"""
+
+from decimal import Decimal, InvalidOperation
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# Field rules of StatelessTransactionInput
+CATEGORY_MAX_LENGTH = 50
+CURRENCY_LENGTH = 3
+DESCRIPTION_MAX_LENGTH = 255
+DEFAULT_CURRENCY = "USD"
+
+# Failing rows reported per check; the rest are summarized as a count
+MAX_REPORTED_ROWS = 10
+
+# Amount strings up to this long have at most 15 significant digits, so
+# they read back from float64 exactly
+MAX_BULK_AMOUNT_LENGTH = 15
+
+# Whole cents below this are exact in float64
+MAX_EXACT_CENTS = 2 ** 53
+
+
+class ColumnarValidationError(ValueError):
+    """Raised when a columnar payload fails validation; errors lists 'field.row: message' strings."""
+
+    def __init__(self, errors: List[str]):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+
+def _report(errors: List[str], field: str, invalid: np.ndarray, message: str) -> None:
+    """Append one error per failing row (up to MAX_REPORTED_ROWS)."""
+    rows = np.flatnonzero(invalid)
+    for row in rows[:MAX_REPORTED_ROWS]:
+        errors.append(f"{field}.{row}: {message}")
+    if len(rows) > MAX_REPORTED_ROWS:
+        errors.append(f"{field}: {len(rows) - MAX_REPORTED_ROWS} more rows: {message}")
+
+
+def _decimal(value) -> Optional[Decimal]:
+    """
+    Read an amount the way StatelessTransactionInput.amount does: numbers
+    and numeric strings (floats via their repr), never booleans.
+
+    Returns:
+        The exact Decimal, or None if the value is not a finite number
+    """
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        return None
+    try:
+        amount = Decimal(value if isinstance(value, str) else str(value))
+    except InvalidOperation:
+        return None
+    return amount if amount.is_finite() else None
+
+
+def _amount_cents(values: List) -> Tuple[np.ndarray, Dict[int, Optional[Decimal]]]:
+    """
+    Read an amount column in bulk: numbers and numeric strings are converted
+    with one pd.to_numeric, and the rows that are a whole number of cents
+    (checked on the whole column) are kept. Anything else (finer than a
+    cent, long strings, booleans, other types) is read row by row with
+    _decimal.
+
+    Returns:
+        (cents, exact): float64 cents per row (NaN for the rows read row by
+        row) and the exact Decimal (None if invalid) of each of those rows
+    """
+    size = len(values)
+    series = pd.Series(values, dtype=object)
+    kind = pd.api.types.infer_dtype(values, skipna=False)
+    if kind in ("integer", "floating", "mixed-integer-float"):
+        bulk = np.ones(size, dtype=bool)
+    elif kind == "string":
+        bulk = np.fromiter(map(len, values), dtype=np.int64, count=size) <= MAX_BULK_AMOUNT_LENGTH
+    else:
+        # type() is exact, so booleans are left to _decimal
+        types = series.map(type)
+        bulk = types.isin([int, float]).to_numpy(copy=True)
+        strings = (types == str).to_numpy()
+        bulk[strings] = series[strings].str.len().to_numpy() <= MAX_BULK_AMOUNT_LENGTH
+
+    number = pd.to_numeric(series[bulk], errors="coerce").to_numpy(dtype=float)
+    whole = np.round(number * 100)
+    # A number with at most two decimal places equals its whole cents / 100
+    # (NaN and infinities never do)
+    whole_cents = (whole / 100 == number) & (np.abs(whole) < MAX_EXACT_CENTS)
+
+    cents = np.full(size, np.nan)
+    cents[np.flatnonzero(bulk)[whole_cents]] = whole[whole_cents]
+    exact = {row: _decimal(values[row]) for row in np.flatnonzero(np.isnan(cents)).tolist()}
+    return cents, exact
+
+
+def _string_lengths(values: List) -> pd.Series:
+    """Length of each string value; NaN where the value is not a string."""
+    if pd.api.types.infer_dtype(values, skipna=False) == "string":
+        # Common case: every value is a string
+        return pd.Series(np.fromiter(map(len, values), dtype=float, count=len(values)))
+    try:
+        return pd.Series(values, dtype=object).str.len().astype(float)
+    except AttributeError:
+        # .str refuses columns without a single string value
+        return pd.Series(np.nan, index=range(len(values)))
+
+
+def validate_columns(columns: Dict[str, List]) -> pd.DataFrame:
+    """
+    Validate parallel transaction arrays.
+
+    Args:
+        columns: amount, category and date arrays, plus optional currency
+            and description arrays, all the same length
+
+    Returns:
+        DataFrame with integer 'cents', 'category', 'currency', datetime64
+        'date' and 'description' columns (one row per transaction), plus an
+        'exact_amount' column when any amount is finer than a cent: the
+        exact Decimal for those rows, None for the rest
+
+    Raises:
+        ColumnarValidationError: If columns are missing, differ in length or
+            any value breaks the transaction field rules
+    """
+    missing = [name for name in ("amount", "category", "date") if columns.get(name) is None]
+    if missing:
+        raise ColumnarValidationError([f"{name}: Field required" for name in missing])
+
+    size = len(columns["amount"])
+    lengths = {name: len(values) for name, values in columns.items() if values is not None}
+    if any(length != size for length in lengths.values()):
+        raise ColumnarValidationError([f"columns: All arrays must have the same length (got {lengths})"])
+
+    errors: List[str] = []
+
+    cents, exact = _amount_cents(columns["amount"])
+    invalid_amount = np.isnan(cents)
+    not_positive = cents <= 0
+    for row, value in exact.items():
+        invalid_amount[row] = value is None
+        not_positive[row] = value is not None and value <= 0
+    _report(errors, "amount", invalid_amount, "Input should be a valid decimal")
+    _report(errors, "amount", not_positive, "Input should be greater than 0")
+
+    category = pd.Series(columns["category"], dtype=object)
+    category_length = _string_lengths(columns["category"])
+    _report(errors, "category", category_length.isna().to_numpy(), "Input should be a valid string")
+    _report(
+        errors, "category",
+        ((category_length < 1) | (category_length > CATEGORY_MAX_LENGTH)).to_numpy(),
+        f"String should have between 1 and {CATEGORY_MAX_LENGTH} characters"
+    )
+
+    if columns.get("currency") is None:
+        currency = pd.Series(DEFAULT_CURRENCY, index=range(size), dtype=object)
+    else:
+        currency = pd.Series(columns["currency"], dtype=object)
+        currency_length = _string_lengths(columns["currency"])
+        _report(errors, "currency", currency_length.isna().to_numpy(), "Input should be a valid string")
+        _report(
+            errors, "currency",
+            (currency_length.notna() & (currency_length != CURRENCY_LENGTH)).to_numpy(),
+            f"String should have {CURRENCY_LENGTH} characters"
+        )
+
+    # Non-string values (numbers, null) become NaT as well
+    parsed_date = pd.to_datetime(pd.Series(columns["date"], dtype=object), format="%Y-%m-%d", errors="coerce")
+    _report(errors, "date", parsed_date.isna().to_numpy(), "Input should be a valid date in YYYY-MM-DD format")
+
+    if columns.get("description") is None:
+        description = pd.Series(None, index=range(size), dtype=object)
+    else:
+        description = pd.Series(columns["description"], dtype=object)
+        description_length = _string_lengths(columns["description"])
+        _report(
+            errors, "description",
+            (description.notna() & description_length.isna()).to_numpy(),
+            "Input should be a valid string"
+        )
+        _report(
+            errors, "description",
+            (description_length > DESCRIPTION_MAX_LENGTH).to_numpy(),
+            f"String should have at most {DESCRIPTION_MAX_LENGTH} characters"
+        )
+
+    if errors:
+        raise ColumnarValidationError(errors)
+
+    for row, value in exact.items():
+        cents[row] = float(value.scaleb(2).to_integral_value())
+    exact = {row: value for row, value in exact.items() if value != value.quantize(Decimal("0.01"))}
+
+    frame = pd.DataFrame({
+        # Integer cents, as in AIEngine._analyze_transactions
+        "cents": cents.astype("int64"),
+        "category": category,
+        "currency": currency,
+        "date": parsed_date,
+        "description": description,
+    })
+    if exact:
+        # Amounts finer than a cent, so sums match the row-by-row path
+        exact_amount = pd.Series(None, index=range(size), dtype=object)
+        exact_amount[list(exact)] = list(exact.values())
+        frame["exact_amount"] = exact_amount
+    return frame
@@ -0,0 +1,181 @@
+"""
+User dashboard for FINIX backend.
+Loads everything the dashboard page shows (user, recent transactions,
+monthly category rollups and travel goals) with one CTE-based statement:
+each per-user set is aggregated into a JSON array column next to the
+user's row, so a page load costs one database round-trip, and a missing
+row doubles as the user-existence check.
+"""
+
+import json
+import os
+from datetime import date
+from decimal import Decimal, ROUND_HALF_UP
+from types import SimpleNamespace
+from typing import Callable, Dict, List
+
+from sqlalchemy import func, literal_column, select
+
+from models import MonthlyCategoryTotal, Transaction, TravelGoal, User
+import serialization
+
+
+# Transactions shown in the dashboard's recent activity list
+DASHBOARD_RECENT_TRANSACTIONS = int(os.getenv("DASHBOARD_RECENT_TRANSACTIONS", 10))
+
+USER_FIELDS = ("id", "username", "home_currency", "created_at", "updated_at")
+ROLLUP_FIELDS = ("year_month", "category", "total", "count")
+GOAL_FIELDS = (
+    "id", "user_id", "name", "target_amount", "current_saved",
+    "target_date", "destination", "created_at", "updated_at"
+)
+
+# Numeric columns returned with two decimal places by the other endpoints
+MONEY_FIELDS = {"amount", "target_amount", "current_saved", "total"}
+
+
+def _json_rows(cte, dialect_name: str, order_by: Callable = None):
+    """
+    Scalar subquery aggregating a CTE's rows into a JSON array of objects.
+
+    Args:
+        cte: CTE whose columns become the object keys
+        dialect_name: Name of the bound dialect ("postgresql", "sqlite", ...)
+        order_by: Optional callable mapping the CTE's columns to ORDER BY
+            clauses for the array elements
+
+    Returns:
+        Scalar subquery yielding the JSON text ('[]' when there are no rows)
+    """
+    if order_by is not None:
+        # Aggregate from a sorted subquery: the portable way to order
+        # json_agg / json_group_array input (SQLite before 3.44 has no
+        # ORDER BY inside aggregates); neither database flattens it away
+        cte = select(cte).order_by(*order_by(cte.c)).subquery()
+    pairs = []
+    for column in cte.c:
+        pairs.extend([literal_column(f"'{column.name}'"), column])
+    if dialect_name == "sqlite":
+        aggregate = func.json_group_array(func.json_object(*pairs))
+    else:
+        aggregate = func.coalesce(
+            func.json_agg(func.json_build_object(*pairs)),
+            literal_column("'[]'::json")
+        )
+    return select(aggregate).select_from(cte).scalar_subquery()
+
+
+def dashboard_query(user_id: int, dialect_name: str, recent_limit: int = DASHBOARD_RECENT_TRANSACTIONS):
+    """
+    Build the single dashboard statement.
+
+        WITH recent AS (...), months AS (...), goals AS (...)
+        SELECT users.*, (<recent as JSON>), (<months as JSON>), (<goals as JSON>)
+        FROM users WHERE users.id = :user_id
+
+    Args:
+        user_id: User ID
+        dialect_name: Name of the bound dialect (for the JSON functions)
+        recent_limit: Number of recent transactions to include
+
+    Returns:
+        select() yielding one row (USER_FIELDS + recent, months, goals JSON
+        columns; recent newest first, goals most recently created first),
+        or no row if the user does not exist
+    """
+    recent = (
+        serialization.transaction_rows_query(user_id)
+        .order_by(Transaction.date.desc(), Transaction.id)
+        .limit(recent_limit)
+        .cte("recent")
+    )
+    months = select(
+        *[getattr(MonthlyCategoryTotal, field) for field in ROLLUP_FIELDS]
+    ).where(MonthlyCategoryTotal.user_id == user_id).cte("months")
+    goals = select(
+        *[getattr(TravelGoal, field) for field in GOAL_FIELDS]
+    ).where(TravelGoal.user_id == user_id).cte("goals")
+
+    return select(
+        *[getattr(User, field) for field in USER_FIELDS],
+        _json_rows(recent, dialect_name, lambda c: [c.date.desc(), c.id]).label("recent"),
+        _json_rows(months, dialect_name).label("months"),
+        _json_rows(goals, dialect_name, lambda c: [c.created_at.desc(), c.id.desc()]).label("goals"),
+    ).where(User.id == user_id)
+
+
+def load_json_rows(value) -> List[Dict]:
+    """
+    Decode one JSON array column of the dashboard row.
+
+    Numbers are read as Decimals and money fields rounded to cents, so the
+    rows match the ORM-backed endpoints on every dialect.
+    """
+    if value is None:
+        return []
+    rows = json.loads(value, parse_float=Decimal) if isinstance(value, (str, bytes)) else value
+    for row in rows:
+        for field in MONEY_FIELDS.intersection(row):
+            if row[field] is not None:
+                row[field] = Decimal(row[field]).quantize(Decimal("0.01"))
+    return rows
+
+
+def build_dashboard(row, ai_engine) -> Dict:
+    """
+    Shape the dashboard row into DashboardResponse fields.
+
+    The category summary is summed from the monthly rollups; goal
+    estimates use the same spending analysis and savings metrics as the
+    AI suggestions (honouring ANALYSIS_LOOKBACK_MONTHS).
+
+    Args:
+        row: Row returned by dashboard_query
+        ai_engine: AIEngine used for the spending analysis (no LLM calls are made)
+
+    Returns:
+        Dict with user, recent_transactions, summary and travel_goals
+    """
+    recent = load_json_rows(row.recent)
+    months = [
+        SimpleNamespace(**{**rollup, "year_month": date.fromisoformat(rollup["year_month"])})
+        for rollup in load_json_rows(row.months)
+    ]
+    goals = load_json_rows(row.goals)
+
+    total_transactions = 0
+    total_amount = Decimal("0")
+    categories: Dict[str, Decimal] = {}
+    for rollup in months:
+        total_transactions += int(rollup.count)
+        total_amount += rollup.total
+        categories[rollup.category] = categories.get(rollup.category, Decimal("0")) + rollup.total
+    average_amount = (
+        (total_amount / total_transactions).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+        if total_transactions else Decimal("0")
+    )
+
+    goal_metrics = ai_engine.goal_metrics(months, [SimpleNamespace(**goal) for goal in goals])
+    travel_goals = []
+    for goal, metrics in zip(goals, goal_metrics):
+        progress = min(Decimal("100"), goal["current_saved"] / goal["target_amount"] * 100)
+        reached = metrics["remaining_amount"] <= 0
+        travel_goals.append({
+            **goal,
+            "progress_percent": float(progress.quantize(Decimal("0.01"))),
+            "remaining_amount": max(metrics["remaining_amount"], Decimal("0")),
+            "months_to_goal_current": 0.0 if reached else metrics["months_to_goal_current"],
+            "months_to_goal_optimized": 0.0 if reached else metrics["months_to_goal_optimized"],
+        })
+
+    return {
+        "user": dict(zip(USER_FIELDS, row[:len(USER_FIELDS)])),
+        "recent_transactions": recent,
+        "summary": {
+            "total_transactions": total_transactions,
+            "total_amount": total_amount,
+            "average_amount": average_amount,
+            "categories": {category: categories[category] for category in sorted(categories)},
+        },
+        "travel_goals": travel_goals,
+    }
@@ -3,12 +3,18 @@ Database connection and session management for FINIX backend.
 Handles PostgreSQL connection pooling and session lifecycle.
 """
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
 import os
-from typing import Generator, Optional
+import uuid
+from typing import AsyncGenerator, Generator, Optional, Tuple
+
+import db_pool
+import partitions
 
 # Database URL from environment variable
 DATABASE_URL = os.getenv(
@@ -19,18 +25,158 @@ DATABASE_URL = os.getenv(
 # Flag to skip database initialization (useful for testing without DB)
 SKIP_DB_INIT = os.getenv("SKIP_DB_INIT", "false").lower() == "true"
 
+# Set by run.py once it has initialized the schema before starting workers,
+# so that they do not all run create_all at the same time
+DB_SCHEMA_READY = os.getenv("DB_SCHEMA_READY", "false").lower() == "true"
+
+# Connections this server may open in total, across all worker processes;
+# keep it below PostgreSQL's max_connections minus other clients' share
+DB_MAX_CONNECTIONS = int(os.getenv("DB_MAX_CONNECTIONS", 100))
+
+# Worker processes sharing DB_MAX_CONNECTIONS (set by `python run.py --production`)
+WEB_CONCURRENCY = max(1, int(os.getenv("WEB_CONCURRENCY", 1)))
+
+# The sync engine only serves startup, /health and the CLI scripts
+SYNC_POOL_SIZE = 2
+SYNC_MAX_OVERFLOW = 1
+
+
+def _async_pool_limits(max_connections: int, workers: int) -> Tuple[int, int]:
+    """
+    Size one worker's async pool so that all workers together stay within
+    max_connections (a single worker keeps the previous 10 + 20).
+
+    Args:
+        max_connections: Connection budget of the whole server
+        workers: Number of worker processes
+
+    Returns:
+        Tuple[int, int]: (pool_size, max_overflow)
+    """
+    budget = max(1, max_connections // workers - SYNC_POOL_SIZE - SYNC_MAX_OVERFLOW)
+    pool_size = min(10, max(1, budget // 3))
+    return pool_size, min(20, budget - pool_size)
+
+
+# Async pool per worker; DB_POOL_SIZE / DB_MAX_OVERFLOW override the derived sizes
+_derived_pool_size, _derived_max_overflow = _async_pool_limits(DB_MAX_CONNECTIONS, WEB_CONCURRENCY)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", _derived_pool_size))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", _derived_max_overflow))
+
+
+# Seconds between background pings of idle async connections; when set,
+# requests check connections out without a pre-ping round-trip
+DB_POOL_VALIDATION_INTERVAL = float(os.getenv("DB_POOL_VALIDATION_INTERVAL", 0))
+
+# ASYNC_DATABASE_URL points at PgBouncer in transaction pooling mode: no
+# app-side async pool (PgBouncer pools) and no reused prepared statements
+DB_PGBOUNCER = os.getenv("DB_PGBOUNCER", "false").lower() == "true"
+
+
+def _connections_per_worker(pool_size: int, max_overflow: int) -> int:
+    """Most connections one worker can open (async pool plus sync pool)."""
+    return pool_size + max_overflow + SYNC_POOL_SIZE + SYNC_MAX_OVERFLOW
+
+
+# Each worker gets at least one async connection even when the budget is too
+# small for that, so such a configuration overshoots DB_MAX_CONNECTIONS
+_max_server_connections = WEB_CONCURRENCY * _connections_per_worker(DB_POOL_SIZE, DB_MAX_OVERFLOW)
+if not DB_PGBOUNCER and _max_server_connections > DB_MAX_CONNECTIONS:
+    print(
+        f"[WARNING] {WEB_CONCURRENCY} workers may open up to {_max_server_connections} database "
+        f"connections, more than DB_MAX_CONNECTIONS={DB_MAX_CONNECTIONS} (each worker needs at "
+        f"least {_connections_per_worker(1, 0)}). Raise DB_MAX_CONNECTIONS, lower WEB_CONCURRENCY "
+        f"or DB_POOL_SIZE / DB_MAX_OVERFLOW, or pool through PgBouncer (DB_PGBOUNCER=true)."
+    )
+
+# Pool usage counters reported by GET /admin/db-pool
+sync_pool_stats = db_pool.PoolStats()
+async_pool_stats = db_pool.PoolStats()
+
 # Create SQLAlchemy engine
 engine = create_engine(
     DATABASE_URL,
+    poolclass=db_pool.instrumented_pool_class(QueuePool, sync_pool_stats),
     pool_pre_ping=True,  # Verify connections before using them
-    pool_size=10,
-    max_overflow=20,
+    pool_size=SYNC_POOL_SIZE,
+    max_overflow=SYNC_MAX_OVERFLOW,
     echo=False  # Set to True for SQL query logging during development
 )
 
+db_pool.instrument_engine(engine, sync_pool_stats)
+
+# Range-partition transactions by month (PostgreSQL only; see partitions.py).
+# Only takes effect when the table is first created.
+PARTITION_TRANSACTIONS = (
+    os.getenv("PARTITION_TRANSACTIONS", "false").lower() == "true"
+    and engine.dialect.name == "postgresql"
+)
+
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def _async_database_url(url: str) -> str:
+    """
+    Map a synchronous database URL onto the matching asyncio driver.
+
+    Args:
+        url: SQLAlchemy URL using a sync driver (psycopg2, pysqlite)
+
+    Returns:
+        str: The same URL using asyncpg / aiosqlite
+    """
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    return url
+
+
+# Async database URL (derived from DATABASE_URL unless set explicitly)
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", _async_database_url(DATABASE_URL))
+
+
+def _async_engine_options() -> dict:
+    """
+    Pool and driver options for the async engine.
+
+    Returns:
+        dict: Keyword arguments for create_async_engine
+    """
+    if DB_PGBOUNCER:
+        # A statement prepared on one server connection may be executed on
+        # another, so do not cache them and give each a unique name
+        return {
+            "poolclass": db_pool.instrumented_pool_class(NullPool, async_pool_stats),
+            "connect_args": {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+            },
+        }
+    return {
+        "poolclass": db_pool.instrumented_pool_class(AsyncAdaptedQueuePool, async_pool_stats),
+        "pool_pre_ping": DB_POOL_VALIDATION_INTERVAL <= 0,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+    }
+
+
+# Create async SQLAlchemy engine used by the request handlers in main.py,
+# so a slow query no longer blocks the event loop for every other request
+async_engine = create_async_engine(ASYNC_DATABASE_URL, echo=False, **_async_engine_options())
+db_pool.instrument_engine(async_engine.sync_engine, async_pool_stats)
+
+# Create AsyncSessionLocal class (objects stay readable after commit)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 # Create Base class for models
 Base = declarative_base()
 
@@ -47,6 +193,15 @@ def get_db() -> Generator:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency function for FastAPI to get async database sessions.
+    Yields an AsyncSession and ensures proper cleanup.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def init_db() -> bool:
     """
     Initialize the database by creating all tables.
@@ -58,9 +213,17 @@ def init_db() -> bool:
     if SKIP_DB_INIT:
         print("[INFO] Database initialization skipped (SKIP_DB_INIT=true)")
         return False
+    if DB_SCHEMA_READY:
+        return True
     
     try:
+        # Register the tables on Base.metadata (models imports this module)
+        import models  # noqa: F401
         Base.metadata.create_all(bind=engine)
+        upgrade_schema()
+        backfill_rollups()
+        if PARTITION_TRANSACTIONS:
+            partitions.ensure_partitions(engine)
         print("[OK] Database tables initialized successfully")
         return True
     except OperationalError as e:
@@ -72,6 +235,50 @@ def init_db() -> bool:
         return False
 
 
+def upgrade_schema() -> None:
+    """
+    Bring tables created by an older release up to date.
+    
+    create_all only creates missing tables; this adds nullable columns and
+    indexes that were introduced later to tables that already exist.
+    """
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        existing_tables = set(inspector.get_table_names())
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing_columns and column.nullable:
+                    column_type = column.type.compile(dialect=conn.dialect)
+                    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+                    print(f"[INFO] Added column {table.name}.{column.name}")
+            existing_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    index.create(conn)
+                    print(f"[INFO] Created index {index.name}")
+
+
+def backfill_rollups() -> None:
+    """
+    Build the monthly category rollups for existing transactions the first
+    time a database without them is started (summaries, timeseries and
+    AI analysis read the rollups).
+    """
+    import rollups
+
+    db = SessionLocal()
+    try:
+        if rollups.needs_backfill(db):
+            print("[INFO] Backfilling monthly category rollups for existing transactions...")
+            written = rollups.backfill(db)
+            print(f"[OK] Backfilled {written} rollup rows")
+    finally:
+        db.close()
+
+
 def check_db_connection() -> bool:
     """
     Check if database connection is available.
@@ -0,0 +1,201 @@
+"""
+Connection-pool instrumentation for FINIX backend.
+Each engine's pool class is wrapped so that every checkout records how long
+it waited for a connection, and pool events count new connections,
+invalidations and failed pre-pings. GET /admin/db-pool reports the numbers
+per worker, which shows whether DB_MAX_CONNECTIONS / DB_POOL_SIZE leave
+requests queueing for connections.
+
+Also provides background validation of idle connections, which replaces
+the per-checkout pre-ping (one round-trip per request) when
+DB_POOL_VALIDATION_INTERVAL is set.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import event, exc
+
+
+class PoolStats:
+    """Counters for one engine's pool (shared by pools it is recreated as)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.checked_out = 0
+        self.peak_checked_out = 0
+        self.peak_overflow = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.pre_ping_failures = 0
+        self.validations = 0
+        self.validation_failures = 0
+
+    def record_checkout(self, wait: float, overflow: int):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+            self.checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+            self.peak_overflow = max(self.peak_overflow, overflow)
+
+    def record_timeout(self, wait: float):
+        with self._lock:
+            self.checkout_timeouts += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+
+    def record_checkin(self):
+        with self._lock:
+            self.checked_out -= 1
+
+    def record_invalidation(self, exception: Optional[BaseException]):
+        with self._lock:
+            self.invalidations += 1
+            # Pre-ping (and only pre-ping here) reports a failed ping as a disconnection
+            if isinstance(exception, exc.DisconnectionError):
+                self.pre_ping_failures += 1
+
+    def snapshot(self, pool) -> Dict:
+        """
+        Current counters plus the pool's configuration.
+
+        Args:
+            pool: The engine's current pool
+
+        Returns:
+            Dict of pool settings and usage, wait times in milliseconds
+        """
+        size = pool.size() if hasattr(pool, "size") else 0
+        with self._lock:
+            attempts = self.checkouts + self.checkout_timeouts
+            return {
+                "pool": type(pool).__bases__[-1].__name__,
+                "pool_size": size,
+                "max_overflow": getattr(pool, "_max_overflow", 0),
+                "pre_ping": pool._pre_ping,
+                "checked_out": self.checked_out,
+                "idle": pool.checkedin() if hasattr(pool, "checkedin") else 0,
+                "overflow_in_use": max(0, pool.overflow()) if hasattr(pool, "overflow") else 0,
+                "peak_checked_out": self.peak_checked_out,
+                "peak_overflow": self.peak_overflow,
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.checkout_timeouts,
+                "checkout_wait_avg_ms": round(self.wait_total / attempts * 1000, 3) if attempts else 0.0,
+                "checkout_wait_max_ms": round(self.wait_max * 1000, 3),
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "pre_ping_failures": self.pre_ping_failures,
+                "validations": self.validations,
+                "validation_failures": self.validation_failures,
+            }
+
+
+class _InstrumentedPool:
+    """Mixin timing Pool._do_get (the wait for a free connection)."""
+
+    stats: PoolStats
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.record_timeout(time.perf_counter() - start)
+            raise
+        overflow = self.overflow() if hasattr(self, "overflow") else 0
+        self.stats.record_checkout(time.perf_counter() - start, overflow)
+        return record
+
+    def _do_return_conn(self, record):
+        self.stats.record_checkin()
+        super()._do_return_conn(record)
+
+
+def instrumented_pool_class(pool_class, stats: PoolStats):
+    """
+    Subclass of pool_class reporting to stats. Pools recreated by
+    engine.dispose() keep the class, and with it the counters.
+
+    Args:
+        pool_class: SQLAlchemy pool class (QueuePool, AsyncAdaptedQueuePool, NullPool)
+        stats: Counters to report to
+
+    Returns:
+        The pool class to pass as create_engine(poolclass=...)
+    """
+    return type(f"Instrumented{pool_class.__name__}", (_InstrumentedPool, pool_class), {"stats": stats})
+
+
+def instrument_engine(engine, stats: PoolStats):
+    """
+    Count new and invalidated connections of a (sync) engine's pool.
+
+    Args:
+        engine: Engine (for an AsyncEngine pass async_engine.sync_engine)
+        stats: Counters to report to
+    """
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        with stats._lock:
+            stats.connects += 1
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        stats.record_invalidation(exception)
+
+
+async def validate_idle_connections(async_engine, stats: PoolStats) -> int:
+    """
+    Ping each idle pooled connection once, discarding the ones that fail,
+    so requests can check connections out without a pre-ping.
+
+    The pool hands out its oldest idle connection first, so checking out
+    and returning one connection checkedin() times visits each of them.
+
+    Args:
+        async_engine: AsyncEngine whose pool to validate
+        stats: Counters to report to
+
+    Returns:
+        int: Connections that failed and were discarded
+    """
+    failures = 0
+    for _ in range(async_engine.pool.checkedin()):
+        async with async_engine.connect() as conn:
+            try:
+                await conn.exec_driver_sql("SELECT 1")
+            except exc.DBAPIError:
+                failures += 1
+                if not conn.invalidated:
+                    await conn.invalidate()
+    with stats._lock:
+        stats.validations += 1
+        stats.validation_failures += failures
+    return failures
+
+
+async def run_validation(async_engine, stats: PoolStats, interval: float):
+    """
+    Validate idle connections every interval seconds until cancelled.
+
+    Args:
+        async_engine: AsyncEngine whose pool to validate
+        stats: Counters to report to
+        interval: Seconds between validation passes
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            failures = await validate_idle_connections(async_engine, stats)
+            if failures:
+                print(f"[WARNING] Discarded {failures} broken pooled database connection(s)")
+        except Exception as e:
+            print(f"[WARNING] Connection pool validation failed: {str(e)}")
@@ -0,0 +1,430 @@
+"""
+Bulk transaction ingestion for FINIX backend.
+Parses CSV / NDJSON payloads, validates each row and writes the valid rows
+in a single database transaction (COPY on PostgreSQL, multi-row INSERT elsewhere).
+
+Bank-statement imports go through the same validation, but are read in
+chunks, normalized from common statement column names and deduplicated by
+content hash, so re-uploading overlapping statements inserts nothing twice.
+"""
+
+import csv
+import hashlib
+import io
+import json
+import os
+import re
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import Transaction
+from schemas import TransactionBase
+import rollups
+
+
+CSV_CONTENT_TYPES = {"text/csv", "application/csv"}
+NDJSON_CONTENT_TYPES = {
+    "application/x-ndjson",
+    "application/ndjson",
+    "application/jsonl",
+    "application/x-jsonlines",
+}
+
+# Column order used for COPY and multi-row INSERT
+TRANSACTION_COLUMNS = ["user_id", "amount", "category", "currency", "date", "description"]
+
+# Statement rows validated and written per chunk
+IMPORT_CHUNK_ROWS = int(os.getenv("IMPORT_CHUNK_ROWS", 5000))
+
+# Statement column names (lowercased, '_'/'-' as spaces) -> Transaction field
+STATEMENT_COLUMN_ALIASES = {
+    "date": "date",
+    "transaction date": "date",
+    "posted date": "date",
+    "posting date": "date",
+    "booking date": "date",
+    "amount": "amount",
+    "transaction amount": "amount",
+    "debit": "debit",
+    "debit amount": "debit",
+    "withdrawal": "debit",
+    "credit": "credit",
+    "credit amount": "credit",
+    "deposit": "credit",
+    "description": "description",
+    "memo": "description",
+    "payee": "description",
+    "details": "description",
+    "narrative": "description",
+    "merchant": "description",
+    "category": "category",
+    "currency": "currency",
+    "currency code": "currency",
+}
+
+# Sign of spending in a signed statement amount column
+DEBIT_SIGNS = ("negative", "positive")
+
+# Category for statement rows that do not carry one
+DEFAULT_IMPORT_CATEGORY = "Uncategorized"
+
+
+def detect_format(content_type: str) -> str:
+    """
+    Map a request Content-Type onto an ingestion format.
+
+    Args:
+        content_type: Raw Content-Type header value
+
+    Returns:
+        str: "csv" or "ndjson"
+
+    Raises:
+        ValueError: If the content type is not supported
+    """
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type in CSV_CONTENT_TYPES:
+        return "csv"
+    if media_type in NDJSON_CONTENT_TYPES:
+        return "ndjson"
+    raise ValueError(
+        f"Unsupported content type '{media_type}'. "
+        "Send text/csv or application/x-ndjson."
+    )
+
+
+def parse_rows(body: bytes, fmt: str) -> Iterator[Tuple[int, object]]:
+    """
+    Split a CSV or NDJSON payload into raw rows.
+
+    Args:
+        body: Raw request body
+        fmt: "csv" or "ndjson"
+
+    Yields:
+        (row_number, row) tuples where row is a dict, or the exception raised
+        while decoding that row. Row numbers are 1-based data rows.
+    """
+    text = body.decode("utf-8-sig")
+
+    if fmt == "csv":
+        reader = csv.DictReader(io.StringIO(text))
+        for row_number, row in enumerate(reader, start=1):
+            # Drop empty cells so schema defaults (e.g. currency) apply
+            yield row_number, {
+                key.strip(): value.strip()
+                for key, value in row.items()
+                if key is not None and value not in (None, "")
+            }
+        return
+
+    row_number = 0
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            row = json.loads(line)
+            if not isinstance(row, dict):
+                raise ValueError("Each NDJSON line must be a JSON object")
+            yield row_number, row
+        except ValueError as e:
+            yield row_number, e
+
+
+def format_validation_error(error: ValidationError) -> List[str]:
+    """Flatten a Pydantic ValidationError into short 'field: message' strings."""
+    return [
+        f"{'.'.join(str(part) for part in err['loc']) or 'row'}: {err['msg']}"
+        for err in error.errors()
+    ]
+
+
+def validate_rows(rows: Iterator[Tuple[int, object]], user_id: int) -> Tuple[List[Dict], List[Dict], int]:
+    """
+    Validate raw rows against the transaction schema.
+
+    Args:
+        rows: (row_number, row) tuples from parse_rows
+        user_id: Owner of every row in the batch
+
+    Returns:
+        (valid_rows, errors, received) where valid_rows are dicts keyed by
+        TRANSACTION_COLUMNS and errors are {"row": n, "errors": [...]} dicts
+    """
+    valid_rows: List[Dict] = []
+    errors: List[Dict] = []
+    received = 0
+
+    for row_number, row in rows:
+        received += 1
+        if isinstance(row, Exception):
+            errors.append({"row": row_number, "errors": [f"row: {row}"]})
+            continue
+        try:
+            transaction = TransactionBase(**row)
+        except ValidationError as e:
+            errors.append({"row": row_number, "errors": format_validation_error(e)})
+            continue
+        valid_rows.append({"user_id": user_id, **transaction.dict()})
+
+    return valid_rows, errors, received
+
+
+async def write_transactions(db: AsyncSession, rows: List[Dict]) -> int:
+    """
+    Write validated transaction rows in the session's current transaction.
+
+    Uses COPY when the session is bound to PostgreSQL through asyncpg and a
+    multi-row INSERT otherwise, and adds the rows to the monthly rollups.
+    The caller is responsible for committing.
+
+    Args:
+        db: Async database session
+        rows: Dicts keyed by TRANSACTION_COLUMNS
+
+    Returns:
+        int: Number of rows written
+    """
+    if not rows:
+        return 0
+
+    # Rollups first: the upsert goes through SQLAlchemy and so also begins
+    # the DB transaction that the raw COPY below then joins
+    await rollups.apply_transactions(db, rows)
+
+    conn = await db.connection()
+    if conn.dialect.name == "postgresql" and conn.dialect.driver == "asyncpg":
+        raw_connection = await conn.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            Transaction.__tablename__,
+            records=[tuple(row[column] for column in TRANSACTION_COLUMNS) for row in rows],
+            columns=TRANSACTION_COLUMNS
+        )
+    else:
+        await db.execute(insert(Transaction), rows)
+
+    return len(rows)
+
+
+def _signed_amount(value: str) -> Tuple[str, bool]:
+    """
+    Strip currency symbols and thousands separators; returns (digits, negative),
+    "(12.50)" counting as negative.
+
+    Raises:
+        ValueError: If a comma could be a decimal separator ("1.234,56",
+            "12,5"), i.e. it follows the point or is not followed by exactly
+            three digits
+    """
+    cleaned = re.sub(r"[^0-9.,()\-]", "", value)
+    if "," in cleaned and (
+        "," in cleaned.partition(".")[2] or re.search(r",(?!\d{3}(?!\d))", cleaned.partition(".")[0])
+    ):
+        raise ValueError(f"Ambiguous amount {value!r}: use '.' for decimals and ',' only between thousands")
+    cleaned = cleaned.replace(",", "")
+    negative = cleaned.startswith("-") or cleaned.endswith("-") or cleaned.startswith("(")
+    return cleaned.strip("()-"), negative
+
+
+def _is_zero(amount: str) -> bool:
+    """Whether a cleaned amount reads as zero."""
+    try:
+        return Decimal(amount) == 0
+    except InvalidOperation:
+        return False
+
+
+def normalize_statement_row(
+    row: Dict[str, str],
+    date_format: Optional[str] = None,
+    debit_sign: str = "negative"
+) -> Optional[Dict[str, str]]:
+    """
+    Map a raw statement row onto TransactionBase fields.
+
+    Known column aliases are renamed (unknown columns are dropped), amounts
+    lose currency symbols and thousands separators, and dates are parsed
+    with date_format when one is given.
+
+    Only spending is imported, as a positive amount. A signed amount column
+    is spending when its sign is debit_sign; a Debit / Withdrawal column is
+    always spending (unless it is zero and the row has a Credit / Deposit
+    value), and a row with only a Credit / Deposit value never is. Zero
+    amounts are kept, so validation reports them instead of skipping them
+    as credits.
+
+    Args:
+        row: CSV row keyed by the statement's header
+        date_format: Optional strptime format for the date column
+        debit_sign: "negative" (spending shown as -12.50 or (12.50)) or
+            "positive" (spending shown as 12.50, money in as negative)
+
+    Returns:
+        Dict keyed by TransactionBase fields (values still unvalidated), or
+        None for a credit (money in) row
+
+    Raises:
+        ValueError: If the amount's decimal separator is ambiguous
+    """
+    normalized = {}
+    for key, value in row.items():
+        if key is None or value is None:
+            continue
+        field = STATEMENT_COLUMN_ALIASES.get(re.sub(r"[_\-\s]+", " ", key.strip().lower()))
+        value = value.strip()
+        if field and value and field not in normalized:
+            normalized[field] = value
+
+    debit = normalized.pop("debit", None)
+    credit = normalized.pop("credit", None)
+    if "amount" in normalized:
+        amount, negative = _signed_amount(normalized["amount"])
+        if negative != (debit_sign == "negative") and not _is_zero(amount):
+            return None
+        normalized["amount"] = amount
+    elif debit and not (credit and _is_zero(_signed_amount(debit)[0]) and not _is_zero(_signed_amount(credit)[0])):
+        normalized["amount"] = _signed_amount(debit)[0]
+    elif credit:
+        return None
+
+    if date_format and normalized.get("date"):
+        try:
+            normalized["date"] = datetime.strptime(normalized["date"], date_format).date()
+        except ValueError:
+            pass  # Left as-is; validation reports it
+
+    normalized.setdefault("category", DEFAULT_IMPORT_CATEGORY)
+    return normalized
+
+
+def content_hash(row: Dict, occurrence: int = 0) -> str:
+    """
+    Dedup key of a validated transaction row.
+
+    Hashes (user_id, date, amount, currency, description) plus the row's
+    occurrence number among identical rows of the same upload, so genuine
+    repeats within one statement (two identical coffees on a day) are kept
+    while re-imports of the same rows collide.
+
+    Args:
+        row: Validated row with user_id, date, amount, currency, description
+        occurrence: 0 for the first identical row in the upload, 1 for the next, ...
+
+    Returns:
+        str: sha256 hex digest
+    """
+    key = "|".join([
+        str(row["user_id"]),
+        row["date"].isoformat(),
+        str(Decimal(row["amount"]).quantize(Decimal("0.01"))),
+        row["currency"],
+        row["description"] or "",
+        str(occurrence),
+    ])
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def iter_statement_chunks(
+    stream: BinaryIO,
+    user_id: int,
+    date_format: Optional[str] = None,
+    chunk_rows: int = IMPORT_CHUNK_ROWS,
+    debit_sign: str = "negative"
+) -> Iterator[Tuple[List[Dict], List[Dict], int, int]]:
+    """
+    Parse, normalize, validate and hash a CSV statement chunk by chunk.
+
+    Args:
+        stream: Binary file positioned at the start of the CSV (with header)
+        user_id: Owner of every row
+        date_format: Optional strptime format for the date column
+        chunk_rows: Rows per chunk
+        debit_sign: Sign of spending in a signed amount column (see normalize_statement_row)
+
+    Yields:
+        (valid_rows, errors, received, credits) per chunk, as from
+        validate_rows plus the number of credit rows skipped (not counted
+        in received), with content_hash set on every valid row
+    """
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8-sig", newline=""))
+    occurrences: Dict[str, int] = {}
+
+    def chunk_of(rows, credits):
+        valid_rows, errors, received = validate_rows(rows, user_id)
+        for row in valid_rows:
+            base = content_hash(row)
+            occurrence = occurrences.get(base, 0)
+            occurrences[base] = occurrence + 1
+            row["content_hash"] = base if occurrence == 0 else content_hash(row, occurrence)
+        return valid_rows, errors, received, credits
+
+    pending = []
+    credits = 0
+    for row_number, row in enumerate(reader, start=1):
+        try:
+            normalized = normalize_statement_row(row, date_format, debit_sign)
+        except ValueError as e:
+            # Reported as a row error by validate_rows
+            normalized = e
+        if normalized is None:
+            credits += 1
+            continue
+        pending.append((row_number, normalized))
+        if len(pending) >= chunk_rows:
+            yield chunk_of(pending, credits)
+            pending = []
+            credits = 0
+    if pending or credits:
+        yield chunk_of(pending, credits)
+
+
+async def write_new_transactions(db: AsyncSession, rows: List[Dict]) -> int:
+    """
+    Insert hashed transaction rows, skipping any whose content_hash the user
+    already has, and add the inserted rows to the monthly rollups.
+
+    Uses INSERT ... ON CONFLICT DO NOTHING RETURNING against the
+    (user_id, date, content_hash) unique index on PostgreSQL and SQLite.
+    The caller is responsible for committing.
+
+    Args:
+        db: Async database session
+        rows: Dicts keyed by TRANSACTION_COLUMNS plus content_hash
+
+    Returns:
+        int: Number of rows inserted
+    """
+    if not rows:
+        return 0
+
+    conn = await db.connection()
+    dialect_name = conn.dialect.name
+    if dialect_name in ("postgresql", "sqlite"):
+        dialect_insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+        statement = dialect_insert(Transaction).on_conflict_do_nothing(
+            index_elements=["user_id", "date", "content_hash"]
+        ).returning(Transaction.user_id, Transaction.date, Transaction.category, Transaction.amount)
+        result = await db.execute(statement, rows)
+        inserted = [row._asdict() for row in result.all()]
+    else:
+        # Generic fallback: filter out known hashes, then insert the rest
+        result = await db.execute(
+            select(Transaction.content_hash).where(
+                Transaction.user_id == rows[0]["user_id"],
+                Transaction.content_hash.in_([row["content_hash"] for row in rows])
+            )
+        )
+        known = set(result.scalars().all())
+        inserted = [row for row in rows if row["content_hash"] not in known]
+        if inserted:
+            await db.execute(insert(Transaction), inserted)
+
+    await rollups.apply_transactions(db, inserted)
+    return len(inserted)
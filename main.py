@@ -3,15 +3,22 @@ FastAPI main application for FINIX backend.
 Entry point for all API endpoints and CORS configuration.
 """
 
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, Depends, HTTPException, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Literal, Optional, Union
 from datetime import date
+from decimal import Decimal, ROUND_HALF_UP
 from dotenv import load_dotenv
+import asyncio
+import csv
 import os
-from pydantic import BaseModel
+import tempfile
+from pydantic import BaseModel, ValidationError
 from fastapi import Body
 
 # Import travel routes
@@ -20,17 +27,34 @@ from travel_routes import register_travel_routes
 # Load environment variables from .env file
 load_dotenv()
 
-from database import get_db, init_db, engine
-from models import Base, User, Transaction, TravelGoal
+from database import get_async_db, init_db, engine, async_engine, AsyncSessionLocal
+import database
+from models import Base, User, Transaction, TravelGoal, MonthlyCategoryTotal
 from schemas import (
-    UserCreate, UserResponse,
-    TransactionCreate, TransactionResponse,
-    TravelGoalCreate, TravelGoalUpdate, TravelGoalResponse,
+    UserCreate, UserResponse, UserPage, DashboardResponse, BatchRequest, BatchResponse,
+    TransactionCreate, TransactionResponse, TransactionBulkResponse, TransactionImportResponse, TransactionPage,
+    TransactionSummaryResponse, TimeSeriesResponse,
+    TravelGoalCreate, TravelGoalUpdate, TravelGoalContribution, TravelGoalResponse,
     AISuggestionResponse,
-    SuggestionsCalculateRequest, TransactionsSummaryRequest,
-    StatelessTransactionInput
+    SuggestionsCalculateRequest,
+    StatelessTransactionInput, StatelessTransactionColumns
 )
 from ai_engine import AIEngine
+from suggestion_cache import suggestion_cache
+import ingest
+import rollups
+import columnar
+import dashboard
+import db_pool
+import export
+import pagination
+import partitions
+import serialization
+import timeseries
+import write_behind
+import writes
+import stream_parser
+from user_cache import remember_user, user_exists, select_for_user, select_rows_for_user
 from lib.utils import generateTravelSuggestions as generate_travel_suggestions_ai
 
 # Create FastAPI app instance
@@ -71,6 +95,31 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress responses larger than GZIP_MINIMUM_SIZE bytes for clients that accept gzip
+app.add_middleware(GZipMiddleware, minimum_size=int(os.getenv("GZIP_MINIMUM_SIZE", 1024)))
+
+
+# Statement uploads larger than this (bytes) are spooled to disk
+IMPORT_SPOOL_MAX_MEMORY = int(os.getenv("IMPORT_SPOOL_MAX_MEMORY", 8 * 1024 * 1024))
+
+# Largest /transactions/bulk body (bytes); larger uploads get 413
+BULK_MAX_BYTES = int(os.getenv("BULK_MAX_BYTES", 32 * 1024 * 1024))
+
+
+def negotiate_media_type(request: Request) -> str:
+    """Pick the response format from the Accept header (JSON unless msgpack or Arrow is asked for)."""
+    return serialization.negotiate(request.headers.get("accept"))
+
+
+# Batches POST /transactions/ inserts when TRANSACTION_WRITE_BEHIND=true
+transaction_batcher = write_behind.TransactionWriteBatcher(AsyncSessionLocal)
+
+# Background validation of idle pooled connections (DB_POOL_VALIDATION_INTERVAL)
+pool_validation_task: Optional[asyncio.Task] = None
+
+# Background creation of upcoming transaction partitions (TRANSACTION_PARTITION_INTERVAL)
+partition_maintenance_task: Optional[asyncio.Task] = None
+
 # AI Engine instance (lazy initialization)
 ai_engine: Optional[AIEngine] = None
 
@@ -90,9 +139,29 @@ def get_ai_engine() -> Optional[AIEngine]:
 @app.on_event("startup")
 async def startup_event():
     """Initialize database tables on application startup."""
+    global pool_validation_task, partition_maintenance_task
     db_initialized = init_db()
     if not db_initialized:
         print("[INFO] Running in database-less mode. Some endpoints may not work.")
+        return
+    if database.DB_POOL_VALIDATION_INTERVAL > 0 and not database.DB_PGBOUNCER:
+        pool_validation_task = asyncio.create_task(db_pool.run_validation(
+            async_engine, database.async_pool_stats, database.DB_POOL_VALIDATION_INTERVAL
+        ))
+    if database.PARTITION_TRANSACTIONS and partitions.PARTITION_MAINTENANCE_INTERVAL > 0:
+        partition_maintenance_task = asyncio.create_task(partitions.run_maintenance(engine))
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Flush queued writes, then release pooled async database and LLM connections on application shutdown."""
+    for task in (pool_validation_task, partition_maintenance_task):
+        if task is not None:
+            task.cancel()
+    await transaction_batcher.close()
+    await async_engine.dispose()
+    if ai_engine is not None:
+        await ai_engine.aclose()
 
 
 # Health Check Endpoint
@@ -116,45 +185,37 @@ async def health_check():
 # ==================== USER ENDPOINTS ====================
 
 @app.post("/users/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def create_user(user: UserCreate, db: Session = Depends(get_db)):
+async def create_user(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Create a new user account.
     
     Args:
         user: User creation data
-        db: Database session
+        db: Async database session
         
     Returns:
         Created user object
     """
-    # Check if username already exists
-    existing_user = db.query(User).filter(User.username == user.username).first()
-    if existing_user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Username already exists"
-        )
-    
-    db_user = User(**user.dict())
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    # One round-trip: INSERT ... RETURNING reads back the server defaults,
+    # and the unique index on username rejects duplicates
+    db_user = await writes.create_user(db, user)
+    await db.commit()
     return db_user
 
 
 @app.get("/users/{user_id}", response_model=UserResponse)
-async def get_user(user_id: int, db: Session = Depends(get_db)):
+async def get_user(user_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Get user by ID.
     
     Args:
         user_id: User ID
-        db: Database session
+        db: Async database session
         
     Returns:
         User object
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -163,210 +224,647 @@ async def get_user(user_id: int, db: Session = Depends(get_db)):
     return user
 
 
-@app.get("/users/", response_model=List[UserResponse])
-async def list_users(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+@app.get("/users/{user_id}/dashboard", response_model=DashboardResponse)
+async def get_user_dashboard(user_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Get everything the dashboard renders in one response: the user, recent
+    transactions, the category summary and every travel goal with its
+    progress and months-to-goal estimates.
+    
+    Loaded with a single CTE-based statement (see dashboard.py), which
+    also serves as the user-existence check.
+    
+    Args:
+        user_id: User ID
+        db: Async database session
+        
+    Returns:
+        Dashboard data
+    """
+    result = await db.execute(dashboard.dashboard_query(user_id, db.get_bind().dialect.name))
+    row = result.first()
+    remember_user(user_id, row is not None)
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User with ID {user_id} not found"
+        )
+    
+    return dashboard.build_dashboard(row, get_ai_engine() or AIEngine(mock_mode=True))
+
+
+@app.get("/users/", response_model=Union[List[UserResponse], UserPage])
+async def list_users(
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
     """
     List all users with pagination.
     
+    Pass cursor (empty for the first page) to switch to keyset pagination on
+    id; the response is then a page with items and next_cursor.
+    
     Args:
-        skip: Number of records to skip
+        skip: Number of records to skip (offset mode only)
         limit: Maximum number of records to return
-        db: Database session
+        cursor: Opaque cursor from a previous page's next_cursor
+        db: Async database session
         
     Returns:
-        List of user objects
+        List of user objects, or a UserPage in cursor mode
     """
-    users = db.query(User).offset(skip).limit(limit).all()
-    return users
+    if cursor is None:
+        result = await db.execute(select(User).offset(skip).limit(limit))
+        users = result.scalars().all()
+        return users
+    
+    try:
+        after_id = pagination.decode_user_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    query = select(User).order_by(User.id)
+    if after_id is not None:
+        query = query.where(User.id > after_id)
+    
+    # Fetch one extra row to know whether another page exists
+    result = await db.execute(query.limit(limit + 1))
+    users = result.scalars().all()
+    next_cursor = None
+    if len(users) > limit:
+        users = users[:limit]
+        next_cursor = pagination.encode_user_cursor(users[-1].id)
+    
+    return UserPage(items=users, next_cursor=next_cursor)
 
 
 # ==================== TRANSACTION ENDPOINTS ====================
 
 @app.post("/transactions/", response_model=TransactionResponse, status_code=status.HTTP_201_CREATED)
-async def create_transaction(transaction: TransactionCreate, db: Session = Depends(get_db)):
+async def create_transaction(transaction: TransactionCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Create a new transaction record.
     
     Args:
         transaction: Transaction creation data
-        db: Database session
+        db: Async database session
         
     Returns:
         Created transaction object
     """
+    if write_behind.TRANSACTION_WRITE_BEHIND:
+        # Verify user exists
+        if not await user_exists(db, transaction.user_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"User with ID {transaction.user_id} not found"
+            )
+        # Committed with other queued rows (see write_behind.py); hand the
+        # connection back first so waiting requests don't starve the flush
+        await db.close()
+        return await transaction_batcher.submit(transaction.dict())
+    
+    db_transaction = await writes.create_transaction(db, transaction)
+    await db.commit()
+    return db_transaction
+
+
+@app.post("/transactions/bulk", response_model=TransactionBulkResponse)
+async def create_transactions_bulk(
+    user_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Ingest a large batch of transactions for one user in a single DB transaction.
+    
+    The body is CSV (text/csv, with a header row) or NDJSON
+    (application/x-ndjson, one JSON object per line) using the
+    TransactionCreate fields minus user_id. Invalid rows are reported
+    per row and skipped; valid rows are written with COPY on PostgreSQL.
+    Bodies over BULK_MAX_BYTES are rejected with 413; use
+    /transactions/import for larger files.
+    
+    Args:
+        user_id: Owner of every transaction in the batch
+        request: Raw request (body is read directly)
+        db: Async database session
+        
+    Returns:
+        Counts of received/inserted/failed rows and per-row errors
+    """
+    try:
+        fmt = ingest.detect_format(request.headers.get("content-type"))
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=str(e)
+        )
+    
     # Verify user exists
-    user = db.query(User).filter(User.id == transaction.user_id).first()
-    if not user:
+    if not await user_exists(db, user_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"User with ID {transaction.user_id} not found"
+            detail=f"User with ID {user_id} not found"
         )
     
-    db_transaction = Transaction(**transaction.dict())
-    db.add(db_transaction)
-    db.commit()
-    db.refresh(db_transaction)
-    return db_transaction
+    too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Body exceeds {BULK_MAX_BYTES} bytes; use /transactions/import for larger files"
+    )
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > BULK_MAX_BYTES:
+        raise too_large
+    body = bytearray()
+    async for chunk in request.stream():
+        body.extend(chunk)
+        if len(body) > BULK_MAX_BYTES:
+            raise too_large
+    
+    try:
+        # Parsing and validation are CPU-bound; keep them off the event loop
+        # (parse_rows is a generator, so it runs in the worker thread too)
+        valid_rows, errors, received = await run_in_threadpool(
+            ingest.validate_rows, ingest.parse_rows(bytes(body), fmt), user_id
+        )
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Could not read {fmt.upper()}: {str(e)}"
+        )
+    
+    inserted = await ingest.write_transactions(db, valid_rows)
+    await db.commit()
+    
+    return TransactionBulkResponse(
+        user_id=user_id,
+        received=received,
+        inserted=inserted,
+        failed=len(errors),
+        errors=errors
+    )
+
+
+@app.post("/transactions/import", response_model=TransactionImportResponse)
+async def import_transactions(
+    user_id: int,
+    request: Request,
+    date_format: Optional[str] = None,
+    debit_sign: Literal["negative", "positive"] = "negative",
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Import a bank-statement CSV, skipping rows that were already imported.
+    
+    The body (text/csv with a header row) is spooled to a temporary file and
+    processed IMPORT_CHUNK_ROWS rows at a time. Common statement columns
+    (e.g. "Transaction Date", "Debit", "Memo") are mapped onto transaction
+    fields, and each row gets a content hash over (user_id, date, amount,
+    currency, description); rows whose hash already exists are skipped by
+    the unique index, so re-uploading overlapping statements is safe.
+    
+    Only spending is imported. In a signed "Amount" column, debit_sign says
+    which sign is spending; credit rows (deposits, refunds, salary) are
+    skipped and counted in credits.
+    
+    Args:
+        user_id: Owner of every imported transaction
+        request: Raw request (body is streamed)
+        date_format: Optional strptime format for statement dates (default ISO)
+        debit_sign: Sign of spending in a signed amount column
+        db: Async database session
+        
+    Returns:
+        Counts of received/inserted/duplicate/credit/failed rows and per-row errors
+    """
+    media_type = (request.headers.get("content-type") or "").split(";")[0].strip().lower()
+    if media_type not in ingest.CSV_CONTENT_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Unsupported content type '{media_type}'. Send text/csv."
+        )
+    
+    # Verify user exists
+    if not await user_exists(db, user_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User with ID {user_id} not found"
+        )
+    
+    received = inserted = valid = credits = 0
+    errors = []
+    with tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_MAX_MEMORY) as upload:
+        async for chunk in request.stream():
+            upload.write(chunk)
+        upload.seek(0)
+        
+        chunks = ingest.iter_statement_chunks(upload, user_id, date_format, debit_sign=debit_sign)
+        try:
+            while True:
+                # Parsing and validation are CPU-bound; keep them off the event loop
+                chunk = await run_in_threadpool(next, chunks, None)
+                if chunk is None:
+                    break
+                chunk_rows, chunk_errors, chunk_received, chunk_credits = chunk
+                received += chunk_received + chunk_credits
+                credits += chunk_credits
+                valid += len(chunk_rows)
+                errors.extend(chunk_errors)
+                inserted += await ingest.write_new_transactions(db, chunk_rows)
+        except (UnicodeDecodeError, csv.Error) as e:
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Could not read CSV: {str(e)}"
+            )
+    
+    await db.commit()
+    
+    return TransactionImportResponse(
+        user_id=user_id,
+        received=received,
+        inserted=inserted,
+        duplicates=valid - inserted,
+        credits=credits,
+        failed=len(errors),
+        errors=errors
+    )
 
 
-@app.get("/transactions/{user_id}", response_model=List[TransactionResponse])
+@app.get("/transactions/{user_id}", response_model=Union[List[TransactionResponse], TransactionPage])
 async def get_transactions(
     user_id: int,
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     start_date: date = None,
     end_date: date = None,
     category: str = None,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get all transactions for a specific user.
     
+    Pass cursor (empty for the first page) to switch to keyset pagination on
+    (date DESC, id); the response is then a page with items and next_cursor.
+    
+    Send Accept: application/x-msgpack or application/vnd.apache.arrow.stream
+    for the same rows in a columnar format (see serialization.py).
+    
     Args:
         user_id: User ID
-        skip: Number of records to skip
+        request: Request (Accept header selects the response format)
+        skip: Number of records to skip (offset mode only)
         limit: Maximum number of records to return
         start_date: Optional start date filter
         end_date: Optional end date filter
         category: Optional category filter
-        db: Database session
+        cursor: Opaque cursor from a previous page's next_cursor
+        db: Async database session
         
     Returns:
-        List of transaction objects
+        List of transaction objects, or a TransactionPage in cursor mode,
+        encoded directly with orjson (or column by column)
     """
-    # Verify user exists
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
+    media_type = negotiate_media_type(request)
+    
+    after = None
+    if cursor is not None:
+        try:
+            after = pagination.decode_transaction_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    # Plain columns: rows are serialized straight to JSON (see serialization.py)
+    query = serialization.transaction_rows_query(user_id, start_date, end_date, category)
+    
+    if cursor is None:
+        query = query.order_by(Transaction.date.desc()).offset(skip).limit(limit)
+        order_by = lambda c: [c.date.desc()]
+    else:
+        # Keyset: rows strictly after (date, id) in (date DESC, id ASC) order
+        query, order_by = pagination.transaction_keyset_page(query, after, limit)
+    
+    # One round-trip: the page and the user-exists check together
+    rows = await select_rows_for_user(db, user_id, query, order_by)
+    if rows is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User with ID {user_id} not found"
+        )
+    
+    fields = serialization.TRANSACTION_FIELDS
+    metadata = None
+    if cursor is not None:
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = dict(zip(fields, rows[-1]))
+            next_cursor = pagination.encode_transaction_cursor(last["date"], last["id"])
+        metadata = {"next_cursor": next_cursor}
+    
+    if media_type != serialization.JSON_MEDIA_TYPE:
+        return serialization.columnar_response(
+            media_type, rows, fields, serialization.transaction_arrow_schema, metadata
+        )
+    
+    transactions = serialization.rows_to_dicts(rows, fields)
+    content = transactions if metadata is None else {"items": transactions, **metadata}
+    return serialization.FastJSONResponse(content, headers={"Vary": "Accept"})
+
+
+@app.get("/transactions/{user_id}/export")
+async def export_transactions(
+    user_id: int,
+    format: str = "csv",
+    start_date: date = None,
+    end_date: date = None,
+    category: str = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Export a user's full transaction history as a streamed download.
+    
+    Rows are read through a server-side cursor in batches (yield_per) and
+    written out as they arrive, so memory stays flat for any history size.
+    
+    Args:
+        user_id: User ID
+        format: "csv" (with a header row) or "ndjson"
+        start_date: Optional start date filter
+        end_date: Optional end date filter
+        category: Optional category filter
+        db: Async database session
+        
+    Returns:
+        StreamingResponse of CSV or NDJSON, newest transactions first
+    """
+    if format not in export.EXPORT_MEDIA_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported export format '{format}'. Use one of: {', '.join(export.EXPORT_MEDIA_TYPES)}"
+        )
+    
+    # Verify user exists before the response starts streaming
+    if not await user_exists(db, user_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"User with ID {user_id} not found"
         )
     
-    query = db.query(Transaction).filter(Transaction.user_id == user_id)
+    query = serialization.transaction_rows_query(user_id, start_date, end_date, category)
     
-    # Apply filters
-    if start_date:
-        query = query.filter(Transaction.date >= start_date)
-    if end_date:
-        query = query.filter(Transaction.date <= end_date)
-    if category:
-        query = query.filter(Transaction.category == category)
+    # Same order as the listing, served by ix_transactions_user_date_id
+    query = query.order_by(Transaction.date.desc(), Transaction.id)
     
-    transactions = query.order_by(Transaction.date.desc()).offset(skip).limit(limit).all()
-    return transactions
+    return StreamingResponse(
+        export.stream_rows(query, serialization.TRANSACTION_FIELDS, format),
+        media_type=export.EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="transactions_{user_id}.{format}"'}
+    )
 
 
-@app.get("/transactions/{user_id}/summary")
-async def get_transaction_summary(user_id: int, db: Session = Depends(get_db)):
+@app.get("/transactions/{user_id}/timeseries", response_model=TimeSeriesResponse)
+async def get_transaction_timeseries(
+    user_id: int,
+    granularity: Literal["day", "week", "month"] = "month",
+    category: Optional[str] = None,
+    start_date: date = None,
+    end_date: date = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get a user's spending bucketed by day, week (Monday start) or month.
+    
+    Buckets are computed in the database with one GROUP BY over the
+    (user_id, date) index, or read from the monthly rollups for monthly
+    series over whole months. The series is dense: buckets without
+    transactions are returned with a zero total.
+    
+    Args:
+        user_id: User ID
+        granularity: "day", "week" or "month"
+        category: Optional category filter
+        start_date: Optional start date filter (the series starts at its bucket)
+        end_date: Optional end date filter (the series ends at its bucket)
+        db: Async database session
+        
+    Returns:
+        Time series of (period, total, count) points, oldest first
+    """
+    try:
+        timeseries.check_range(start_date, end_date, granularity)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    if not await user_exists(db, user_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User with ID {user_id} not found"
+        )
+    
+    query = timeseries.totals_query(
+        user_id, granularity, db.get_bind().dialect.name, start_date, end_date, category
+    )
+    result = await db.execute(query)
+    totals = {
+        bucket: (Decimal(total or 0), int(count))
+        for bucket, total, count in result.all()
+    }
+    
+    try:
+        points = timeseries.fill_series(totals, granularity, start_date, end_date)
+    except ValueError as e:
+        # Only one bound was given and the data lies far from it
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return TimeSeriesResponse(
+        user_id=user_id,
+        granularity=granularity,
+        category=category,
+        points=points
+    )
+
+
+@app.get("/transactions/{user_id}/summary", response_model=TransactionSummaryResponse)
+async def get_transaction_summary(
+    user_id: int,
+    request: Request,
+    response: Response,
+    start_date: date = None,
+    end_date: date = None,
+    db: AsyncSession = Depends(get_async_db)
+):
     """
     Get transaction summary statistics for a user.
     
+    Totals are read from the monthly category rollups when the date filter
+    covers whole months (or is absent), and otherwise aggregated from raw
+    transactions with a single GROUP BY. Sums are exact Decimals.
+    
+    With a msgpack or Arrow Accept header the per-category rows come back
+    as columns (category, count, total), with the overall totals alongside.
+    
     Args:
         user_id: User ID
-        db: Database session
+        request: Request (Accept header selects the response format)
+        response: Response whose headers are sent with the JSON body
+        start_date: Optional start date filter
+        end_date: Optional end date filter
+        db: Async database session
         
     Returns:
         Summary statistics
     """
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
+    media_type = negotiate_media_type(request)
+    
+    if not await user_exists(db, user_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"User with ID {user_id} not found"
         )
     
-    transactions = db.query(Transaction).filter(Transaction.user_id == user_id).all()
+    if rollups.covers_whole_months(start_date, end_date):
+        query = select(
+            MonthlyCategoryTotal.category,
+            func.sum(MonthlyCategoryTotal.count),
+            func.sum(MonthlyCategoryTotal.total)
+        ).where(MonthlyCategoryTotal.user_id == user_id)
+        
+        # Apply filters
+        if start_date:
+            query = query.where(MonthlyCategoryTotal.year_month >= start_date)
+        if end_date:
+            query = query.where(MonthlyCategoryTotal.year_month <= end_date)
+        
+        query = query.group_by(MonthlyCategoryTotal.category)
+    else:
+        query = select(
+            Transaction.category,
+            func.count(Transaction.id),
+            func.sum(Transaction.amount)
+        ).where(Transaction.user_id == user_id)
+        
+        # Apply filters
+        if start_date:
+            query = query.where(Transaction.date >= start_date)
+        if end_date:
+            query = query.where(Transaction.date <= end_date)
+        
+        query = query.group_by(Transaction.category)
     
-    if not transactions:
-        return {
-            "total_transactions": 0,
-            "total_amount": 0,
-            "average_amount": 0,
-            "categories": {}
-        }
+    result = await db.execute(query)
     
-    total_amount = sum(float(t.amount) for t in transactions)
-    categories = {}
-    for t in transactions:
-        categories[t.category] = categories.get(t.category, 0) + float(t.amount)
+    total_transactions = 0
+    total_amount = Decimal("0")
+    rows = []
+    for category, count, amount in result.all():
+        amount = Decimal(amount or 0)
+        total_transactions += int(count)
+        total_amount += amount
+        rows.append((category, int(count), amount))
     
-    return {
-        "total_transactions": len(transactions),
-        "total_amount": total_amount,
-        "average_amount": total_amount / len(transactions) if transactions else 0,
-        "categories": categories
-    }
+    average_amount = (
+        (total_amount / total_transactions).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+        if total_transactions else Decimal("0")
+    )
+    
+    if media_type != serialization.JSON_MEDIA_TYPE:
+        return serialization.columnar_response(
+            media_type, rows, serialization.SUMMARY_FIELDS, serialization.summary_arrow_schema,
+            {
+                "total_transactions": total_transactions,
+                "total_amount": total_amount,
+                "average_amount": average_amount,
+            }
+        )
+    
+    response.headers["Vary"] = "Accept"
+    return TransactionSummaryResponse(
+        total_transactions=total_transactions,
+        total_amount=total_amount,
+        average_amount=average_amount,
+        categories={category: amount for category, _, amount in rows}
+    )
 
 
 # ==================== TRAVEL GOAL ENDPOINTS ====================
 
 @app.post("/travel-goals/", response_model=TravelGoalResponse, status_code=status.HTTP_201_CREATED)
-async def create_travel_goal(goal: TravelGoalCreate, db: Session = Depends(get_db)):
+async def create_travel_goal(goal: TravelGoalCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Create a new travel goal.
     
     Args:
         goal: Travel goal creation data
-        db: Database session
+        db: Async database session
         
     Returns:
         Created travel goal object
     """
-    # Verify user exists
-    user = db.query(User).filter(User.id == goal.user_id).first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"User with ID {goal.user_id} not found"
-        )
-    
-    db_goal = TravelGoal(**goal.dict())
-    db.add(db_goal)
-    db.commit()
-    db.refresh(db_goal)
+    db_goal = await writes.create_travel_goal(db, goal)
+    await db.commit()
     return db_goal
 
 
 @app.get("/travel-goals/{user_id}", response_model=List[TravelGoalResponse])
-async def get_travel_goals(user_id: int, db: Session = Depends(get_db)):
+async def get_travel_goals(user_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Get all travel goals for a specific user.
     
     Args:
         user_id: User ID
-        db: Database session
+        db: Async database session
         
     Returns:
         List of travel goal objects
     """
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
+    # One round-trip: the goals and the user-exists check together
+    goals = await select_for_user(
+        db,
+        user_id,
+        TravelGoal,
+        select(TravelGoal).where(TravelGoal.user_id == user_id)
+        .order_by(TravelGoal.created_at.desc(), TravelGoal.id.desc()),
+        lambda g: [g.created_at.desc(), g.id.desc()]
+    )
+    if goals is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"User with ID {user_id} not found"
         )
-    
-    goals = db.query(TravelGoal).filter(TravelGoal.user_id == user_id).order_by(TravelGoal.created_at.desc()).all()
     return goals
 
 
 @app.get("/travel-goals/{user_id}/{goal_id}", response_model=TravelGoalResponse)
-async def get_travel_goal(user_id: int, goal_id: int, db: Session = Depends(get_db)):
+async def get_travel_goal(user_id: int, goal_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Get a specific travel goal.
     
     Args:
         user_id: User ID
         goal_id: Travel goal ID
-        db: Database session
+        db: Async database session
         
     Returns:
         Travel goal object
     """
-    goal = db.query(TravelGoal).filter(
-        TravelGoal.id == goal_id,
-        TravelGoal.user_id == user_id
-    ).first()
+    result = await db.execute(
+        select(TravelGoal).where(
+            TravelGoal.id == goal_id,
+            TravelGoal.user_id == user_id
+        )
+    )
+    goal = result.scalars().first()
     
     if not goal:
         raise HTTPException(
@@ -382,7 +880,7 @@ async def update_travel_goal(
     user_id: int,
     goal_id: int,
     goal_update: TravelGoalUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update an existing travel goal.
@@ -391,103 +889,266 @@ async def update_travel_goal(
         user_id: User ID
         goal_id: Travel goal ID
         goal_update: Updated travel goal data
-        db: Database session
+        db: Async database session
         
     Returns:
         Updated travel goal object
     """
-    goal = db.query(TravelGoal).filter(
-        TravelGoal.id == goal_id,
-        TravelGoal.user_id == user_id
-    ).first()
-    
-    if not goal:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Travel goal with ID {goal_id} not found for user {user_id}"
-        )
+    # Update only provided fields, in one UPDATE ... RETURNING
+    goal = await writes.update_travel_goal(db, user_id, goal_id, goal_update)
+    await db.commit()
+    return goal
+
+
+@app.post("/travel-goals/{user_id}/{goal_id}/contributions", response_model=TravelGoalResponse)
+async def add_travel_goal_contribution(
+    user_id: int,
+    goal_id: int,
+    contribution: TravelGoalContribution,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Atomically add to (or, with a negative amount, withdraw from) a travel
+    goal's current_saved.
     
-    # Update only provided fields
-    update_data = goal_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(goal, field, value)
+    The increment happens in the database (current_saved = current_saved +
+    amount) without reading the row first, so concurrent contributions
+    never overwrite each other.
     
-    db.commit()
-    db.refresh(goal)
+    Args:
+        user_id: User ID
+        goal_id: Travel goal ID
+        contribution: Amount to add
+        db: Async database session
+        
+    Returns:
+        Updated travel goal object
+    """
+    goal = await writes.add_travel_goal_contribution(db, user_id, goal_id, contribution.amount)
+    await db.commit()
     return goal
 
 
 @app.delete("/travel-goals/{user_id}/{goal_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_travel_goal(user_id: int, goal_id: int, db: Session = Depends(get_db)):
+async def delete_travel_goal(user_id: int, goal_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Delete a travel goal.
     
     Args:
         user_id: User ID
         goal_id: Travel goal ID
-        db: Database session
+        db: Async database session
     """
-    goal = db.query(TravelGoal).filter(
-        TravelGoal.id == goal_id,
-        TravelGoal.user_id == user_id
-    ).first()
+    await writes.delete_travel_goal(db, user_id, goal_id)
+    await db.commit()
+    return None
+
+
+# ==================== BATCH ENDPOINT ====================
+
+@app.post("/batch", response_model=BatchResponse)
+async def run_batch(batch: BatchRequest, db: AsyncSession = Depends(get_async_db)):
+    """
+    Run an ordered list of user, transaction and travel-goal writes in one
+    database transaction, e.g. an offline client replaying its queue.
     
-    if not goal:
+    All or nothing: if any operation fails, nothing is committed and the
+    response carries that operation's status code with {"index", "op",
+    "detail"}. Operations may refer to ids created earlier in the batch as
+    "$<index>" (see BatchOperation).
+    
+    Args:
+        batch: Operations to run
+        db: Async database session
+        
+    Returns:
+        Per-operation status and response body, in request order
+    """
+    return BatchResponse(results=await writes.run_batch(db, batch.operations))
+
+
+# ==================== AI SUGGESTION ENDPOINTS ====================
+
+@app.get("/suggestions/{user_id}", response_model=AISuggestionResponse)
+async def get_suggestions(user_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Generate AI-powered savings suggestions for a user's travel goal.
+    
+    Uses the async Groq client, so a slow LLM call does not block other requests.
+    
+    Args:
+        user_id: User ID
+        db: Async database session
+        
+    Returns:
+        AISuggestionResponse with personalized suggestions
+    """
+    if not await user_exists(db, user_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Travel goal with ID {goal_id} not found for user {user_id}"
+            detail=f"User with ID {user_id} not found"
         )
     
-    db.delete(goal)
-    db.commit()
-    return None
+    engine = get_ai_engine() or AIEngine(mock_mode=True)
+    try:
+        return await engine.agenerate_suggestions(db, user_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+@app.post("/suggestions/calculate", response_model=AISuggestionResponse)
+async def calculate_suggestions_stateless(request: SuggestionsCalculateRequest):
+    """
+    Generate AI-powered savings suggestions from provided data (stateless - no database).
+    
+    Transactions may be a list of objects or parallel arrays
+    (StatelessTransactionColumns), which skip per-row model validation.
+    
+    Args:
+        request: Transactions, travel goal and user_id to echo back
+        
+    Returns:
+        AISuggestionResponse with personalized suggestions
+    """
+    if isinstance(request.transactions, StatelessTransactionColumns):
+        try:
+            transactions = await run_in_threadpool(columnar.validate_columns, request.transactions.dict())
+        except columnar.ColumnarValidationError as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail={"errors": e.errors}
+            )
+    else:
+        transactions = [t.dict() for t in request.transactions]
+    
+    engine = get_ai_engine() or AIEngine(mock_mode=True)
+    travel_goal_data = request.travel_goal.dict()
+    travel_goal_data["user_id"] = request.user_id
+    return await engine.agenerate_suggestions_stateless(transactions, travel_goal_data)
+
+
+@app.get("/admin/suggestion-cache")
+async def suggestion_cache_stats():
+    """
+    LLM suggestion cache statistics for this worker.
+    
+    Returns:
+        Memory/disk hit counts, misses, stores, hit rate and tier sizes
+    """
+    return await run_in_threadpool(suggestion_cache.stats)
+
+
+@app.get("/admin/write-behind")
+async def write_behind_stats():
+    """
+    Write-behind batching statistics for this worker.
+    
+    Returns:
+        Whether batching is enabled, batches and rows written, rows pending
+    """
+    return {"enabled": write_behind.TRANSACTION_WRITE_BEHIND, **transaction_batcher.stats()}
+
+
+@app.get("/admin/db-pool")
+async def db_pool_stats():
+    """
+    Connection-pool statistics for this worker.
+    
+    Returns:
+        Per engine ("async" serves requests, "sync" startup and /health): pool
+        settings, connections checked out / idle / in overflow, checkout wait
+        times, new connections, invalidations and failed pre-pings or
+        background validations
+    """
+    return {
+        "workers": database.WEB_CONCURRENCY,
+        "max_connections": database.DB_MAX_CONNECTIONS,
+        "pgbouncer": database.DB_PGBOUNCER,
+        "validation_interval_seconds": database.DB_POOL_VALIDATION_INTERVAL,
+        "async": database.async_pool_stats.snapshot(async_engine.pool),
+        "sync": database.sync_pool_stats.snapshot(engine.pool),
+    }
 
 
 # Suggestions are now computed client-side
 
-@app.post("/transactions/summary")
-async def get_transaction_summary_stateless(request: TransactionsSummaryRequest):
+@app.post(
+    "/transactions/summary",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": {
+                    "type": "object",
+                    "required": ["transactions"],
+                    "properties": {"transactions": {"anyOf": [
+                        {"type": "array", "items": {"$ref": "#/components/schemas/StatelessTransactionInput"}},
+                        {"$ref": "#/components/schemas/StatelessTransactionColumns"}
+                    ]}}
+                }},
+                "application/x-ndjson": {"schema": {"$ref": "#/components/schemas/StatelessTransactionInput"}}
+            }
+        }
+    }
+)
+async def get_transaction_summary_stateless(request: Request):
     """
     Calculate transaction summary statistics from provided data (stateless - no database).
     
     This endpoint accepts a list of transactions and returns summary statistics.
     Used for Round 1 Prototype with manual data input.
     
+    The body is {"transactions": [...]} (application/json) or one transaction
+    object per line (application/x-ndjson). It is parsed incrementally and
+    each transaction is validated and folded into running totals as it
+    arrives, so memory stays flat regardless of payload size.
+    
+    Transactions may also be sent as parallel arrays,
+    {"transactions": {"amount": [...], "category": [...], "date": [...]}},
+    which are validated column-wise with the same rules.
+    
     Args:
-        request: Contains list of transactions
+        request: Raw request (body is streamed)
         
     Returns:
         Summary statistics (total, average, categories breakdown)
     """
+    media_type = (request.headers.get("content-type") or "application/json").split(";")[0].strip().lower()
+    if media_type in ingest.NDJSON_CONTENT_TYPES:
+        fmt = "ndjson"
+    elif media_type == "application/json":
+        fmt = "json"
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Unsupported content type '{media_type}'. Send application/json or application/x-ndjson."
+        )
+    
+    summary = stream_parser.TransactionSummary()
+    row_number = 0
     try:
-        if not request.transactions:
-            return {
-                "total_transactions": 0,
-                "total_amount": 0,
-                "average_amount": 0,
-                "categories": {}
-            }
-        
-        total_amount = sum(float(t.amount) for t in request.transactions)
-        categories = {}
-        
-        for t in request.transactions:
-            category = t.category
-            amount = float(t.amount)
-            categories[category] = categories.get(category, 0) + amount
-        
-        return {
-            "total_transactions": len(request.transactions),
-            "total_amount": total_amount,
-            "average_amount": total_amount / len(request.transactions) if request.transactions else 0,
-            "categories": categories
-        }
-        
-    except Exception as e:
+        async for row_number, row in stream_parser.iter_transactions(request.stream(), fmt):
+            if isinstance(row, stream_parser.Columns):
+                summary.add_columns(await run_in_threadpool(columnar.validate_columns, row))
+            else:
+                summary.add(StatelessTransactionInput(**row))
+    except columnar.ColumnarValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={"errors": e.errors}
+        )
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={"row": row_number, "errors": ingest.format_validation_error(e)}
+        )
+    except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Error calculating summary: {str(e)}"
         )
+    
+    return summary.result()
 
 
 # Root endpoint
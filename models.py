@@ -1,12 +1,12 @@
 """
 SQLAlchemy ORM models for FINIX database schema.
-Defines User, Transaction, and TravelGoal tables.
+Defines User, Transaction, TravelGoal and MonthlyCategoryTotal tables.
 """
 
-from sqlalchemy import Column, Integer, String, Numeric, Date, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Numeric, Date, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from database import Base
+from database import Base, PARTITION_TRANSACTIONS
 
 
 class User(Base):
@@ -33,18 +33,46 @@ class Transaction(Base):
     """
     __tablename__ = "transactions"
 
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)  # Indexed via composites below
     amount = Column(Numeric(12, 2), nullable=False)  # Supports up to 9,999,999,999.99
-    category = Column(String(50), nullable=False, index=True)  # e.g., "Food", "Transport", "Entertainment"
+    category = Column(String(50), nullable=False)  # e.g., "Food", "Transport", "Entertainment"
     currency = Column(String(3), default="USD", nullable=False)  # ISO 4217 currency code
-    date = Column(Date, nullable=False, index=True)
+    # Partition key: a partitioned table's primary key must include it.
+    # The ORM keeps identifying rows by id alone (see __mapper_args__).
+    date = Column(Date, nullable=False, primary_key=PARTITION_TRANSACTIONS)
     description = Column(String(255), nullable=True)  # Optional transaction description
+    content_hash = Column(String(64), nullable=True)  # Set by statement imports (ingest.content_hash) for dedup
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
     user = relationship("User", back_populates="transactions")
 
+    # Every hot query filters on user_id first, then a date range or category.
+    # These composites replace the old single-column user_id/category/date
+    # indexes; INCLUDE columns (PostgreSQL) let aggregates run index-only.
+    # check_query_plans.py verifies the plans stay on these indexes.
+    __table_args__ = (
+        # Listings sorted by date DESC, keyset pages, date-range aggregates
+        Index(
+            "ix_transactions_user_date_id", user_id, date.desc(), id,
+            postgresql_include=["amount", "category"]
+        ),
+        # Category filters and per-category totals
+        Index(
+            "ix_transactions_user_category_date", user_id, category, date,
+            postgresql_include=["amount"]
+        ),
+        # Statement import dedup (NULL hashes never conflict, so manual entries are unaffected)
+        Index(
+            "uq_transactions_user_date_content_hash", user_id, date, content_hash,
+            unique=True
+        ),
+        # Monthly range partitions (PostgreSQL with PARTITION_TRANSACTIONS=true)
+        {"postgresql_partition_by": "RANGE (date)"} if PARTITION_TRANSACTIONS else {},
+    )
+    __mapper_args__ = {"primary_key": [id]}
+
 
 class TravelGoal(Base):
     """
@@ -66,3 +94,18 @@ class TravelGoal(Base):
     # Relationships
     user = relationship("User", back_populates="travel_goals")
 
+
+
+class MonthlyCategoryTotal(Base):
+    """
+    MonthlyCategoryTotal model holding per-user, per-month, per-category spending rollups.
+    Kept current by transaction writes (see rollups.py) so summaries and AI analysis
+    scale with months x categories instead of raw transaction count.
+    """
+    __tablename__ = "monthly_category_totals"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    year_month = Column(Date, primary_key=True)  # First day of the month
+    category = Column(String(50), primary_key=True)
+    total = Column(Numeric(14, 2), default=0, nullable=False)
+    count = Column(Integer, default=0, nullable=False)
@@ -0,0 +1,129 @@
+"""
+Keyset (cursor) pagination helpers for FINIX API listings.
+Cursors are opaque URL-safe tokens encoding the sort key of the last row
+returned, so each page is a single index range scan regardless of depth.
+"""
+
+import base64
+import json
+from datetime import date
+from typing import Callable, Dict, Optional, Tuple
+
+from sqlalchemy import or_
+
+from models import Transaction
+
+
+def encode_cursor(values: Dict) -> str:
+    """
+    Encode a sort key as an opaque cursor token.
+
+    Args:
+        values: JSON-serializable sort key of the last row on a page
+
+    Returns:
+        str: URL-safe cursor token
+    """
+    raw = json.dumps(values, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict:
+    """
+    Decode a cursor token produced by encode_cursor.
+
+    Args:
+        cursor: Cursor token from a previous response
+
+    Returns:
+        dict: The encoded sort key
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, dict):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def encode_transaction_cursor(transaction_date: date, transaction_id: int) -> str:
+    """Encode the (date, id) keyset position of a transaction."""
+    return encode_cursor({"d": transaction_date.isoformat(), "i": transaction_id})
+
+
+def decode_transaction_cursor(cursor: str) -> Optional[Tuple[date, int]]:
+    """
+    Decode a transaction cursor.
+
+    Args:
+        cursor: Cursor token, or an empty string for the first page
+
+    Returns:
+        (date, id) of the last row already returned, or None for the first page
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if not cursor:
+        return None
+    values = decode_cursor(cursor)
+    try:
+        return date.fromisoformat(values["d"]), int(values["i"])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+
+def transaction_keyset_page(query, after: Optional[Tuple[date, int]], limit: int) -> Tuple[object, Callable]:
+    """
+    Order a transaction query by (date DESC, id), matching
+    ix_transactions_user_date_id, and start it after a keyset position.
+
+    Args:
+        query: select() over Transaction columns
+        after: (date, id) from decode_transaction_cursor, or None for the first page
+        limit: Page size; one extra row is fetched to know whether another page exists
+
+    Returns:
+        (query, order_by): the paged query, and the callable mapping a derived
+        table's columns to the same ORDER BY (for user_cache.select_rows_for_user)
+    """
+    if after is not None:
+        after_date, after_id = after
+        query = query.where(
+            Transaction.date <= after_date,
+            or_(Transaction.date < after_date, Transaction.id > after_id)
+        )
+    query = query.order_by(Transaction.date.desc(), Transaction.id).limit(limit + 1)
+    return query, lambda c: [c.date.desc(), c.id]
+
+
+def encode_user_cursor(user_id: int) -> str:
+    """Encode the id keyset position of a user."""
+    return encode_cursor({"i": user_id})
+
+
+def decode_user_cursor(cursor: str) -> Optional[int]:
+    """
+    Decode a user cursor.
+
+    Args:
+        cursor: Cursor token, or an empty string for the first page
+
+    Returns:
+        id of the last user already returned, or None for the first page
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if not cursor:
+        return None
+    values = decode_cursor(cursor)
+    try:
+        return int(values["i"])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError("Invalid cursor")
@@ -0,0 +1,268 @@
+"""
+Monthly range partitions of the transactions table for FINIX backend.
+With PARTITION_TRANSACTIONS=true on PostgreSQL, transactions is created
+PARTITION BY RANGE (date) with one partition per month plus a DEFAULT
+partition, so date-filtered queries only touch the months they ask for and
+old months can be detached (a catalog-only change) instead of deleted.
+
+init_db creates partitions for the current month and the next
+TRANSACTION_PARTITIONS_AHEAD months, and for any month whose rows landed
+in the default partition (e.g. back-dated imports), moving those rows out.
+The server repeats this every TRANSACTION_PARTITION_INTERVAL seconds (see
+run_maintenance), or `python partitions.py ensure` can run from cron.
+
+Usage:
+    python partitions.py list
+    python partitions.py ensure [--months-ahead 3]
+    python partitions.py detach YYYY-MM
+"""
+
+import argparse
+import asyncio
+import os
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+
+
+# Future months that always have a partition ready
+PARTITION_MONTHS_AHEAD = int(os.getenv("TRANSACTION_PARTITIONS_AHEAD", 3))
+
+# Seconds between background partition checks in a running server (0 disables)
+PARTITION_MAINTENANCE_INTERVAL = float(os.getenv("TRANSACTION_PARTITION_INTERVAL", 6 * 60 * 60))
+
+# pg_advisory_lock key held while creating partitions, so that concurrent
+# workers (and cron runs) do not create the same partition at once
+MAINTENANCE_LOCK_KEY = 0x66696E78  # "finx"
+
+PARENT_TABLE = "transactions"
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+
+
+def add_months(month: date, months: int) -> date:
+    """Return the first day of the month `months` after month's."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Name of the partition holding the month containing month."""
+    return f"{PARENT_TABLE}_y{month.year}m{month.month:02d}"
+
+
+def is_partitioned(conn) -> bool:
+    """Check whether the transactions table is a partitioned table."""
+    return conn.execute(
+        text(
+            "SELECT 1 FROM pg_partitioned_table "
+            "WHERE partrelid = to_regclass(:table)"
+        ),
+        {"table": PARENT_TABLE}
+    ).scalar() is not None
+
+
+def attached_partitions(conn) -> Dict[str, str]:
+    """
+    List the partitions currently attached to transactions.
+
+    Returns:
+        {partition_name: bound expression} (e.g. "FOR VALUES FROM (...) TO (...)")
+    """
+    result = conn.execute(
+        text(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) "
+            "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(:table) ORDER BY c.relname"
+        ),
+        {"table": PARENT_TABLE}
+    )
+    return dict(result.all())
+
+
+def create_month_partition(conn, month: date) -> bool:
+    """
+    Create and attach the partition for one month.
+
+    Rows of that month already sitting in the default partition are moved
+    into the new partition first; PostgreSQL refuses to attach a range
+    that the default partition still holds rows for.
+
+    Args:
+        conn: Connection inside a transaction
+        month: First day of the month
+
+    Returns:
+        bool: True if the partition was created, False if its name is
+        taken by a table that is not attached (e.g. a detached month)
+    """
+    name = partition_name(month)
+    if conn.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar() is not None:
+        print(f"[WARNING] Table {name} exists but is not attached; rows for {month:%Y-%m} stay in {DEFAULT_PARTITION}")
+        return False
+
+    start, end = month.isoformat(), add_months(month, 1).isoformat()
+    bounds = f"FOR VALUES FROM ('{start}') TO ('{end}')"
+    in_default = conn.execute(
+        text(f"SELECT 1 FROM {DEFAULT_PARTITION} WHERE date >= :start AND date < :end LIMIT 1"),
+        {"start": month, "end": add_months(month, 1)}
+    ).scalar()
+
+    if not in_default:
+        conn.execute(text(f"CREATE TABLE {name} PARTITION OF {PARENT_TABLE} {bounds}"))
+        return True
+
+    conn.execute(text(f"CREATE TABLE {name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    conn.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+            f"WHERE date >= :start AND date < :end RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        ),
+        {"start": month, "end": add_months(month, 1)}
+    )
+    conn.execute(text(f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} {bounds}"))
+    return True
+
+
+def ensure_partitions(
+    bind,
+    months_ahead: int = PARTITION_MONTHS_AHEAD,
+    today: Optional[date] = None
+) -> List[str]:
+    """
+    Create the default partition and any missing monthly partitions.
+
+    Covers the current month, the next months_ahead months, and every month
+    that currently has rows in the default partition. Each partition is
+    created in its own transaction.
+
+    Args:
+        bind: Engine bound to the PostgreSQL database
+        months_ahead: Future months to create partitions for
+        today: Reference date (defaults to today)
+
+    Returns:
+        List of partition names created
+    """
+    with bind.begin() as conn:
+        if not is_partitioned(conn):
+            print(f"[WARNING] {PARENT_TABLE} is not partitioned; recreate it with PARTITION_TRANSACTIONS=true to partition")
+            return []
+        conn.execute(text(f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF {PARENT_TABLE} DEFAULT"))
+        attached = set(attached_partitions(conn))
+        stray_months = conn.execute(
+            text(f"SELECT DISTINCT CAST(date_trunc('month', date) AS date) FROM {DEFAULT_PARTITION}")
+        ).scalars().all()
+
+    current = (today or date.today()).replace(day=1)
+    months = {add_months(current, offset) for offset in range(months_ahead + 1)}
+    months.update(stray_months)
+
+    created = []
+    for month in sorted(months):
+        if partition_name(month) in attached:
+            continue
+        with bind.begin() as conn:
+            if create_month_partition(conn, month):
+                created.append(partition_name(month))
+    if created:
+        print(f"[INFO] Created transaction partitions: {', '.join(created)}")
+    return created
+
+
+def ensure_partitions_locked(bind, months_ahead: int = PARTITION_MONTHS_AHEAD) -> Optional[List[str]]:
+    """
+    Run ensure_partitions unless another process is already running it.
+
+    Args:
+        bind: Engine bound to the PostgreSQL database
+        months_ahead: Future months to create partitions for
+
+    Returns:
+        List of partition names created, or None if the lock was taken
+    """
+    with bind.connect() as lock_conn:
+        locked = lock_conn.execute(
+            text("SELECT pg_try_advisory_lock(:key)"), {"key": MAINTENANCE_LOCK_KEY}
+        ).scalar()
+        if not locked:
+            return None
+        try:
+            return ensure_partitions(bind, months_ahead)
+        finally:
+            lock_conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MAINTENANCE_LOCK_KEY})
+            lock_conn.commit()
+
+
+async def run_maintenance(bind, interval: float = PARTITION_MAINTENANCE_INTERVAL):
+    """
+    Create upcoming monthly partitions every interval seconds until
+    cancelled, so a long-running server never writes a new month's rows
+    into the default partition.
+
+    Args:
+        bind: Engine bound to the PostgreSQL database
+        interval: Seconds between checks
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(ensure_partitions_locked, bind)
+        except Exception as e:
+            print(f"[WARNING] Transaction partition maintenance failed: {str(e)}")
+
+
+def detach_partition(bind, month: date) -> str:
+    """
+    Detach one month's partition from transactions.
+
+    Detaching only updates the catalog: the month's rows stay in a
+    standalone table that can be archived (pg_dump) or dropped. Monthly
+    rollups are left untouched, so rollup-backed summaries still include
+    the month.
+
+    Args:
+        bind: Engine bound to the PostgreSQL database
+        month: Any date in the month to detach
+
+    Returns:
+        str: Name of the detached table
+    """
+    name = partition_name(month.replace(day=1))
+    with bind.begin() as conn:
+        if name not in attached_partitions(conn):
+            raise ValueError(f"No attached partition {name}")
+        conn.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+    print(f"[OK] Detached {name}")
+    return name
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    from database import PARTITION_TRANSACTIONS, engine
+
+    parser = argparse.ArgumentParser(description="Manage monthly transaction partitions (PostgreSQL)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("list", help="List attached partitions")
+    ensure_parser = subparsers.add_parser("ensure", help="Create missing partitions")
+    ensure_parser.add_argument("--months-ahead", type=int, default=PARTITION_MONTHS_AHEAD)
+    detach_parser = subparsers.add_parser("detach", help="Detach one month's partition")
+    detach_parser.add_argument("month", help="Month to detach, as YYYY-MM")
+    args = parser.parse_args()
+
+    if not PARTITION_TRANSACTIONS:
+        parser.error("Partitioning is disabled; set PARTITION_TRANSACTIONS=true with a PostgreSQL DATABASE_URL")
+
+    if args.command == "list":
+        with engine.connect() as conn:
+            for name, bounds in attached_partitions(conn).items():
+                print(f"{name}  {bounds}")
+    elif args.command == "ensure":
+        if ensure_partitions_locked(engine, args.months_ahead) is None:
+            print("[INFO] Partitions are being created by another process")
+    else:
+        detach_partition(engine, datetime.strptime(args.month, "%Y-%m").date())
@@ -0,0 +1,229 @@
+"""
+Monthly category rollups for FINIX backend.
+Maintains the (user_id, year_month, category) -> total, count table from
+transaction writes, and provides a backfill command for existing data
+(init_db runs it automatically when the rollup table is still empty).
+
+Usage:
+    python rollups.py backfill [--user-id ID]
+"""
+
+import argparse
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Date, cast, delete, func, insert, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from models import MonthlyCategoryTotal, Transaction
+
+
+def month_start(column, dialect_name: str):
+    """
+    SQL expression truncating a date column to the first day of its month.
+
+    Args:
+        column: Date column or expression
+        dialect_name: Name of the bound dialect ("postgresql", "sqlite", ...)
+
+    Returns:
+        SQL expression of type Date
+    """
+    if dialect_name == "sqlite":
+        return func.date(column, "start of month")
+    return cast(func.date_trunc("month", column), Date)
+
+
+def first_of_month(value: date) -> date:
+    """Return the first day of the month containing value."""
+    return value.replace(day=1)
+
+
+def covers_whole_months(start_date: Optional[date], end_date: Optional[date]) -> bool:
+    """
+    Check whether a date filter can be answered from monthly rollups.
+
+    Args:
+        start_date: Optional inclusive start date
+        end_date: Optional inclusive end date
+
+    Returns:
+        bool: True if start_date is a month start and end_date a month end
+    """
+    if start_date and start_date.day != 1:
+        return False
+    if end_date and end_date != date.max and (end_date + timedelta(days=1)).day != 1:
+        return False
+    return True
+
+
+def aggregate_rows(rows: Iterable[Dict]) -> Dict[Tuple[int, date, str], List]:
+    """
+    Fold transaction rows into rollup deltas.
+
+    Args:
+        rows: Dicts with user_id, date, category and amount
+
+    Returns:
+        {(user_id, year_month, category): [total, count]}
+    """
+    deltas: Dict[Tuple[int, date, str], List] = defaultdict(lambda: [Decimal("0"), 0])
+    for row in rows:
+        key = (row["user_id"], first_of_month(row["date"]), row["category"])
+        deltas[key][0] += Decimal(row["amount"])
+        deltas[key][1] += 1
+    return deltas
+
+
+async def apply_transactions(db: AsyncSession, rows: Iterable[Dict]) -> None:
+    """
+    Add newly written transactions to the rollup table.
+
+    Runs in the session's current transaction so the rollup commits (or
+    rolls back) together with the transaction rows themselves.
+
+    Args:
+        db: Async database session
+        rows: Dicts with user_id, date, category and amount
+    """
+    deltas = aggregate_rows(rows)
+    if not deltas:
+        return
+
+    values = [
+        {
+            "user_id": user_id,
+            "year_month": year_month,
+            "category": category,
+            "total": total,
+            "count": count,
+        }
+        for (user_id, year_month, category), (total, count) in sorted(deltas.items())
+    ]
+
+    conn = await db.connection()
+    dialect_name = conn.dialect.name
+    if dialect_name in ("postgresql", "sqlite"):
+        dialect_insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+        statement = dialect_insert(MonthlyCategoryTotal)
+        statement = statement.on_conflict_do_update(
+            index_elements=["user_id", "year_month", "category"],
+            set_={
+                "total": MonthlyCategoryTotal.total + statement.excluded.total,
+                "count": MonthlyCategoryTotal.count + statement.excluded.count,
+            }
+        )
+        await db.execute(statement, values)
+        return
+
+    # Generic fallback: read-modify-write per key
+    for value in values:
+        rollup = await db.get(
+            MonthlyCategoryTotal,
+            (value["user_id"], value["year_month"], value["category"])
+        )
+        if rollup is None:
+            db.add(MonthlyCategoryTotal(**value))
+        else:
+            rollup.total += value["total"]
+            rollup.count += value["count"]
+    await db.flush()
+
+
+def backfill(db: Session, user_id: Optional[int] = None) -> int:
+    """
+    Rebuild rollups from the raw transactions table.
+
+    On PostgreSQL the transactions table is locked in SHARE mode until the
+    rebuild commits: concurrent writers (which update rollups in the same
+    transaction as their rows) wait, so none of their rows can be counted
+    twice or missed. Reads are not blocked.
+
+    Args:
+        db: Database session
+        user_id: Optional user to rebuild; all users if omitted
+
+    Returns:
+        int: Number of rollup rows written
+    """
+    dialect_name = db.get_bind().dialect.name
+    if dialect_name == "postgresql":
+        db.execute(text(f"LOCK TABLE {Transaction.__tablename__} IN SHARE MODE"))
+
+    year_month = month_start(Transaction.date, dialect_name)
+
+    source = select(
+        Transaction.user_id,
+        year_month.label("year_month"),
+        Transaction.category,
+        func.sum(Transaction.amount),
+        func.count(Transaction.id)
+    ).group_by(Transaction.user_id, year_month, Transaction.category)
+
+    clear = delete(MonthlyCategoryTotal)
+    if user_id is not None:
+        source = source.where(Transaction.user_id == user_id)
+        clear = clear.where(MonthlyCategoryTotal.user_id == user_id)
+
+    db.execute(clear)
+    db.execute(
+        insert(MonthlyCategoryTotal).from_select(
+            ["user_id", "year_month", "category", "total", "count"],
+            source
+        )
+    )
+
+    # INSERT ... SELECT rowcount is not reported by every driver
+    written = select(func.count()).select_from(MonthlyCategoryTotal)
+    if user_id is not None:
+        written = written.where(MonthlyCategoryTotal.user_id == user_id)
+    written = db.execute(written).scalar()
+
+    db.commit()
+    return written
+
+
+def needs_backfill(db: Session) -> bool:
+    """
+    Whether rollups have never been built for existing data: the rollup
+    table is empty while transactions are not (e.g. right after upgrading
+    from a release without rollups).
+
+    Args:
+        db: Database session
+
+    Returns:
+        bool: True if backfill() should run
+    """
+    has_rollups = db.execute(select(MonthlyCategoryTotal.user_id).limit(1)).first() is not None
+    if has_rollups:
+        return False
+    return db.execute(select(Transaction.id).limit(1)).first() is not None
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    from database import SessionLocal, init_db
+
+    parser = argparse.ArgumentParser(description="Maintain monthly category rollups")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    backfill_parser = subparsers.add_parser("backfill", help="Rebuild rollups from transactions")
+    backfill_parser.add_argument("--user-id", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.command == "backfill":
+        init_db()
+        db = SessionLocal()
+        try:
+            written = backfill(db, args.user_id)
+            scope = f"user {args.user_id}" if args.user_id is not None else "all users"
+            print(f"[OK] Backfilled {written} rollup rows for {scope}")
+        finally:
+            db.close()
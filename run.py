@@ -1,8 +1,18 @@
 """
 Simple script to run the FINIX backend server.
-Usage: python run.py
+Usage:
+    python run.py                             # development: one process, auto-reload
+    python run.py --production [--workers N]  # production: multiple workers, no reload
+
+Production mode runs WEB_CONCURRENCY worker processes on uvloop and
+httptools (when installed, as with uvicorn[standard]). With gunicorn
+installed, workers are supervised by gunicorn and recycled gracefully after
+MAX_REQUESTS (+ up to MAX_REQUESTS_JITTER) requests; otherwise uvicorn's
+own process manager is used without recycling.
 """
 
+import argparse
+import importlib.util
 import uvicorn
 import os
 import sys
@@ -11,37 +21,149 @@ from dotenv import load_dotenv
 # Load environment variables from .env file
 load_dotenv()
 
+
+def _available(module: str) -> bool:
+    """Whether an optional module can be imported."""
+    return importlib.util.find_spec(module) is not None
+
+
+def run_gunicorn(app_module: str, host: str, port: int, args: argparse.Namespace):
+    """
+    Serve app_module with gunicorn supervising uvicorn workers.
+
+    Args:
+        app_module: "module:attribute" of the ASGI app
+        host: Bind address
+        port: Bind port
+        args: Parsed command line (workers and recycling settings)
+    """
+    from gunicorn.app.base import BaseApplication
+    from uvicorn.importer import import_from_string
+
+    class FinixApplication(BaseApplication):
+        def load_config(self):
+            self.cfg.set("bind", f"{host}:{port}")
+            self.cfg.set("workers", args.workers)
+            # Picks uvloop / httptools itself when they are installed
+            self.cfg.set("worker_class", "uvicorn.workers.UvicornWorker")
+            self.cfg.set("max_requests", args.max_requests)
+            self.cfg.set("max_requests_jitter", args.max_requests_jitter)
+            self.cfg.set("graceful_timeout", args.graceful_timeout)
+            self.cfg.set("keepalive", 5)
+            self.cfg.set("loglevel", "info")
+
+        def load(self):
+            return import_from_string(app_module)
+
+    FinixApplication().run()
+
+
+def initialize_database():
+    """
+    Create / upgrade the schema once before workers start, then close the
+    connections used for it so no worker inherits them.
+    """
+    import database
+
+    initialized = database.init_db()
+    database.engine.dispose()
+    if initialized:
+        # Workers skip init_db's create_all (forked ones share this module)
+        database.DB_SCHEMA_READY = True
+        os.environ["DB_SCHEMA_READY"] = "true"
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the FINIX backend server")
+    parser.add_argument(
+        "--production",
+        action="store_true",
+        default=os.getenv("SERVER_MODE", "development").lower() == "production",
+        help="Run multiple workers without auto-reload (or set SERVER_MODE=production)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)),
+        help="Worker processes in production mode (default: WEB_CONCURRENCY or CPU count)"
+    )
+    parser.add_argument(
+        "--max-requests",
+        type=int,
+        default=int(os.getenv("MAX_REQUESTS", 10000)),
+        help="Recycle a worker after this many requests (gunicorn only; 0 disables)"
+    )
+    parser.add_argument(
+        "--max-requests-jitter",
+        type=int,
+        default=int(os.getenv("MAX_REQUESTS_JITTER", 1000)),
+        help="Random extra requests per worker, so workers do not recycle together"
+    )
+    parser.add_argument(
+        "--graceful-timeout",
+        type=int,
+        default=int(os.getenv("GRACEFUL_TIMEOUT", 30)),
+        help="Seconds a recycled or stopping worker gets to finish its requests"
+    )
+    args = parser.parse_args()
+
     host = os.getenv("HOST", "0.0.0.0")
     port = int(os.getenv("PORT", 8000))
-    
+
     # Determine if we're running from backend directory or parent directory
     current_dir = os.path.abspath('.')
     parent_dir = os.path.dirname(current_dir)
-    
+
     # Add parent directory to path if running from backend directory
     if os.path.basename(current_dir) == 'backend' and parent_dir not in sys.path:
         sys.path.insert(0, parent_dir)
-    
-    # Try to determine the correct module path
-    try:
-        # First try running from backend directory
-        import main
+
+    # Try to determine the correct module path (without importing the app,
+    # so production workers are the only processes that load it)
+    if _available("main"):
         app_module = "main:app"
         print(f"[INFO] Running from backend directory")
-    except ImportError:
-        # If that fails, try from parent directory
+    else:
         app_module = "backend.main:app"
         print(f"[INFO] Running from parent directory")
-    
+
     print(f"[INFO] Starting server on {host}:{port}")
     print(f"[INFO] API docs will be available at: http://localhost:{port}/docs")
-    
-    uvicorn.run(
-        app_module,
-        host=host,
-        port=port,
-        reload=True,  # Enable auto-reload during development
-        log_level="info"
-    )
 
+    if not args.production:
+        uvicorn.run(
+            app_module,
+            host=host,
+            port=port,
+            reload=True,  # Enable auto-reload during development
+            log_level="info"
+        )
+        sys.exit(0)
+
+    workers = max(1, args.workers)
+    # database.py splits DB_MAX_CONNECTIONS between this many workers
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+    initialize_database()
+
+    loop = "uvloop" if _available("uvloop") else "asyncio"
+    http = "httptools" if _available("httptools") else "h11"
+    print(f"[INFO] Production mode: {workers} workers, {loop} event loop, {http} HTTP parser")
+
+    if _available("gunicorn") and sys.platform != "win32":
+        print(
+            f"[INFO] Recycling workers after {args.max_requests} "
+            f"(+0-{args.max_requests_jitter}) requests"
+        )
+        run_gunicorn(app_module, host, port, args)
+    else:
+        print("[WARNING] gunicorn not installed: workers will not be recycled")
+        uvicorn.run(
+            app_module,
+            host=host,
+            port=port,
+            workers=workers,
+            loop=loop,
+            http=http,
+            timeout_graceful_shutdown=args.graceful_timeout,
+            log_level="info"
+        )
@@ -4,7 +4,7 @@ Ensures data integrity and type safety for all API endpoints.
 """
 
 from pydantic import BaseModel, Field, validator
-from typing import Optional, List
+from typing import Any, Optional, List, Dict, Literal, Union
 from datetime import date, datetime
 from decimal import Decimal
 
@@ -31,6 +31,12 @@ class UserResponse(UserBase):
         from_attributes = True
 
 
+class UserPage(BaseModel):
+    """Schema for a cursor-paginated page of users."""
+    items: List[UserResponse]
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page; null on the last page")
+
+
 # Transaction Schemas
 class TransactionBase(BaseModel):
     """Base schema for Transaction with common fields."""
@@ -51,6 +57,32 @@ class TransactionCreate(TransactionBase):
     user_id: int
 
 
+class BulkRowError(BaseModel):
+    """Schema for a row rejected during bulk ingestion."""
+    row: int = Field(..., description="1-based data row number in the uploaded payload")
+    errors: List[str]
+
+
+class TransactionBulkResponse(BaseModel):
+    """Schema for bulk transaction ingestion response."""
+    user_id: int
+    received: int
+    inserted: int
+    failed: int
+    errors: List[BulkRowError]
+
+
+class TransactionImportResponse(BaseModel):
+    """Schema for bank-statement import response."""
+    user_id: int
+    received: int
+    inserted: int
+    duplicates: int = Field(..., description="Valid rows skipped because they were already imported")
+    credits: int = Field(0, description="Credit (money in) rows skipped; only spending is imported")
+    failed: int
+    errors: List[BulkRowError]
+
+
 class TransactionResponse(TransactionBase):
     """Schema for transaction response."""
     id: int
@@ -61,12 +93,41 @@ class TransactionResponse(TransactionBase):
         from_attributes = True
 
 
+class TransactionPage(BaseModel):
+    """Schema for a cursor-paginated page of transactions."""
+    items: List[TransactionResponse]
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page; null on the last page")
+
+
+class TransactionSummaryResponse(BaseModel):
+    """Schema for per-user transaction summary statistics."""
+    total_transactions: int
+    total_amount: Decimal
+    average_amount: Decimal
+    categories: Dict[str, Decimal]
+
+
+class TimeSeriesPoint(BaseModel):
+    """Schema for one bucket of a spending time series."""
+    period: date = Field(..., description="First day of the bucket")
+    total: Decimal
+    count: int
+
+
+class TimeSeriesResponse(BaseModel):
+    """Schema for a dense, zero-filled spending time series."""
+    user_id: int
+    granularity: str
+    category: Optional[str] = None
+    points: List[TimeSeriesPoint]
+
+
 # TravelGoal Schemas
 class TravelGoalBase(BaseModel):
     """Base schema for TravelGoal with common fields."""
     name: str = Field(..., min_length=1, max_length=255)
     target_amount: Decimal = Field(..., gt=0, description="Target savings amount (must be positive)")
-    current_saved: Decimal = Field(default=0.0, ge=0, description="Current savings (must be non-negative)")
+    current_saved: Decimal = Field(default=Decimal("0"), ge=0, description="Current savings (must be non-negative)")
     target_date: Optional[date] = None
     destination: Optional[str] = Field(None, max_length=255)
 
@@ -85,6 +146,11 @@ class TravelGoalUpdate(BaseModel):
     destination: Optional[str] = Field(None, max_length=255)
 
 
+class TravelGoalContribution(BaseModel):
+    """Schema for an atomic change to a travel goal's current savings."""
+    amount: Decimal = Field(..., description="Amount to add (negative to withdraw)")
+
+
 class TravelGoalResponse(TravelGoalBase):
     """Schema for travel goal response."""
     id: int
@@ -96,6 +162,58 @@ class TravelGoalResponse(TravelGoalBase):
         from_attributes = True
 
 
+class TravelGoalProgress(TravelGoalResponse):
+    """Schema for a travel goal with progress and timeline estimates."""
+    progress_percent: float = Field(..., description="current_saved as a percentage of target_amount (capped at 100)")
+    remaining_amount: Decimal
+    months_to_goal_current: Optional[float] = None
+    months_to_goal_optimized: Optional[float] = None
+
+
+class DashboardResponse(BaseModel):
+    """Schema for everything the user dashboard renders, in one response."""
+    user: UserResponse
+    recent_transactions: List[TransactionResponse]
+    summary: TransactionSummaryResponse
+    travel_goals: List[TravelGoalProgress]
+
+
+# Batch Schemas
+class BatchOperation(BaseModel):
+    """
+    Schema for one operation of a POST /batch request.
+    
+    data is the body the matching endpoint takes; user_id and goal_id are
+    its path parameters. Any of them (and user_id inside data) may be
+    "$<index>" to use the id returned by an earlier operation.
+    """
+    op: Literal[
+        "create_user", "create_transaction", "create_travel_goal",
+        "update_travel_goal", "add_contribution", "delete_travel_goal"
+    ]
+    user_id: Optional[Union[int, str]] = None
+    goal_id: Optional[Union[int, str]] = None
+    data: Dict[str, Any] = Field(default_factory=dict)
+
+
+class BatchRequest(BaseModel):
+    """Schema for an ordered list of operations run in one transaction."""
+    operations: List[BatchOperation] = Field(..., min_length=1)
+
+
+class BatchOperationResult(BaseModel):
+    """Schema for the outcome of one batch operation."""
+    index: int
+    op: str
+    status: int = Field(..., description="HTTP status the single-resource endpoint would have returned")
+    result: Optional[Dict[str, Any]] = None
+
+
+class BatchResponse(BaseModel):
+    """Schema for the results of a committed batch, in request order."""
+    results: List[BatchOperationResult]
+
+
 # AI Suggestion Schemas
 class SavingsSuggestion(BaseModel):
     """Schema for a single savings suggestion."""
@@ -134,22 +252,39 @@ class StatelessTransactionInput(BaseModel):
     description: Optional[str] = Field(None, max_length=255)
 
 
+class StatelessTransactionColumns(BaseModel):
+    """
+    Columnar transactions for stateless API calls: parallel arrays with one
+    entry per transaction. Values are checked by columnar.validate_columns
+    rather than per item here.
+    """
+    amount: List = Field(..., description="Transaction amounts (must be positive)")
+    category: List = Field(..., description="Categories (1-50 characters)")
+    currency: Optional[List] = Field(None, description="3-letter currency codes (default USD)")
+    date: List = Field(..., description="Dates (YYYY-MM-DD)")
+    description: Optional[List] = Field(None, description="Optional descriptions (max 255 characters)")
+
+
 class StatelessTravelGoalInput(BaseModel):
     """Schema for travel goal input in stateless API calls."""
     name: str = Field(..., min_length=1, max_length=255)
     target_amount: Decimal = Field(..., gt=0)
-    current_saved: Decimal = Field(default=0.0, ge=0)
+    current_saved: Decimal = Field(default=Decimal("0"), ge=0)
     target_date: Optional[date] = None
     destination: Optional[str] = Field(None, max_length=255)
 
 
 class SuggestionsCalculateRequest(BaseModel):
     """Schema for stateless suggestions calculation request."""
-    transactions: List[StatelessTransactionInput] = Field(..., description="List of user transactions")
+    transactions: Union[List[StatelessTransactionInput], StatelessTransactionColumns] = Field(
+        ..., description="List of user transactions, or parallel arrays of their fields"
+    )
     travel_goal: StatelessTravelGoalInput = Field(..., description="Travel goal information")
     user_id: int = Field(default=1, description="User ID for response (not used for calculation)")
 
 
 class TransactionsSummaryRequest(BaseModel):
     """Schema for stateless transaction summary request."""
-    transactions: List[StatelessTransactionInput] = Field(..., description="List of transactions to summarize")
+    transactions: Union[List[StatelessTransactionInput], StatelessTransactionColumns] = Field(
+        ..., description="List of transactions to summarize, or parallel arrays of their fields"
+    )
@@ -0,0 +1,255 @@
+"""
+Fast serialization for FINIX backend listings.
+Large listing endpoints select plain column tuples and encode them straight
+to JSON bytes with orjson, skipping ORM hydration and the Pydantic
+response-model round-trip. The output matches what the response models
+produce: Decimals as strings, ISO dates and UTC datetimes ending in 'Z'.
+
+Clients that send an Accept header for msgpack (columnar arrays) or Arrow
+IPC get the same rows column by column instead. Both encoders are optional
+dependencies; a format is only offered when its library is installed.
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+import orjson
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy import select
+
+from models import Transaction
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/x-msgpack"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+# Accept values that also select a format
+MEDIA_TYPE_ALIASES = {
+    "*/*": JSON_MEDIA_TYPE,
+    "application/*": JSON_MEDIA_TYPE,
+    "application/msgpack": MSGPACK_MEDIA_TYPE,
+    "application/vnd.msgpack": MSGPACK_MEDIA_TYPE,
+}
+
+
+# Column order of TransactionResponse rows
+TRANSACTION_FIELDS = ("id", "user_id", "amount", "category", "currency", "date", "description", "created_at")
+
+# Column order of per-category summary rows
+SUMMARY_FIELDS = ("category", "count", "total")
+
+
+def transaction_columns() -> List:
+    """Transaction columns to select for TRANSACTION_FIELDS rows."""
+    return [getattr(Transaction, field) for field in TRANSACTION_FIELDS]
+
+
+def transaction_rows_query(
+    user_id: int,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    category: Optional[str] = None
+):
+    """
+    Select a user's TRANSACTION_FIELDS rows as plain column tuples.
+
+    Args:
+        user_id: User ID
+        start_date: Optional start date filter
+        end_date: Optional end date filter
+        category: Optional category filter
+
+    Returns:
+        Unordered select() of TRANSACTION_FIELDS columns
+    """
+    query = select(*transaction_columns()).where(Transaction.user_id == user_id)
+    if start_date:
+        query = query.where(Transaction.date >= start_date)
+    if end_date:
+        query = query.where(Transaction.date <= end_date)
+    if category:
+        query = query.where(Transaction.category == category)
+    return query
+
+
+def _default(value: Any):
+    """orjson fallback for types it does not encode natively."""
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def rows_to_dicts(rows: Iterable[Sequence], fields: Sequence[str]) -> List[Dict]:
+    """Pair selected column tuples with their field names."""
+    return [dict(zip(fields, row)) for row in rows]
+
+
+def dumps(content: Any) -> bytes:
+    """Encode content to JSON bytes."""
+    return orjson.dumps(content, default=_default, option=orjson.OPT_UTC_Z)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson; bypasses response_model validation when returned directly."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def available_media_types() -> List[str]:
+    """Response media types this process can produce."""
+    media_types = [JSON_MEDIA_TYPE]
+    if msgpack is not None:
+        media_types.append(MSGPACK_MEDIA_TYPE)
+    if pa is not None:
+        media_types.append(ARROW_MEDIA_TYPE)
+    return media_types
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """
+    Pick the response media type for an Accept header.
+
+    Args:
+        accept: Raw Accept header value (JSON when missing)
+
+    Returns:
+        The available media type with the highest q-value (earliest on
+        ties); JSON when the header names none of them (e.g. text/plain),
+        so clients that never asked for msgpack or Arrow keep getting JSON
+    """
+    if not accept:
+        return JSON_MEDIA_TYPE
+
+    available = available_media_types()
+    best, best_q = JSON_MEDIA_TYPE, 0.0
+    for part in accept.split(","):
+        media_type, *params = [piece.strip() for piece in part.split(";")]
+        media_type = MEDIA_TYPE_ALIASES.get(media_type.lower(), media_type.lower())
+        if media_type not in available:
+            continue
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        if q > best_q:
+            best, best_q = media_type, q
+    return best
+
+
+def rows_to_columns(rows: Sequence[Sequence], fields: Sequence[str]) -> Dict[str, List]:
+    """Transpose column tuples into {field: [values]}."""
+    columns = zip(*rows) if rows else [()] * len(fields)
+    return {field: list(values) for field, values in zip(fields, columns)}
+
+
+def _msgpack_default(value: Any):
+    """msgpack fallback, encoding values the way the JSON responses do."""
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat().replace("+00:00", "Z")
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Type is not msgpack serializable: {type(value).__name__}")
+
+
+def encode_msgpack(content: Any) -> bytes:
+    """Encode content to msgpack bytes."""
+    return msgpack.packb(content, default=_msgpack_default)
+
+
+def encode_arrow(columns: Dict[str, List], schema, metadata: Optional[Dict[str, str]] = None) -> bytes:
+    """
+    Encode columns as a single-batch Arrow IPC stream.
+
+    Args:
+        columns: {field: [values]} in schema order
+        schema: pyarrow schema for the columns
+        metadata: Optional string key/values stored in the schema metadata
+
+    Returns:
+        bytes: Arrow IPC stream (read with pyarrow.ipc.open_stream)
+    """
+    if metadata:
+        schema = schema.with_metadata(metadata)
+    table = pa.Table.from_pydict(columns, schema=schema)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def summary_arrow_schema():
+    """Arrow schema for SUMMARY_FIELDS rows."""
+    return pa.schema([
+        ("category", pa.string()),
+        ("count", pa.int64()),
+        ("total", pa.decimal128(14, 2)),
+    ])
+
+
+def transaction_arrow_schema():
+    """Arrow schema for TRANSACTION_FIELDS rows."""
+    return pa.schema([
+        ("id", pa.int64()),
+        ("user_id", pa.int64()),
+        ("amount", pa.decimal128(12, 2)),
+        ("category", pa.string()),
+        ("currency", pa.string()),
+        ("date", pa.date32()),
+        ("description", pa.string()),
+        ("created_at", pa.timestamp("us", tz="UTC")),
+    ])
+
+
+def columnar_response(
+    media_type: str,
+    rows: Sequence[Sequence],
+    fields: Sequence[str],
+    arrow_schema: Callable,
+    metadata: Optional[Dict[str, Any]] = None
+) -> Response:
+    """
+    Build a msgpack or Arrow response holding rows column by column.
+
+    msgpack bodies are {"columns": {field: [values]}, **metadata}. Arrow
+    bodies are one record batch with metadata (stringified, None values
+    omitted) in the schema metadata.
+
+    Args:
+        media_type: MSGPACK_MEDIA_TYPE or ARROW_MEDIA_TYPE
+        rows: Column tuples in fields order
+        fields: Column names
+        arrow_schema: Callable returning the pyarrow schema for fields
+        metadata: Optional scalars sent alongside the columns (e.g. next_cursor)
+
+    Returns:
+        Response with the encoded body
+    """
+    columns = rows_to_columns(rows, fields)
+    metadata = metadata or {}
+    if media_type == ARROW_MEDIA_TYPE:
+        body = encode_arrow(
+            columns,
+            arrow_schema(),
+            {key: str(value) for key, value in metadata.items() if value is not None}
+        )
+    else:
+        body = encode_msgpack({"columns": columns, **metadata})
+    return Response(content=body, media_type=media_type, headers={"Vary": "Accept"})
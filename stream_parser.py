@@ -0,0 +1,281 @@
+"""
+Incremental request-body parsing for FINIX backend.
+Decodes transactions from a JSON document or NDJSON body one at a time as
+chunks arrive, so stateless endpoints can fold large uploads into running
+aggregates without holding the whole payload (or a list of models) in memory.
+"""
+
+import asyncio
+import codecs
+import json
+import re
+from collections import defaultdict
+from decimal import Decimal
+from typing import AsyncIterator, Dict, List, Tuple
+
+import pandas as pd
+
+from schemas import StatelessTransactionInput
+
+
+_WHITESPACE = re.compile(r"\s*")
+_DELIMITERS = frozenset(" \t\r\n,:]}")
+_decoder = json.JSONDecoder()
+
+# Pending JSON text (characters) above which a value is decoded in a thread
+THREAD_DECODE_SIZE = 1 << 20
+
+
+class Columns(dict):
+    """A columnar transactions object ({"amount": [...], ...}) decoded whole from the body."""
+
+
+class _JSONBuffer:
+    """Text window over a chunked body, holding at most one pending value."""
+
+    def __init__(self, chunks: AsyncIterator[bytes]):
+        self._chunks = chunks.__aiter__()
+        self._utf8 = codecs.getincrementaldecoder("utf-8-sig")()
+        # Chunks read but not yet merged into text
+        self._unmerged: List[str] = []
+        self._unmerged_size = 0
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    async def _read(self) -> bool:
+        """Read the next chunk without merging it into text; False at end of body."""
+        if self.eof:
+            return False
+        try:
+            chunk = await self._chunks.__anext__()
+        except StopAsyncIteration:
+            self.eof = True
+            self._unmerged.append(self._utf8.decode(b"", final=True))
+            return False
+        decoded = self._utf8.decode(chunk)
+        self._unmerged.append(decoded)
+        self._unmerged_size += len(decoded)
+        return True
+
+    def _merge(self) -> None:
+        """Append the chunks read so far to text, dropping consumed text."""
+        self.text = self.text[self.pos:] + "".join(self._unmerged)
+        self.pos = 0
+        self._unmerged = []
+        self._unmerged_size = 0
+
+    async def fill(self) -> bool:
+        """Append the next chunk (dropping consumed text); False at end of body."""
+        more = await self._read()
+        self._merge()
+        return more
+
+    async def peek(self) -> str:
+        """Skip whitespace and return the next character ('' at end of body)."""
+        while True:
+            self.pos = _WHITESPACE.match(self.text, self.pos).end()
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not await self.fill():
+                return ""
+
+    async def expect(self, char: str) -> None:
+        """Consume char or raise ValueError."""
+        found = await self.peek()
+        if found != char:
+            raise ValueError(f"Expected '{char}' but found '{found or 'end of body'}'")
+        self.pos += 1
+
+    async def _decode(self):
+        """raw_decode at pos; large values are decoded off the event loop."""
+        if len(self.text) - self.pos > THREAD_DECODE_SIZE:
+            return await asyncio.to_thread(_decoder.raw_decode, self.text, self.pos)
+        return _decoder.raw_decode(self.text, self.pos)
+
+    async def value(self):
+        """Decode the next complete JSON value."""
+        await self.peek()
+        while True:
+            try:
+                value, end = await self._decode()
+                # A number is only complete once a delimiter follows it (it may continue in the next chunk)
+                if self.eof or (end < len(self.text) and self.text[end] in _DELIMITERS):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # Retry a value spanning many chunks (e.g. a columnar payload)
+            # only once the buffered text has doubled, so parsing stays linear
+            pending = len(self.text) - self.pos
+            while await self._read() and self._unmerged_size < pending:
+                pass
+            self._merge()
+
+
+async def _array_items(buffer: _JSONBuffer) -> AsyncIterator[object]:
+    """Yield the items of the JSON array starting at the buffer position."""
+    await buffer.expect("[")
+    if await buffer.peek() == "]":
+        buffer.pos += 1
+        return
+    while True:
+        yield await buffer.value()
+        if await buffer.peek() == ",":
+            buffer.pos += 1
+            continue
+        await buffer.expect("]")
+        return
+
+
+async def iter_json_array(chunks: AsyncIterator[bytes], key: str) -> AsyncIterator[object]:
+    """
+    Stream the items of a JSON array from a chunked body.
+
+    Accepts either a bare array or an object holding the array under key,
+    e.g. {"transactions": [...]}. Other members of the object are decoded
+    and discarded. An object (rather than an array) under key is a
+    columnar payload and is yielded whole as a single Columns item.
+
+    Args:
+        chunks: Raw body chunks (e.g. Request.stream())
+        key: Object member holding the array
+
+    Yields:
+        Decoded array items, one at a time
+
+    Raises:
+        ValueError: If the body is not valid JSON of that shape
+    """
+    buffer = _JSONBuffer(chunks)
+    first = await buffer.peek()
+
+    if first == "[":
+        async for item in _array_items(buffer):
+            yield item
+    elif first == "{":
+        buffer.pos += 1
+        found = False
+        if await buffer.peek() == "}":
+            buffer.pos += 1
+        else:
+            while True:
+                name = await buffer.value()
+                if not isinstance(name, str):
+                    raise ValueError("Object keys must be strings")
+                await buffer.expect(":")
+                if name == key and await buffer.peek() == "[":
+                    found = True
+                    async for item in _array_items(buffer):
+                        yield item
+                elif name == key and await buffer.peek() == "{":
+                    found = True
+                    yield Columns(await buffer.value())
+                else:
+                    await buffer.value()
+                if await buffer.peek() == ",":
+                    buffer.pos += 1
+                    continue
+                await buffer.expect("}")
+                break
+        if not found:
+            raise ValueError(f"Missing '{key}' array")
+    else:
+        raise ValueError("Expected a JSON object or array")
+
+    if await buffer.peek() != "":
+        raise ValueError("Unexpected data after the JSON document")
+
+
+async def iter_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[object]:
+    """
+    Stream objects from a chunked NDJSON body (one JSON object per line).
+
+    Raises:
+        ValueError: On a line that is not a JSON object
+    """
+    pending = b""
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield _ndjson_object(line)
+    if pending.strip():
+        yield _ndjson_object(pending)
+
+
+def _ndjson_object(line: bytes) -> Dict:
+    row = json.loads(line.decode("utf-8-sig"))
+    if not isinstance(row, dict):
+        raise ValueError("Each NDJSON line must be a JSON object")
+    return row
+
+
+async def iter_transactions(chunks: AsyncIterator[bytes], fmt: str) -> AsyncIterator[Tuple[int, object]]:
+    """
+    Stream raw transaction objects from a "json" or "ndjson" body.
+
+    Yields:
+        (row_number, row) tuples; row numbers are 1-based. A columnar JSON
+        payload arrives as one Columns row.
+
+    Raises:
+        ValueError: On malformed input or a transaction that is not an object
+    """
+    rows = iter_ndjson(chunks) if fmt == "ndjson" else iter_json_array(chunks, "transactions")
+    row_number = 0
+    async for row in rows:
+        row_number += 1
+        if not isinstance(row, dict):
+            raise ValueError(f"Transaction {row_number} must be a JSON object")
+        yield row_number, row
+
+
+class TransactionSummary:
+    """Running count, total and per-category totals of stateless transactions."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = Decimal("0")
+        self.categories: Dict[str, Decimal] = defaultdict(lambda: Decimal("0"))
+
+    def add(self, transaction: StatelessTransactionInput) -> None:
+        """Fold one validated transaction into the aggregates."""
+        self.count += 1
+        self.total += transaction.amount
+        self.categories[transaction.category] += transaction.amount
+
+    def add_columns(self, frame: pd.DataFrame) -> None:
+        """Fold a validated columnar batch (see columnar.validate_columns) into the aggregates."""
+        if not len(frame):
+            return
+        self.count += len(frame)
+        # New categories in order of first appearance, as add() records them
+        for category in frame["category"].unique():
+            self.categories[category] += 0
+        if "exact_amount" in frame:
+            # Amounts finer than a cent are summed exactly, as add() does
+            finer = frame["exact_amount"].notna()
+            for category, amount in zip(frame.loc[finer, "category"], frame.loc[finer, "exact_amount"]):
+                self.total += amount
+                self.categories[category] += amount
+            frame = frame[~finer]
+        for category, cents in frame.groupby("category", sort=False)["cents"].sum().items():
+            amount = Decimal(int(cents)).scaleb(-2)
+            self.total += amount
+            self.categories[category] += amount
+
+    def result(self) -> Dict:
+        """
+        Summary in the /transactions/summary response shape. Sums are exact;
+        amounts are returned as floats (JSON numbers), as that endpoint
+        always has.
+        """
+        return {
+            "total_transactions": self.count,
+            "total_amount": float(self.total),
+            "average_amount": float(self.total / self.count) if self.count else 0.0,
+            "categories": {category: float(amount) for category, amount in self.categories.items()}
+        }
@@ -0,0 +1,181 @@
+"""
+Two-tier cache for LLM savings suggestions in FINIX backend.
+Keys are a stable hash of the model name and the prompt built by
+AIEngine._generate_llm_prompt, which already encodes the analysis, the
+savings metrics and the travel goal. Unchanged inputs therefore reuse the
+previous answer instead of calling Groq again.
+
+Tier 1 is an in-process LRU with TTL. Tier 2 is a local SQLite file shared
+by every uvicorn worker on the host.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+from cache import TTLCache
+from schemas import SavingsSuggestion
+
+
+class SQLiteSuggestionStore:
+    """
+    On-disk key/value store for serialized suggestions, safe to share
+    between processes (SQLite WAL mode).
+    """
+
+    def __init__(self, path: str, ttl_seconds: float):
+        """
+        Args:
+            path: SQLite database file
+            ttl_seconds: Seconds an entry stays valid
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS suggestions ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection (sqlite3 connections are per thread)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the stored value, or None if missing or expired."""
+        row = self._connect().execute(
+            "SELECT value FROM suggestions WHERE key = ? AND expires_at > ?",
+            (key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: str) -> None:
+        """Store a value and drop expired entries."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO suggestions (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, now + self.ttl_seconds)
+            )
+            conn.execute("DELETE FROM suggestions WHERE expires_at <= ?", (now,))
+
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT count(*) FROM suggestions").fetchone()[0]
+
+
+class SuggestionCache:
+    """
+    Two-tier (memory, then SQLite) cache of parsed SavingsSuggestion lists
+    with hit/miss counters.
+    """
+
+    def __init__(self, memory: TTLCache, disk: Optional[SQLiteSuggestionStore] = None):
+        """
+        Args:
+            memory: Tier 1 in-process cache
+            disk: Optional tier 2 store shared across workers
+        """
+        self.memory = memory
+        self.disk = disk
+        self._lock = threading.Lock()
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "disk_errors": 0}
+
+    @staticmethod
+    def make_key(model: str, prompt: str) -> str:
+        """Stable cache key for an LLM prompt."""
+        return hashlib.sha256(f"{model}\n{prompt}".encode("utf-8")).hexdigest()
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self._counters[counter] += 1
+
+    def get(self, key: str) -> Optional[List[SavingsSuggestion]]:
+        """
+        Look a key up in memory, then on disk (promoting disk hits to memory).
+
+        Returns:
+            Cached suggestions, or None on a miss
+        """
+        suggestions = self.memory.get(key)
+        if suggestions is not None:
+            self._count("memory_hits")
+            return list(suggestions)
+
+        if self.disk is not None:
+            try:
+                value = self.disk.get(key)
+            except sqlite3.Error as e:
+                print(f"[WARNING] Suggestion cache read failed: {str(e)}")
+                self._count("disk_errors")
+                value = None
+            if value is not None:
+                suggestions = [SavingsSuggestion(**s) for s in json.loads(value)]
+                self.memory.set(key, suggestions)
+                self._count("disk_hits")
+                return list(suggestions)
+
+        self._count("misses")
+        return None
+
+    def set(self, key: str, suggestions: List[SavingsSuggestion]) -> None:
+        """Store suggestions in both tiers."""
+        self.memory.set(key, list(suggestions))
+        if self.disk is not None:
+            try:
+                self.disk.set(key, json.dumps([s.model_dump(mode="json") for s in suggestions]))
+            except sqlite3.Error as e:
+                print(f"[WARNING] Suggestion cache write failed: {str(e)}")
+                self._count("disk_errors")
+        self._count("stores")
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and tier sizes for this worker."""
+        with self._lock:
+            counters = dict(self._counters)
+        lookups = counters["memory_hits"] + counters["disk_hits"] + counters["misses"]
+        counters["hit_rate"] = round((counters["memory_hits"] + counters["disk_hits"]) / lookups, 4) if lookups else 0.0
+        counters["memory_entries"] = len(self.memory)
+        counters["disk_enabled"] = self.disk is not None
+        if self.disk is not None:
+            try:
+                counters["disk_entries"] = len(self.disk)
+            except sqlite3.Error:
+                counters["disk_entries"] = None
+        return counters
+
+
+SUGGESTION_CACHE_TTL_SECONDS = float(os.getenv("SUGGESTION_CACHE_TTL_SECONDS", 6 * 3600))
+# Path of the shared SQLite tier; set to an empty string to disable it
+SUGGESTION_CACHE_PATH = os.getenv("SUGGESTION_CACHE_PATH", ".cache/suggestions.sqlite3")
+
+
+def _create_suggestion_cache() -> SuggestionCache:
+    """Build the process-wide suggestion cache from environment settings."""
+    memory = TTLCache(
+        max_size=int(os.getenv("SUGGESTION_CACHE_SIZE", 1000)),
+        ttl_seconds=SUGGESTION_CACHE_TTL_SECONDS
+    )
+    disk = None
+    if SUGGESTION_CACHE_PATH:
+        try:
+            disk = SQLiteSuggestionStore(SUGGESTION_CACHE_PATH, SUGGESTION_CACHE_TTL_SECONDS)
+        except (OSError, sqlite3.Error) as e:
+            print(f"[WARNING] Suggestion disk cache unavailable: {str(e)}. Using memory tier only.")
+    return SuggestionCache(memory, disk)
+
+
+# Shared suggestion cache (memory tier per worker, disk tier per host)
+suggestion_cache = _create_suggestion_cache()
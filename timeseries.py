@@ -0,0 +1,200 @@
+"""
+Time-series bucketing for FINIX backend.
+Builds SQL expressions that truncate transaction dates to day / week / month
+buckets (date_trunc on PostgreSQL, date() modifiers on SQLite) and turns the
+grouped totals into a dense, zero-filled series.
+"""
+
+import os
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Date, cast, func, select
+
+import rollups
+from models import MonthlyCategoryTotal, Transaction
+
+
+GRANULARITIES = ("day", "week", "month")
+
+# Most points a series may have (about 13 years of days)
+TIMESERIES_MAX_POINTS = int(os.getenv("TIMESERIES_MAX_POINTS", 5000))
+
+
+def bucket_start(column, granularity: str, dialect_name: str):
+    """
+    SQL expression truncating a date column to the start of its bucket.
+    Weeks start on Monday, as with PostgreSQL's date_trunc('week', ...).
+
+    Args:
+        column: Date column or expression
+        granularity: "day", "week" or "month"
+        dialect_name: Name of the bound dialect ("postgresql", "sqlite", ...)
+
+    Returns:
+        SQL expression of type Date
+    """
+    if dialect_name == "sqlite":
+        modifiers = {
+            "day": (),
+            "week": ("weekday 0", "-6 days"),
+            "month": ("start of month",),
+        }[granularity]
+        return func.date(column, *modifiers, type_=Date)
+    if granularity == "day":
+        return column
+    return cast(func.date_trunc(granularity, column), Date)
+
+
+def totals_query(
+    user_id: int,
+    granularity: str,
+    dialect_name: str,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    category: Optional[str] = None
+):
+    """
+    One GROUP BY returning a user's (bucket, total, count) rows: from the
+    monthly rollups for monthly series over whole months, otherwise from
+    transactions over the (user_id, date) index.
+
+    Args:
+        user_id: User ID
+        granularity: "day", "week" or "month"
+        dialect_name: Name of the bound dialect ("postgresql", "sqlite", ...)
+        start_date: Optional start date filter
+        end_date: Optional end date filter
+        category: Optional category filter
+
+    Returns:
+        select() yielding bucket start, total and count per bucket
+    """
+    if granularity == "month" and rollups.covers_whole_months(start_date, end_date):
+        period = MonthlyCategoryTotal.year_month
+        query = select(
+            period,
+            func.sum(MonthlyCategoryTotal.total),
+            func.sum(MonthlyCategoryTotal.count)
+        ).where(MonthlyCategoryTotal.user_id == user_id)
+        
+        # Apply filters
+        if start_date:
+            query = query.where(MonthlyCategoryTotal.year_month >= start_date)
+        if end_date:
+            query = query.where(MonthlyCategoryTotal.year_month <= end_date)
+        if category:
+            query = query.where(MonthlyCategoryTotal.category == category)
+    else:
+        period = bucket_start(Transaction.date, granularity, dialect_name)
+        query = select(
+            period,
+            func.sum(Transaction.amount),
+            func.count(Transaction.id)
+        ).where(Transaction.user_id == user_id)
+        
+        # Apply filters
+        if start_date:
+            query = query.where(Transaction.date >= start_date)
+        if end_date:
+            query = query.where(Transaction.date <= end_date)
+        if category:
+            query = query.where(Transaction.category == category)
+    
+    return query.group_by(period)
+
+
+def truncate(value: date, granularity: str) -> date:
+    """Python counterpart of bucket_start for a single date."""
+    if granularity == "week":
+        return value - timedelta(days=value.weekday())
+    if granularity == "month":
+        return value.replace(day=1)
+    return value
+
+
+def next_bucket(value: date, granularity: str) -> date:
+    """Start of the bucket following the one starting at value."""
+    if granularity == "day":
+        return value + timedelta(days=1)
+    if granularity == "week":
+        return value + timedelta(weeks=1)
+    if value.month == 12:
+        return value.replace(year=value.year + 1, month=1)
+    return value.replace(month=value.month + 1)
+
+
+def bucket_count(first: date, last: date, granularity: str) -> int:
+    """Number of buckets from the one starting at first to the one starting at last, inclusive."""
+    if granularity == "day":
+        return (last - first).days + 1
+    if granularity == "week":
+        return (last - first).days // 7 + 1
+    return (last.year - first.year) * 12 + last.month - first.month + 1
+
+
+def check_range(
+    start_date: Optional[date],
+    end_date: Optional[date],
+    granularity: str,
+    max_points: int = TIMESERIES_MAX_POINTS
+) -> None:
+    """
+    Reject a date range that is reversed or spans more than max_points buckets.
+
+    Raises:
+        ValueError: With a message suitable for a 400 response
+    """
+    if start_date and end_date:
+        if start_date > end_date:
+            raise ValueError("start_date must not be after end_date")
+        points = bucket_count(truncate(start_date, granularity), truncate(end_date, granularity), granularity)
+        if points > max_points:
+            raise ValueError(
+                f"Range spans {points} {granularity} buckets; at most {max_points} are allowed. "
+                f"Narrow the range or use a coarser granularity."
+            )
+
+
+def fill_series(
+    totals: Dict[date, Tuple[Decimal, int]],
+    granularity: str,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+) -> List[Dict]:
+    """
+    Expand sparse bucket totals into a dense series with zero-filled gaps.
+
+    The series runs from the bucket containing start_date (or the first
+    bucket with data) to the bucket containing end_date (or the last one).
+
+    Args:
+        totals: {bucket_start: (total, count)} for buckets with transactions
+        granularity: "day", "week" or "month"
+        start_date: Optional inclusive start of the range
+        end_date: Optional inclusive end of the range
+
+    Returns:
+        List of {"period", "total", "count"} dicts, oldest first
+
+    Raises:
+        ValueError: If the series would have more than TIMESERIES_MAX_POINTS points
+    """
+    first = truncate(start_date, granularity) if start_date else min(totals, default=None)
+    last = truncate(end_date, granularity) if end_date else max(totals, default=None)
+    first = first or last
+    last = last or first
+    if first is None or first > last:
+        return []
+    check_range(first, last, granularity)
+
+    points = []
+    period = first
+    for index in range(bucket_count(first, last, granularity)):
+        if index:
+            # Only step to buckets in range, so a range ending near date.max works
+            period = next_bucket(period, granularity)
+        total, count = totals.get(period, (Decimal("0"), 0))
+        points.append({"period": period, "total": total, "count": count})
+    return points
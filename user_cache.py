@@ -0,0 +1,171 @@
+"""
+User-existence lookups for FINIX backend.
+Most endpoints only need to know that a user exists before running their
+real query. This module answers that from an in-process LRU cache with TTL,
+and builds single-statement queries that return a user's rows together
+with a user-exists flag, so listings cost one round-trip instead of two.
+"""
+
+import os
+from typing import Callable, List, Optional
+
+from sqlalchemy import event, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from cache import TTLCache
+from models import User
+
+
+# Shared user_id -> True cache of users known to exist (per worker process).
+# Only existence is cached: users are never deleted through the API, so a
+# positive entry cannot go stale, while a cached miss would hide a user
+# just created by another worker.
+user_cache = TTLCache(
+    max_size=int(os.getenv("USER_CACHE_SIZE", 10000)),
+    ttl_seconds=float(os.getenv("USER_CACHE_TTL_SECONDS", 60))
+)
+
+
+@event.listens_for(User, "after_insert")
+@event.listens_for(User, "after_delete")
+def _invalidate_user(mapper, connection, target):
+    """Drop cached entries whenever a user row is created or deleted."""
+    user_cache.invalidate(target.id)
+
+
+def remember_user(user_id: int, exists: bool) -> None:
+    """Cache the outcome of an existence check if the user exists."""
+    if exists:
+        user_cache.set(user_id, True)
+
+
+async def user_exists(db: AsyncSession, user_id: int) -> bool:
+    """
+    Check whether a user exists, using the cache when possible.
+
+    Args:
+        db: Async database session
+        user_id: User ID
+
+    Returns:
+        bool: True if the user exists
+    """
+    if user_cache.get(user_id):
+        return True
+    result = await db.execute(select(User.id).where(User.id == user_id))
+    exists = result.scalar() is not None
+    remember_user(user_id, exists)
+    return exists
+
+
+async def select_for_user(
+    db: AsyncSession,
+    user_id: int,
+    entity,
+    query,
+    order_by: Callable
+) -> Optional[List]:
+    """
+    Run a per-user query and the user-existence check as one statement.
+
+    The (already filtered, ordered and limited) query becomes a derived
+    table outer-joined to the user's row:
+
+        SELECT users.id, page.* FROM users
+        LEFT OUTER JOIN (<query>) AS page ON true
+        WHERE users.id = :user_id ORDER BY <order_by(page)>
+
+    No row means the user does not exist; a single row with a NULL entity
+    means the user exists but the query matched nothing.
+
+    Args:
+        db: Async database session
+        user_id: User ID
+        entity: Mapped class selected by query (e.g. Transaction)
+        query: select(entity) statement for the user's rows
+        order_by: Callable mapping the aliased entity to ORDER BY clauses,
+            repeating the inner query's ordering
+
+    Returns:
+        List of entity objects, or None if the user does not exist
+    """
+    if user_cache.get(user_id):
+        # Known user: skip the join and run the query as-is
+        result = await db.execute(query)
+        return list(result.scalars().all())
+
+    page = aliased(entity, query.subquery("page"))
+    statement = (
+        select(User.id, page)
+        .select_from(User)
+        .outerjoin(page, true())
+        .where(User.id == user_id)
+        .order_by(*order_by(page))
+    )
+    result = await db.execute(statement)
+    rows = result.all()
+
+    remember_user(user_id, bool(rows))
+    if not rows:
+        return None
+    return [row[1] for row in rows if row[1] is not None]
+
+
+def user_rows_statement(user_id: int, query, order_by: Callable):
+    """
+    The single statement select_rows_for_user runs for users not in the
+    cache: query as a derived table outer-joined to the user's row.
+
+    Args:
+        user_id: User ID
+        query: select(*columns) statement for the user's rows
+        order_by: Callable mapping the derived table's columns (page.c)
+            to ORDER BY clauses
+
+    Returns:
+        select() yielding users.id followed by the query's columns
+    """
+    page = query.subquery("page")
+    return (
+        select(User.id, *page.c)
+        .select_from(User)
+        .outerjoin(page, true())
+        .where(User.id == user_id)
+        .order_by(*order_by(page.c))
+    )
+
+
+async def select_rows_for_user(
+    db: AsyncSession,
+    user_id: int,
+    query,
+    order_by: Callable
+) -> Optional[List]:
+    """
+    Column-tuple variant of select_for_user: query selects plain columns
+    (the first of which must be non-nullable) and rows come back as tuples
+    without ORM hydration.
+
+    Args:
+        db: Async database session
+        user_id: User ID
+        query: select(*columns) statement for the user's rows
+        order_by: Callable mapping the derived table's columns (page.c)
+            to ORDER BY clauses, repeating the inner query's ordering
+
+    Returns:
+        List of rows, or None if the user does not exist
+    """
+    if user_cache.get(user_id):
+        result = await db.execute(query)
+        return list(result.all())
+
+    result = await db.execute(user_rows_statement(user_id, query, order_by))
+    rows = result.all()
+
+    remember_user(user_id, bool(rows))
+    if not rows:
+        return None
+    # Drop the users.id column; a NULL first column is the no-match row
+    return [row[1:] for row in rows if row[1] is not None]
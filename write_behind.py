@@ -0,0 +1,151 @@
+"""
+Write-behind batching of single-row transaction inserts for FINIX backend.
+With TRANSACTION_WRITE_BEHIND=true, POST /transactions/ queues its row
+in-process instead of committing on its own. The queue is flushed every
+WRITE_BEHIND_MAX_DELAY_MS milliseconds, or as soon as WRITE_BEHIND_MAX_ROWS
+rows are waiting, as one multi-row INSERT ... RETURNING plus one rollup
+upsert in a single commit. Every caller is answered with its own row,
+including the generated id and created_at, once that commit succeeds.
+
+A request therefore waits up to one flush interval longer, in exchange for
+one commit (and fsync) per batch instead of one per row.
+"""
+
+import asyncio
+import os
+from typing import Dict, List, Set, Tuple
+
+from sqlalchemy import insert
+
+from models import Transaction
+import rollups
+import serialization
+
+
+# Opt-in: batch POST /transactions/ inserts (per worker process)
+TRANSACTION_WRITE_BEHIND = os.getenv("TRANSACTION_WRITE_BEHIND", "false").lower() == "true"
+WRITE_BEHIND_MAX_ROWS = int(os.getenv("WRITE_BEHIND_MAX_ROWS", 500))
+WRITE_BEHIND_MAX_DELAY_MS = float(os.getenv("WRITE_BEHIND_MAX_DELAY_MS", 5))
+
+
+class TransactionWriteBatcher:
+    """
+    Collects transaction rows from concurrent requests and writes them in
+    batches. Bound to the event loop it is first used on.
+    """
+
+    def __init__(self, session_factory, max_rows: int = WRITE_BEHIND_MAX_ROWS, max_delay_ms: float = WRITE_BEHIND_MAX_DELAY_MS):
+        """
+        Args:
+            session_factory: Callable returning an AsyncSession context manager
+            max_rows: Rows that trigger an immediate flush
+            max_delay_ms: Longest time a row waits for its batch to be flushed
+        """
+        self.session_factory = session_factory
+        self.max_rows = max_rows
+        self.max_delay = max_delay_ms / 1000
+        self._pending: List[Tuple[Dict, asyncio.Future]] = []
+        self._timer = None
+        self._flushes: Set[asyncio.Task] = set()
+        self.batches = 0
+        self.rows = 0
+
+    async def submit(self, row: Dict) -> Dict:
+        """
+        Queue one validated transaction row and wait for it to be committed.
+
+        Args:
+            row: Dict with user_id, amount, category, currency, date, description
+
+        Returns:
+            The stored row keyed by serialization.TRANSACTION_FIELDS
+
+        Raises:
+            Whatever the database raised while writing this row
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((row, future))
+        if len(self._pending) >= self.max_rows:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._start_flush)
+        return await future
+
+    def _start_flush(self):
+        """Hand the pending rows to a background flush task."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.get_running_loop().create_task(self._flush(batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: List[Tuple[Dict, asyncio.Future]]):
+        """
+        Write a batch and resolve its callers' futures.
+
+        If the batch fails (e.g. one row's user was deleted meanwhile), each
+        row is retried on its own so only the offending callers get the error.
+        """
+        try:
+            stored = await self._write([row for row, _ in batch])
+        except Exception as e:
+            if len(batch) == 1:
+                self._resolve(batch[0][1], exception=e)
+                return
+            for row, future in batch:
+                try:
+                    self._resolve(future, result=(await self._write([row]))[0])
+                except Exception as row_error:
+                    self._resolve(future, exception=row_error)
+            return
+
+        for (_, future), result in zip(batch, stored):
+            self._resolve(future, result=result)
+
+    async def _write(self, rows: List[Dict]) -> List[Dict]:
+        """Insert rows and update rollups in one commit; returns the stored rows in input order."""
+        async with self.session_factory() as db:
+            result = await db.execute(
+                insert(Transaction).returning(
+                    *serialization.transaction_columns(),
+                    sort_by_parameter_order=True
+                ),
+                rows
+            )
+            stored = serialization.rows_to_dicts(result.all(), serialization.TRANSACTION_FIELDS)
+            await rollups.apply_transactions(db, stored)
+            await db.commit()
+        self.batches += 1
+        self.rows += len(rows)
+        return stored
+
+    @staticmethod
+    def _resolve(future: asyncio.Future, result=None, exception: Exception = None):
+        """Answer a caller unless it has gone away (cancelled request)."""
+        if future.done():
+            return
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(result)
+
+    async def close(self):
+        """Flush anything still queued and wait for in-flight batches (call on shutdown)."""
+        self._start_flush()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    def stats(self) -> Dict:
+        """Batches and rows written so far, for monitoring."""
+        return {
+            "batches": self.batches,
+            "rows": self.rows,
+            "pending": len(self._pending),
+            "max_rows": self.max_rows,
+            "max_delay_ms": self.max_delay * 1000,
+        }
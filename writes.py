@@ -0,0 +1,412 @@
+"""
+Single-statement write operations for FINIX backend.
+Each operation is one INSERT / UPDATE / DELETE ... RETURNING (plus the
+rollup upsert for transactions) that does not commit, so the resource
+endpoints commit one operation at a time while POST /batch runs a whole
+client sync in one database transaction.
+
+Operations raise HTTPException like the endpoints do; the caller's
+transaction must then be rolled back (closing the session does so).
+"""
+
+import os
+import re
+from decimal import Decimal
+from typing import Any, Dict, List, Tuple
+
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import Transaction, TravelGoal, User
+from schemas import (
+    BatchOperation,
+    TransactionCreate, TransactionResponse,
+    TravelGoalContribution, TravelGoalCreate, TravelGoalResponse, TravelGoalUpdate,
+    UserCreate, UserResponse,
+)
+from user_cache import user_cache, user_exists
+import ingest
+import rollups
+
+
+# Largest number of operations accepted by POST /batch
+BATCH_MAX_OPERATIONS = int(os.getenv("BATCH_MAX_OPERATIONS", 1000))
+
+# "$<index>" refers to the id returned by an earlier operation of the batch
+BATCH_REFERENCE = re.compile(r"^\$(\d+)$")
+
+
+def _goal_not_found(user_id: int, goal_id: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"Travel goal with ID {goal_id} not found for user {user_id}"
+    )
+
+
+async def _require_user(db: AsyncSession, user_id: int):
+    if not await user_exists(db, user_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User with ID {user_id} not found"
+        )
+
+
+async def create_user(db: AsyncSession, user: UserCreate) -> User:
+    """
+    Insert a user; the unique index on username rejects duplicates.
+
+    Args:
+        db: Async database session
+        user: User creation data
+
+    Returns:
+        The inserted user, with server defaults
+    """
+    try:
+        result = await db.execute(insert(User).values(**user.dict()).returning(User))
+    except IntegrityError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Username already exists"
+        )
+    db_user = result.scalar_one()
+    # Statement inserts skip mapper events, so invalidate the cache here
+    user_cache.invalidate(db_user.id)
+    return db_user
+
+
+async def create_transaction(db: AsyncSession, transaction: TransactionCreate) -> Transaction:
+    """
+    Insert a transaction and add it to the monthly rollups.
+
+    Args:
+        db: Async database session
+        transaction: Transaction creation data
+
+    Returns:
+        The inserted transaction, with server defaults
+    """
+    await _require_user(db, transaction.user_id)
+    result = await db.execute(
+        insert(Transaction).values(**transaction.dict()).returning(Transaction)
+    )
+    await rollups.apply_transactions(db, [transaction.dict()])
+    return result.scalar_one()
+
+
+async def create_travel_goal(db: AsyncSession, goal: TravelGoalCreate) -> TravelGoal:
+    """
+    Insert a travel goal.
+
+    Args:
+        db: Async database session
+        goal: Travel goal creation data
+
+    Returns:
+        The inserted travel goal, with server defaults
+    """
+    await _require_user(db, goal.user_id)
+    result = await db.execute(insert(TravelGoal).values(**goal.dict()).returning(TravelGoal))
+    return result.scalar_one()
+
+
+async def update_travel_goal(
+    db: AsyncSession,
+    user_id: int,
+    goal_id: int,
+    goal_update: TravelGoalUpdate
+) -> TravelGoal:
+    """
+    Update the provided fields of a travel goal.
+
+    Args:
+        db: Async database session
+        user_id: User ID
+        goal_id: Travel goal ID
+        goal_update: Fields to change (unset fields are left alone)
+
+    Returns:
+        The updated travel goal
+    """
+    update_data = goal_update.dict(exclude_unset=True)
+    if update_data:
+        statement = update(TravelGoal).values(**update_data).returning(TravelGoal)
+    else:
+        statement = select(TravelGoal)
+    result = await db.execute(
+        statement.where(
+            TravelGoal.id == goal_id,
+            TravelGoal.user_id == user_id
+        )
+    )
+    goal = result.scalars().first()
+    if not goal:
+        raise _goal_not_found(user_id, goal_id)
+    return goal
+
+
+async def add_travel_goal_contribution(
+    db: AsyncSession,
+    user_id: int,
+    goal_id: int,
+    amount: Decimal
+) -> TravelGoal:
+    """
+    Atomically add amount (negative to withdraw) to a goal's current_saved,
+    without reading the row first.
+
+    Args:
+        db: Async database session
+        user_id: User ID
+        goal_id: Travel goal ID
+        amount: Amount to add
+
+    Returns:
+        The updated travel goal
+    """
+    result = await db.execute(
+        update(TravelGoal)
+        .where(
+            TravelGoal.id == goal_id,
+            TravelGoal.user_id == user_id,
+            TravelGoal.current_saved + amount >= 0
+        )
+        .values(current_saved=TravelGoal.current_saved + amount)
+        .returning(TravelGoal)
+    )
+    goal = result.scalars().first()
+    if goal:
+        return goal
+
+    # Nothing updated: tell a missing goal apart from an overdrawn one
+    result = await db.execute(
+        select(TravelGoal.id).where(
+            TravelGoal.id == goal_id,
+            TravelGoal.user_id == user_id
+        )
+    )
+    if result.scalar() is None:
+        raise _goal_not_found(user_id, goal_id)
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Withdrawal exceeds current savings"
+    )
+
+
+async def delete_travel_goal(db: AsyncSession, user_id: int, goal_id: int) -> None:
+    """
+    Delete a travel goal.
+
+    Args:
+        db: Async database session
+        user_id: User ID
+        goal_id: Travel goal ID
+    """
+    result = await db.execute(
+        delete(TravelGoal).where(
+            TravelGoal.id == goal_id,
+            TravelGoal.user_id == user_id
+        ).returning(TravelGoal.id)
+    )
+    if result.scalar() is None:
+        raise _goal_not_found(user_id, goal_id)
+
+
+def _resolve(value: Any, results: List[Dict]) -> Any:
+    """Replace a "$<index>" reference with the id returned by that earlier operation."""
+    if not isinstance(value, str):
+        return value
+    match = BATCH_REFERENCE.match(value)
+    if not match:
+        return value
+    index = int(match.group(1))
+    if index >= len(results) or not results[index].get("result") or "id" not in results[index]["result"]:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"'{value}' does not refer to an earlier operation that returned an id"
+        )
+    return results[index]["result"]["id"]
+
+
+def _parse(schema, data: Dict):
+    """Validate an operation body, failing like the endpoints do (422)."""
+    try:
+        return schema(**data)
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=ingest.format_validation_error(e)
+        )
+
+
+def _dump(response_schema, obj) -> Dict:
+    """Serialize an ORM object as the endpoint's response model would."""
+    return response_schema.model_validate(obj).model_dump(mode="json")
+
+
+def _operation_data(operation: BatchOperation, results: List[Dict]) -> Dict:
+    """The operation's body with a "$<index>" user_id resolved."""
+    data = dict(operation.data)
+    if "user_id" in data:
+        data["user_id"] = _resolve(data["user_id"], results)
+    return data
+
+
+async def create_transactions(db: AsyncSession, transactions: List[TransactionCreate]) -> List[Transaction]:
+    """
+    Insert many transactions with one multi-row INSERT ... RETURNING and
+    one rollup upsert. The caller checks that the users exist.
+
+    Args:
+        db: Async database session
+        transactions: Validated transaction creation data
+
+    Returns:
+        The inserted transactions, in input order
+    """
+    rows = [transaction.dict() for transaction in transactions]
+    result = await db.execute(
+        insert(Transaction).returning(Transaction, sort_by_parameter_order=True),
+        rows
+    )
+    stored = list(result.scalars().all())
+    await rollups.apply_transactions(db, rows)
+    return stored
+
+
+async def prepare_transaction(db: AsyncSession, operation: BatchOperation, results: List[Dict]) -> TransactionCreate:
+    """Validate a create_transaction operation and check its user exists."""
+    transaction = _parse(TransactionCreate, _operation_data(operation, results))
+    await _require_user(db, transaction.user_id)
+    return transaction
+
+
+async def apply_operation(db: AsyncSession, operation: BatchOperation, results: List[Dict]) -> Dict:
+    """
+    Run one batch operation (other than create_transaction, which run_batch
+    writes in groups) in the session's current transaction.
+
+    Args:
+        db: Async database session
+        operation: The operation (ids and user_id in data may be "$<index>" references)
+        results: Results of the operations before this one
+
+    Returns:
+        {"status": HTTP status, "result": response body or None}
+    """
+    data = _operation_data(operation, results)
+
+    if operation.op == "create_user":
+        user = await create_user(db, _parse(UserCreate, data))
+        return {"status": status.HTTP_201_CREATED, "result": _dump(UserResponse, user)}
+    if operation.op == "create_travel_goal":
+        goal = await create_travel_goal(db, _parse(TravelGoalCreate, data))
+        return {"status": status.HTTP_201_CREATED, "result": _dump(TravelGoalResponse, goal)}
+
+    # The remaining operations address one goal, like their endpoint paths
+    user_id = _resolve(operation.user_id, results)
+    goal_id = _resolve(operation.goal_id, results)
+    try:
+        user_id, goal_id = int(user_id), int(goal_id)
+    except (TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"{operation.op} needs integer (or '$<index>') user_id and goal_id"
+        )
+
+    if operation.op == "update_travel_goal":
+        goal = await update_travel_goal(db, user_id, goal_id, _parse(TravelGoalUpdate, data))
+        return {"status": status.HTTP_200_OK, "result": _dump(TravelGoalResponse, goal)}
+    if operation.op == "add_contribution":
+        contribution = _parse(TravelGoalContribution, data)
+        goal = await add_travel_goal_contribution(db, user_id, goal_id, contribution.amount)
+        return {"status": status.HTTP_200_OK, "result": _dump(TravelGoalResponse, goal)}
+    await delete_travel_goal(db, user_id, goal_id)
+    return {"status": status.HTTP_204_NO_CONTENT, "result": None}
+
+
+async def run_batch(
+    db: AsyncSession,
+    operations: List[BatchOperation],
+    group_transactions: bool = True
+) -> List[Dict]:
+    """
+    Run operations in order in one database transaction, all or nothing.
+
+    Consecutive create_transaction operations are validated one by one but
+    written together (see create_transactions), so a sync made mostly of
+    transactions costs a handful of statements rather than two per row.
+    If writing a group fails, the batch is rolled back and run again with
+    every transaction written on its own, so the error names the failing
+    operation.
+
+    Args:
+        db: Async database session
+        operations: Operations to run
+        group_transactions: Write consecutive create_transaction operations
+            together (False writes each one under its own index)
+
+    Returns:
+        Per-operation {"index", "op", "status", "result"} dicts
+
+    Raises:
+        HTTPException: With the failing operation's status code and a detail
+            of {"index", "op", "detail"}; nothing has been committed
+    """
+    if len(operations) > BATCH_MAX_OPERATIONS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {BATCH_MAX_OPERATIONS} operations per batch"
+        )
+
+    results: List[Dict] = []
+    created_user_ids: List[int] = []
+    # Validated create_transaction operations not written yet, with their
+    # indexes; always the last len(queued) entries of results
+    queued: List[Tuple[int, TransactionCreate]] = []
+
+    async def write_queued():
+        stored = await create_transactions(db, [transaction for _, transaction in queued])
+        for result, transaction in zip(results[-len(queued):], stored):
+            result["result"] = _dump(TransactionResponse, transaction)
+        queued.clear()
+
+    for index, operation in enumerate(operations):
+        writing = False
+        try:
+            if operation.op == "create_transaction":
+                queued.append((index, await prepare_transaction(db, operation, results)))
+                outcome = {"status": status.HTTP_201_CREATED, "result": None}
+            else:
+                if queued:
+                    writing = True
+                    await write_queued()
+                    writing = False
+                outcome = await apply_operation(db, operation, results)
+            results.append({"index": index, "op": operation.op, **outcome})
+            if queued and (not group_transactions or index == len(operations) - 1):
+                writing = True
+                await write_queued()
+        except Exception as e:
+            await db.rollback()
+            # user_exists may have cached users this batch created
+            for user_id in created_user_ids:
+                user_cache.invalidate(user_id)
+            if writing and len(queued) > 1:
+                # One of the group failed, but not a known one
+                return await run_batch(db, operations, group_transactions=False)
+            failed_index = queued[0][0] if writing else index
+            if not isinstance(e, HTTPException):
+                raise
+            raise HTTPException(
+                status_code=e.status_code,
+                detail={"index": failed_index, "op": operations[failed_index].op, "detail": e.detail}
+            )
+        if operation.op == "create_user":
+            created_user_ids.append(outcome["result"]["id"])
+
+    await db.commit()
+    return results